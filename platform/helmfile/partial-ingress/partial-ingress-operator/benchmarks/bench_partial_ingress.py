@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+PartialIngress engine benchmark
+Drives PartialIngressService against an in-process fake of the CoreV1, NetworkingV1
+and CustomObjects APIs seeded with synthetic CompositeIngressHosts, base Ingresses and
+PartialIngresses, and reports wall time, API calls and peak memory per scenario.
+
+Usage:
+    python3 benchmarks/bench_partial_ingress.py --partial-ingresses 5000
+    python3 benchmarks/bench_partial_ingress.py --json --max-lists 0   # CI gate
+
+Exits non-zero when a scenario issues more LIST calls than --max-lists once the caches
+have synced, which catches lookups that fall back to cluster-wide LISTs per event.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib.util
+import contextlib
+import tracemalloc
+from collections import Counter
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'files', 'partial-ingress-service.py')
+
+GROUP = 'networking.zengarden.space'
+
+
+def load_service_module():
+    """Import partial-ingress-service.py (not importable by name because of the dashes)"""
+    # The service imports operator_runtime.py from its own directory, as it does from /scripts in the pod
+    sys.path.insert(0, os.path.dirname(SERVICE_PATH))
+    spec = importlib.util.spec_from_file_location('partial_ingress_service', SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeResponse:
+    """Minimal urllib3 response carrying a JSON body for ApiClient.deserialize"""
+
+    def __init__(self, body):
+        self.data = json.dumps(body)
+
+
+class FakeCluster:
+    """
+    In-memory apiserver state shared by the fake API classes.
+    Ingresses are stored as serialized dicts and deserialized into models on read so the
+    service sees the same types as with the real client.
+    """
+
+    def __init__(self):
+        self.api_client = client.ApiClient()
+        self.calls = Counter()
+        self.resource_version = 0
+        # (namespace, name) -> Ingress dict
+        self.ingresses = {}
+        # plural -> {(namespace, name): custom object dict}
+        self.custom_objects = {'partialingresses': {}, 'compositeingresshosts': {}}
+
+    def record(self, verb, resource):
+        self.calls[(verb, resource)] += 1
+
+    def next_resource_version(self):
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def to_ingress(self, body):
+        return self.api_client.deserialize(FakeResponse(body), 'V1Ingress')
+
+    def store_ingress(self, body):
+        if not isinstance(body, dict):
+            body = self.api_client.sanitize_for_serialization(body)
+        body = json.loads(json.dumps(body))
+        metadata = body.setdefault('metadata', {})
+        metadata['resourceVersion'] = self.next_resource_version()
+        self.ingresses[(metadata['namespace'], metadata['name'])] = body
+        return self.to_ingress(body)
+
+    def not_found(self):
+        return ApiException(status=404, reason='Not Found')
+
+
+class FakeNetworkingV1Api:
+    """NetworkingV1Api subset used by the service"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.api_client = cluster.api_client
+
+    def list_ingress_for_all_namespaces(self, **kwargs):
+        self.cluster.record('list', 'ingresses')
+        items = [self.cluster.to_ingress(body) for body in self.cluster.ingresses.values()]
+        return client.V1IngressList(
+            items=items,
+            metadata=client.V1ListMeta(resource_version=str(self.cluster.resource_version))
+        )
+
+    def read_namespaced_ingress(self, name, namespace, **kwargs):
+        self.cluster.record('get', 'ingresses')
+        body = self.cluster.ingresses.get((namespace, name))
+        if body is None:
+            raise self.cluster.not_found()
+        return self.cluster.to_ingress(body)
+
+    def create_namespaced_ingress(self, namespace, body, **kwargs):
+        self.cluster.record('create', 'ingresses')
+        return self.cluster.store_ingress(body)
+
+    def replace_namespaced_ingress(self, name, namespace, body, **kwargs):
+        self.cluster.record('update', 'ingresses')
+        if (namespace, name) not in self.cluster.ingresses:
+            raise self.cluster.not_found()
+        return self.cluster.store_ingress(body)
+
+    def patch_namespaced_ingress(self, name, namespace, body, **kwargs):
+        self.cluster.record('patch', 'ingresses')
+        return self.cluster.store_ingress(body)
+
+    def delete_namespaced_ingress(self, name, namespace, **kwargs):
+        self.cluster.record('delete', 'ingresses')
+        if self.cluster.ingresses.pop((namespace, name), None) is None:
+            raise self.cluster.not_found()
+
+
+class FakeCustomObjectsApi:
+    """CustomObjectsApi subset used by the service"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.api_client = cluster.api_client
+
+    def list_cluster_custom_object(self, group, version, plural, **kwargs):
+        self.cluster.record('list', plural)
+        return {
+            'items': list(self.cluster.custom_objects[plural].values()),
+            'metadata': {'resourceVersion': str(self.cluster.resource_version)}
+        }
+
+    def patch_namespaced_custom_object_status(self, group, version, namespace, plural, name, body, **kwargs):
+        self.cluster.record('patch', f"{plural}/status")
+        obj = self.cluster.custom_objects[plural].get((namespace, name))
+        if obj is None:
+            raise self.cluster.not_found()
+        obj['status'] = body.get('status', {})
+        return obj
+
+
+class FakeCoreV1Api:
+    """CoreV1Api stand-in; the PartialIngress engine does not call it today"""
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.api_client = cluster.api_client
+
+
+@contextlib.contextmanager
+def fake_kubernetes(module, cluster):
+    """Point the service module's client constructors and config loader at the fake cluster"""
+    originals = (
+        module.config.load_incluster_config,
+        module.client.CoreV1Api,
+        module.client.NetworkingV1Api,
+        module.client.CustomObjectsApi
+    )
+    module.config.load_incluster_config = lambda *args, **kwargs: None
+    module.client.CoreV1Api = lambda *args, **kwargs: FakeCoreV1Api(cluster)
+    module.client.NetworkingV1Api = lambda *args, **kwargs: FakeNetworkingV1Api(cluster)
+    module.client.CustomObjectsApi = lambda *args, **kwargs: FakeCustomObjectsApi(cluster)
+    try:
+        yield
+    finally:
+        (module.config.load_incluster_config,
+         module.client.CoreV1Api,
+         module.client.NetworkingV1Api,
+         module.client.CustomObjectsApi) = originals
+
+
+def make_partial_ingress(cluster, index, hostname, paths):
+    namespace = f"pr-{index}"
+    name = f"partial-{index}"
+    return {
+        'apiVersion': f"{GROUP}/v1",
+        'kind': 'PartialIngress',
+        'metadata': {
+            'namespace': namespace,
+            'name': name,
+            'uid': f"pi-uid-{index}",
+            'generation': 1,
+            'resourceVersion': cluster.next_resource_version()
+        },
+        'spec': {
+            'ingressClassName': 'nginx',
+            'rules': [{
+                'host': hostname,
+                'http': {'paths': [
+                    {
+                        'path': path,
+                        'pathType': 'Prefix',
+                        'backend': {'service': {'name': f"svc-{index}", 'port': {'number': 80}}}
+                    }
+                    for path in paths
+                ]}
+            }]
+        }
+    }
+
+
+def seed(cluster, args):
+    """
+    Populate the fake cluster:
+      - one CompositeIngressHost per env-<c> namespace matching *-app<c>.example.com
+      - --base-ingresses Ingresses on app<c>.example.com in each CIH namespace
+      - --partial-ingresses PartialIngresses spread over --hosts preview hostnames,
+        each overriding a few of the base paths
+    """
+    base_paths = [f"/svc{p}" for p in range(args.paths)]
+
+    for c in range(args.cihs):
+        namespace = f"env-{c}"
+        cluster.custom_objects['compositeingresshosts'][(namespace, 'composite')] = {
+            'apiVersion': f"{GROUP}/v1",
+            'kind': 'CompositeIngressHost',
+            'metadata': {
+                'namespace': namespace,
+                'name': 'composite',
+                'uid': f"cih-uid-{c}",
+                'resourceVersion': cluster.next_resource_version()
+            },
+            'spec': {
+                'baseHost': f"app{c}.example.com",
+                'hostPattern': f"*-app{c}.example.com",
+                'ingressClassName': 'nginx'
+            }
+        }
+
+        for b in range(args.base_ingresses):
+            cluster.store_ingress({
+                'apiVersion': 'networking.k8s.io/v1',
+                'kind': 'Ingress',
+                'metadata': {'namespace': namespace, 'name': f"base-{b}"},
+                'spec': {
+                    'ingressClassName': 'nginx',
+                    'tls': [{'hosts': [f"app{c}.example.com"], 'secretName': f"tls-{b}"}],
+                    'rules': [{
+                        'host': f"app{c}.example.com",
+                        'http': {'paths': [
+                            {
+                                'path': f"/b{b}{path}",
+                                'pathType': 'Prefix',
+                                'backend': {'service': {'name': f"base-{b}", 'port': {'number': 80}}}
+                            }
+                            for path in base_paths
+                        ]}
+                    }]
+                }
+            })
+
+    for i in range(args.partial_ingresses):
+        host = i % args.hosts
+        hostname = f"pr{host}-app{host % args.cihs}.example.com"
+        # Each PartialIngress overrides one path of one base Ingress
+        overridden = [f"/b{i % args.base_ingresses}{base_paths[i % len(base_paths)]}"]
+        obj = make_partial_ingress(cluster, i, hostname, overridden)
+        cluster.custom_objects['partialingresses'][(obj['metadata']['namespace'], obj['metadata']['name'])] = obj
+
+
+def build_service(module, cluster):
+    """Create the service against the fake cluster and load its caches without watch threads"""
+    with fake_kubernetes(module, cluster):
+        service = module.PartialIngressService()
+    for cache in (service.partial_ingresses, service.composite_hosts, service.ingresses):
+        cache._relist()
+    return service
+
+
+def run_scenario(name, cluster, func, objects):
+    """Run func(obj) for every object, returning wall time, API calls and peak memory"""
+    cluster.calls.clear()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for obj in objects:
+        func(obj)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = {f"{verb} {resource}": count for (verb, resource), count in sorted(cluster.calls.items())}
+    return {
+        'scenario': name,
+        'objects': len(objects),
+        'wall_seconds': round(elapsed, 4),
+        'ms_per_object': round(elapsed * 1000 / max(len(objects), 1), 3),
+        'api_calls': sum(cluster.calls.values()),
+        'list_calls': sum(count for (verb, _), count in cluster.calls.items() if verb == 'list'),
+        'calls': calls,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2)
+    }
+
+
+def run(args):
+    module = load_service_module()
+    cluster = FakeCluster()
+    seed(cluster, args)
+
+    with open(os.devnull, 'w') as devnull:
+        quiet = contextlib.ExitStack()
+        if not args.verbose:
+            quiet.enter_context(contextlib.redirect_stdout(devnull))
+            quiet.enter_context(contextlib.redirect_stderr(devnull))
+
+        with quiet:
+            service = build_service(module, cluster)
+            partial_ingresses = sorted(
+                cluster.custom_objects['partialingresses'].values(),
+                key=lambda obj: obj['metadata']['name']
+            )
+            reconcile = service._process_single_partial_ingress
+
+            results = [run_scenario('initial', cluster, reconcile, partial_ingresses)]
+            results.append(run_scenario('steady', cluster, reconcile, partial_ingresses))
+
+            # One PartialIngress per hostname gains a path
+            updated = []
+            for obj in partial_ingresses[:args.hosts]:
+                obj = json.loads(json.dumps(obj))
+                obj['metadata']['generation'] += 1
+                obj['metadata']['resourceVersion'] = cluster.next_resource_version()
+                obj['spec']['rules'][0]['http']['paths'].append(dict(
+                    obj['spec']['rules'][0]['http']['paths'][0], path='/added'
+                ))
+                cluster.custom_objects['partialingresses'][(obj['metadata']['namespace'], obj['metadata']['name'])] = obj
+                updated.append(obj)
+            results.append(run_scenario('update', cluster, reconcile, updated))
+
+            deleted = partial_ingresses[-args.deletes:] if args.deletes else []
+            for obj in deleted:
+                cluster.custom_objects['partialingresses'].pop((obj['metadata']['namespace'], obj['metadata']['name']), None)
+            results.append(run_scenario(
+                'delete', cluster, lambda obj: reconcile(obj, deleted=True), deleted
+            ))
+
+    return results
+
+
+def print_table(results):
+    print(f"{'scenario':<10} {'objects':>8} {'wall s':>9} {'ms/obj':>9} {'api calls':>10} {'lists':>6} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['scenario']:<10} {r['objects']:>8} {r['wall_seconds']:>9} {r['ms_per_object']:>9} "
+              f"{r['api_calls']:>10} {r['list_calls']:>6} {r['peak_memory_mb']:>8}")
+    for r in results:
+        print(f"\n{r['scenario']}:")
+        for call, count in r['calls'].items():
+            print(f"  {call:<40} {count:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cihs', type=int, default=10, help='CompositeIngressHosts (one namespace each)')
+    parser.add_argument('--base-ingresses', type=int, default=5, help='base Ingresses per CIH namespace')
+    parser.add_argument('--paths', type=int, default=4, help='paths per base Ingress')
+    parser.add_argument('--partial-ingresses', type=int, default=2000, help='PartialIngresses')
+    parser.add_argument('--hosts', type=int, default=200, help='distinct preview hostnames')
+    parser.add_argument('--deletes', type=int, default=50, help='PartialIngresses deleted in the delete scenario')
+    parser.add_argument('--max-lists', type=int, default=0,
+                        help='fail when a scenario issues more LIST calls than this after cache sync')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='keep the service log output')
+    args = parser.parse_args()
+
+    args.hosts = max(1, min(args.hosts, args.partial_ingresses))
+    args.deletes = min(args.deletes, args.partial_ingresses)
+
+    results = run(args)
+
+    if args.json:
+        print(json.dumps({'parameters': vars(args), 'results': results}, indent=2))
+    else:
+        print_table(results)
+
+    failed = [r['scenario'] for r in results if r['list_calls'] > args.max_lists]
+    if failed:
+        print(f"FAIL: LIST calls above --max-lists={args.max_lists} in: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,16 +9,46 @@ import sys
 import json
 import time
 import signal
+import re
 import hashlib
 import fnmatch
+import threading
+from collections import deque
 from datetime import datetime
-from kubernetes import client, config
+from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
+from prometheus_client import Histogram
+from operator_runtime import (
+    RECONCILE_BUCKETS, WorkQueue, gather_response, write_response, RequestServer, DirectoryWatcher,
+    instrument_api_client, start_metrics_server
+)
 
 
 # Global flag for graceful shutdown
 shutdown_requested = False
 
+# Loopback port the hook delivers binding contexts to
+HANDLER_PORT = int(os.environ.get('HANDLER_PORT', '9180'))
+
+# Number of requests processed concurrently (requests touching the same object or hostname still run in order)
+REQUEST_WORKERS = int(os.environ.get('REQUEST_WORKERS', '4'))
+
+# Times a failed object is retried with exponential backoff before it is dropped
+MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '10'))
+
+# Field manager used for server-side apply of replicated Ingresses
+FIELD_MANAGER = 'partial-ingress-operator'
+
+# Annotation carrying the hash of the rendered replicated Ingress
+CONTENT_HASH_ANNOTATION = 'partial-ingress.zengarden.space/content-hash'
+
+# Port serving Prometheus metrics on /metrics
+METRICS_PORT = int(os.environ.get('METRICS_PORT', '9181'))
+
+RECONCILE_DURATION = Histogram(
+    'operator_reconcile_duration_seconds', 'Time spent reconciling one queued object', ['kind'],
+    buckets=RECONCILE_BUCKETS)
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
@@ -27,18 +57,519 @@ def signal_handler(signum, frame):
     shutdown_requested = True
 
 
+def _object_meta(obj, field):
+    """Read a metadata field from either a dict (custom object) or a model (typed object)"""
+    if isinstance(obj, dict):
+        return obj.get('metadata', {}).get(field)
+    attr = {'resourceVersion': 'resource_version', 'deletionTimestamp': 'deletion_timestamp'}.get(field, field)
+    return getattr(obj.metadata, attr, None)
+
+
+class ResourceCache:
+    """
+    Watch-backed in-memory store for a single resource type.
+    Lists the collection once, then consumes watch deltas (resuming from the last
+    resourceVersion) so lookups are local dictionary reads instead of apiserver LISTs.
+    """
+
+    def __init__(self, name, list_func, **list_kwargs):
+        self.name = name
+        self.list_func = list_func
+        self.list_kwargs = list_kwargs
+        self.resource_version = None
+
+        self._items = {}
+        self._namespaces = {}
+        self._handlers = []
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def key(obj):
+        """Return the namespace/name key of an object"""
+        namespace = _object_meta(obj, 'namespace') or ''
+        return f"{namespace}/{_object_meta(obj, 'name')}"
+
+    def add_event_handler(self, handler):
+        """
+        Register handler(event_type, old_obj, new_obj), called under the store lock
+        for every change so derived indexes stay consistent with the store.
+        """
+        with self._lock:
+            self._handlers.append(handler)
+            for obj in self._items.values():
+                handler('ADDED', None, obj)
+
+    def start(self):
+        """Start the list+watch loop in a background thread"""
+        self._thread = threading.Thread(target=self._run, name=f"cache-{self.name}", daemon=True)
+        self._thread.start()
+
+    def wait_for_sync(self, timeout=None):
+        """Block until the initial LIST has been loaded"""
+        return self._synced.wait(timeout)
+
+    def get(self, namespace, name):
+        """Get a single object by namespace and name"""
+        with self._lock:
+            return self._items.get(f"{namespace or ''}/{name}")
+
+    def list(self, namespace=None):
+        """List cached objects, optionally restricted to one namespace"""
+        with self._lock:
+            if namespace is None:
+                return list(self._items.values())
+            return [self._items[k] for k in self._namespaces.get(namespace, ())]
+
+    def upsert(self, obj):
+        """Store an object returned by our own write so subsequent reads observe it immediately"""
+        with self._lock:
+            key = self.key(obj)
+            existing = self._items.get(key)
+            if existing is not None and self._is_older(obj, existing):
+                return
+            self._store(key, obj)
+            self._notify('MODIFIED' if existing is not None else 'ADDED', existing, obj)
+
+    def remove(self, namespace, name):
+        """Drop an object we have just deleted"""
+        with self._lock:
+            existing = self._discard(f"{namespace or ''}/{name}")
+            if existing is not None:
+                self._notify('DELETED', existing, None)
+
+    def _is_older(self, obj, existing):
+        try:
+            return int(_object_meta(obj, 'resourceVersion')) < int(_object_meta(existing, 'resourceVersion'))
+        except (TypeError, ValueError):
+            return False
+
+    def _notify(self, event_type, old, new):
+        for handler in self._handlers:
+            try:
+                handler(event_type, old, new)
+            except Exception as e:
+                print(f"ERROR: {self.name} event handler failed: {e}", file=sys.stderr, flush=True)
+
+    def _store(self, key, obj):
+        self._items[key] = obj
+        self._namespaces.setdefault(key.split('/', 1)[0], set()).add(key)
+
+    def _discard(self, key):
+        existing = self._items.pop(key, None)
+        namespace = key.split('/', 1)[0]
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[namespace]
+        return existing
+
+    def _replace(self, items):
+        """Swap in a full LIST result, emitting the implied deltas to handlers"""
+        previous = self._items
+        self._items = {}
+        self._namespaces = {}
+        for obj in items:
+            key = self.key(obj)
+            self._store(key, obj)
+            old = previous.pop(key, None)
+            self._notify('MODIFIED' if old is not None else 'ADDED', old, obj)
+        for old in previous.values():
+            self._notify('DELETED', old, None)
+
+    def _relist(self):
+        """Replace the store contents with a fresh LIST"""
+        try:
+            result = self.list_func(**self.list_kwargs)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            # Resource type not installed yet - behave as an empty collection
+            with self._lock:
+                self._replace([])
+                self.resource_version = None
+            self._synced.set()
+            return False
+
+        if isinstance(result, dict):
+            items = result.get('items', [])
+            resource_version = result.get('metadata', {}).get('resourceVersion')
+        else:
+            items = result.items or []
+            resource_version = result.metadata.resource_version
+
+        with self._lock:
+            self._replace(items)
+            self.resource_version = resource_version
+
+        print(f"[cache] Listed {len(items)} {self.name} (resourceVersion={resource_version})", flush=True)
+        self._synced.set()
+        return True
+
+    def _apply_event(self, event):
+        event_type = event['type']
+        raw = event['raw_object']
+
+        if event_type == 'BOOKMARK':
+            self.resource_version = raw.get('metadata', {}).get('resourceVersion', self.resource_version)
+            return
+
+        obj = event['object']
+        key = self.key(obj)
+        with self._lock:
+            if event_type == 'DELETED':
+                existing = self._discard(key)
+                self._notify('DELETED', existing if existing is not None else obj, None)
+            else:
+                existing = self._items.get(key)
+                self._store(key, obj)
+                self._notify('MODIFIED' if existing is not None else 'ADDED', existing, obj)
+            self.resource_version = _object_meta(obj, 'resourceVersion')
+
+    def _run(self):
+        global shutdown_requested
+
+        while not shutdown_requested:
+            try:
+                if self.resource_version is None and not self._relist():
+                    time.sleep(30)
+                    continue
+
+                w = watch.Watch()
+                for event in w.stream(self.list_func,
+                                      resource_version=self.resource_version,
+                                      allow_watch_bookmarks=True,
+                                      timeout_seconds=300,
+                                      **self.list_kwargs):
+                    if shutdown_requested:
+                        w.stop()
+                        break
+                    self._apply_event(event)
+
+            except ApiException as e:
+                if e.status == 410:
+                    print(f"[cache] Watch for {self.name} expired, relisting", flush=True)
+                    self.resource_version = None
+                    continue
+                print(f"ERROR: Watch for {self.name} failed: {e}", file=sys.stderr, flush=True)
+                time.sleep(5)
+            except Exception as e:
+                print(f"ERROR: Watch for {self.name} failed: {e}", file=sys.stderr, flush=True)
+                time.sleep(5)
+
+
+class PathTrie:
+    """
+    PartialIngress paths for one (host, ingressClassName), stored element by element
+    so deciding whether a base Ingress path is shadowed walks a single branch.
+    Follows Ingress pathType semantics: Prefix matches by path element (/api covers
+    /api and /api/v1 but not /apis, trailing slashes ignored) and Exact matches the
+    literal path. ImplementationSpecific is up to the controller, so it is only ever
+    compared literally.
+    """
+
+    __slots__ = ('children', 'prefix', 'literals')
+
+    def __init__(self, paths=()):
+        self.children = {}
+        # A Prefix path ends at this node and covers its whole subtree
+        self.prefix = False
+        # literal path ending at this node -> pathTypes it is provided with
+        self.literals = {}
+        for path, path_type in paths:
+            self.add(path, path_type)
+
+    @staticmethod
+    def elements(path):
+        return [element for element in (path or '/').split('/') if element]
+
+    def add(self, path, path_type):
+        node = self
+        for element in self.elements(path):
+            node = node.children.setdefault(element, PathTrie())
+        if path_type == 'Prefix':
+            node.prefix = True
+        node.literals.setdefault(path or '/', set()).add(path_type)
+
+    def shadows(self, path, path_type):
+        """
+        Whether every request matched by a base path is served by these paths.
+        Prefix base paths need a covering Prefix path (an Exact one leaves the
+        subtree unserved), Exact base paths are also shadowed by the same literal.
+        """
+        path = path or '/'
+        # ImplementationSpecific base paths may be regexes, never assume a Prefix covers them
+        prefix_covers = path_type in ('Prefix', 'Exact')
+
+        node = self
+        for element in self.elements(path):
+            if prefix_covers and node.prefix:
+                return True
+            node = node.children.get(element)
+            if node is None:
+                return False
+        if prefix_covers and node.prefix:
+            return True
+
+        path_types = node.literals.get(path, ())
+        if path_type == 'Exact':
+            return 'Exact' in path_types or 'ImplementationSpecific' in path_types
+        if path_type == 'Prefix':
+            return 'ImplementationSpecific' in path_types
+        return bool(path_types)
+
+    def paths(self):
+        """Literal paths stored in the trie"""
+        paths = set(self.literals)
+        for child in self.children.values():
+            paths |= child.paths()
+        return paths
+
+
+class PathOverrideIndex:
+    """
+    Index of PartialIngress paths keyed by (host, ingressClassName).
+    Maintained incrementally from PartialIngress cache events so path override
+    lookups are a dictionary read instead of a scan over every PartialIngress.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # (host, ingressClassName) -> {uid: [(path, pathType), ...]}
+        self._entries = {}
+        # uid -> set of (host, ingressClassName) keys the PartialIngress contributes to
+        self._keys_by_uid = {}
+        # uid -> (namespace, name)
+        self._names_by_uid = {}
+        # (host, ingressClassName) -> PathTrie, built on first lookup after a change
+        self._tries = {}
+
+    @staticmethod
+    def index_key(host, ingress_class_name):
+        return (host, ingress_class_name or '')
+
+    def on_event(self, event_type, old, new):
+        """ResourceCache event handler"""
+        with self._lock:
+            if old is not None:
+                self._remove(old.get('metadata', {}).get('uid'))
+            if new is not None:
+                self._add(new)
+
+    def _add(self, obj):
+        metadata = obj.get('metadata', {})
+        uid = metadata.get('uid')
+
+        # PartialIngresses being deleted no longer override anything
+        if not uid or metadata.get('deletionTimestamp'):
+            return
+
+        self._remove(uid)
+
+        spec = obj.get('spec', {})
+        ingress_class_name = spec.get('ingressClassName')
+        keys = set()
+
+        for rule in spec.get('rules', []):
+            host = rule.get('host', '')
+            if not host:
+                continue
+
+            key = self.index_key(host, ingress_class_name)
+            self._tries.pop(key, None)
+            paths = self._entries.setdefault(key, {}).setdefault(uid, [])
+            for path_obj in rule.get('http', {}).get('paths', []):
+                paths.append((path_obj.get('path', '/'), path_obj.get('pathType', 'Prefix')))
+            keys.add(key)
+
+        if keys:
+            self._keys_by_uid[uid] = keys
+            self._names_by_uid[uid] = (metadata.get('namespace'), metadata.get('name'))
+
+    def _remove(self, uid):
+        for key in self._keys_by_uid.pop(uid, ()):
+            self._tries.pop(key, None)
+            owners = self._entries.get(key)
+            if owners is None:
+                continue
+            owners.pop(uid, None)
+            if not owners:
+                del self._entries[key]
+        self._names_by_uid.pop(uid, None)
+
+    def uids(self, host, ingress_class_name):
+        """UIDs of active PartialIngresses serving host with ingressClassName"""
+        with self._lock:
+            return set(self._entries.get(self.index_key(host, ingress_class_name), {}))
+
+    def names(self, host, ingress_class_name):
+        """(uid, namespace, name) of active PartialIngresses serving host with ingressClassName"""
+        with self._lock:
+            return [
+                (uid, *self._names_by_uid[uid])
+                for uid in self._entries.get(self.index_key(host, ingress_class_name), {})
+            ]
+
+    def trie(self, host, ingress_class_name):
+        """PathTrie of the paths provided by all PartialIngresses for host with ingressClassName"""
+        key = self.index_key(host, ingress_class_name)
+        with self._lock:
+            trie = self._tries.get(key)
+            if trie is None:
+                owners = self._entries.get(key, {})
+                trie = PathTrie(path for paths in owners.values() for path in paths)
+                self._tries[key] = trie
+            return trie
+
+    def hosts(self, exclude_uid=None):
+        """(host, ingressClassName) keys served by at least one active PartialIngress"""
+        with self._lock:
+            return [
+                key for key, owners in self._entries.items()
+                if len(owners) > 1 or exclude_uid not in owners
+            ]
+
+
+class HostPatternMatcher:
+    """
+    Precompiled matcher for CompositeIngressHost hostPatterns.
+    Patterns are bucketed by the literal suffix after their last wildcard, so a lookup
+    probes one bucket per distinct suffix length and only regex-matches the candidates
+    in the buckets the hostname actually ends with. Rebuilt lazily when CIHs change.
+    """
+
+    GLOB_CHARS = '*?[]'
+
+    def __init__(self, composite_hosts):
+        self.composite_hosts = composite_hosts
+        self._lock = threading.Lock()
+        self._dirty = True
+        # literal hostPattern -> [cih]
+        self._literals = {}
+        # literal suffix -> [(literal prefix, compiled pattern, cih)]
+        self._buckets = {}
+        self._suffix_lengths = []
+
+        composite_hosts.add_event_handler(self.on_event)
+
+    def on_event(self, event_type, old, new):
+        """ResourceCache event handler - only invalidate, rebuild on next lookup"""
+        self._dirty = True
+
+    def _rebuild(self):
+        literals = {}
+        buckets = {}
+
+        for cih in self.composite_hosts.list():
+            pattern = cih.get('spec', {}).get('hostPattern')
+            if not pattern:
+                continue
+
+            positions = [i for i, c in enumerate(pattern) if c in self.GLOB_CHARS]
+            if not positions:
+                literals.setdefault(pattern, []).append(cih)
+                continue
+
+            prefix = pattern[:positions[0]]
+            suffix = pattern[positions[-1] + 1:]
+            regex = re.compile(fnmatch.translate(pattern))
+            buckets.setdefault(suffix, []).append((prefix, regex, cih))
+
+        self._literals = literals
+        self._buckets = buckets
+        self._suffix_lengths = sorted({len(suffix) for suffix in buckets})
+        print(f"[matcher] Compiled {sum(len(v) for v in literals.values()) + sum(len(v) for v in buckets.values())} "
+              f"CompositeIngressHost patterns into {len(buckets)} suffix buckets", flush=True)
+
+    def match(self, hostname, ingress_class_name=None):
+        """
+        Return all CompositeIngressHosts whose hostPattern matches hostname,
+        optionally restricted to an ingressClassName.
+        """
+        with self._lock:
+            if self._dirty:
+                self._dirty = False
+                self._rebuild()
+            literals = self._literals
+            buckets = self._buckets
+            suffix_lengths = self._suffix_lengths
+
+        matches = list(literals.get(hostname, ()))
+        for length in suffix_lengths:
+            if length > len(hostname):
+                break
+            candidates = buckets.get(hostname[len(hostname) - length:])
+            if not candidates:
+                continue
+            for prefix, regex, cih in candidates:
+                if hostname.startswith(prefix) and regex.match(hostname):
+                    matches.append(cih)
+
+        if ingress_class_name is None:
+            return matches
+        return [
+            cih for cih in matches
+            if (cih.get('spec', {}).get('ingressClassName') or '') == (ingress_class_name or '')
+        ]
+
+
 class PartialIngressService:
     """Main service for processing PartialIngress and CompositeIngressHost events"""
 
     def __init__(self):
         # Load Kubernetes config from service account
         config.load_incluster_config()
-        self.v1 = client.CoreV1Api()
-        self.networking_v1 = client.NetworkingV1Api()
-        self.custom_api = client.CustomObjectsApi()
+        self.v1 = client.CoreV1Api(instrument_api_client(client.ApiClient()))
+        self.networking_v1 = client.NetworkingV1Api(instrument_api_client(client.ApiClient()))
+        self.custom_api = client.CustomObjectsApi(instrument_api_client(client.ApiClient()))
+
+        # Dedicated client for server-side apply: the generated patch methods cannot
+        # select the apply-patch content type per call, default headers take precedence
+        apply_client = instrument_api_client(client.ApiClient())
+        apply_client.set_default_header('Content-Type', 'application/apply-patch+yaml')
+        self.networking_v1_apply = client.NetworkingV1Api(apply_client)
+
+        # Watch-backed caches every lookup reads from
+        self.partial_ingresses = ResourceCache(
+            'partialingresses',
+            self.custom_api.list_cluster_custom_object,
+            group='networking.zengarden.space',
+            version='v1',
+            plural='partialingresses'
+        )
+        self.composite_hosts = ResourceCache(
+            'compositeingresshosts',
+            self.custom_api.list_cluster_custom_object,
+            group='networking.zengarden.space',
+            version='v1',
+            plural='compositeingresshosts'
+        )
+        self.ingresses = ResourceCache(
+            'ingresses',
+            self.networking_v1.list_ingress_for_all_namespaces
+        )
+
+        # PartialIngress paths by (host, ingressClassName)
+        self.path_index = PathOverrideIndex()
+        self.partial_ingresses.add_event_handler(self.path_index.on_event)
+
+        # Compiled CompositeIngressHost hostPattern matcher
+        self.host_matcher = HostPatternMatcher(self.composite_hosts)
 
         print('PartialIngress Operator service initialized', flush=True)
 
+    def start_caches(self, timeout=60):
+        """Start the resource caches and wait for their initial LIST"""
+        caches = [self.partial_ingresses, self.composite_hosts, self.ingresses]
+        for cache in caches:
+            cache.start()
+        for cache in caches:
+            if not cache.wait_for_sync(timeout):
+                raise Exception(f"Timed out waiting for {cache.name} cache to sync")
+        print('Resource caches synced', flush=True)
+
     def compute_hash(self, hostname, ingress_class_name):
         """Compute hash for naming replicated resources"""
         hash_input = f"{hostname}:{ingress_class_name}"
@@ -46,18 +577,7 @@ class PartialIngressService:
 
     def get_all_composite_ingress_hosts(self):
         """Get all CompositeIngressHost resources across all namespaces"""
-        try:
-            result = self.custom_api.list_cluster_custom_object(
-                group='networking.zengarden.space',
-                version='v1',
-                plural='compositeingresshosts'
-            )
-            return result.get('items', [])
-        except ApiException as e:
-            if e.status == 404:
-                return []
-            print(f"ERROR: Failed to list CompositeIngressHosts: {e}", file=sys.stderr)
-            raise
+        return self.composite_hosts.list()
 
     def deduplicate_composite_hosts(self, composite_hosts):
         """Deduplicate CompositeIngressHost resources by spec"""
@@ -71,53 +591,36 @@ class PartialIngressService:
 
     def find_base_ingresses(self, base_host, ingress_class_name, namespace):
         """Find all Ingress resources matching baseHost and ingressClassName in a specific namespace"""
-        try:
-            namespace_ingresses = self.networking_v1.list_namespaced_ingress(namespace=namespace)
-            matching = []
+        matching = []
 
-            for ing in namespace_ingresses.items:
-                # Check ingressClassName
-                if ing.spec.ingress_class_name != ingress_class_name:
-                    continue
+        for ing in self.ingresses.list(namespace=namespace):
+            # Check ingressClassName
+            if ing.spec.ingress_class_name != ingress_class_name:
+                continue
 
-                # Check if any rule matches baseHost
-                if ing.spec.rules:
-                    for rule in ing.spec.rules:
-                        if rule.host == base_host:
-                            matching.append(ing)
-                            break
+            # Check if any rule matches baseHost
+            if ing.spec.rules:
+                for rule in ing.spec.rules:
+                    if rule.host == base_host:
+                        matching.append(ing)
+                        break
 
-            return matching
-        except ApiException as e:
-            print(f"ERROR: Failed to list Ingresses in namespace {namespace}: {e}", file=sys.stderr)
-            raise
+        return matching
 
     def find_matching_partial_ingresses(self, host_pattern):
         """Find all PartialIngress resources matching the hostPattern"""
-        try:
-            result = self.custom_api.list_cluster_custom_object(
-                group='networking.zengarden.space',
-                version='v1',
-                plural='partialingresses'
-            )
-
-            matching = []
-            for ping in result.get('items', []):
-                spec = ping.get('spec', {})
-                rules = spec.get('rules', [])
+        matching = []
+        for ping in self.partial_ingresses.list():
+            spec = ping.get('spec', {})
+            rules = spec.get('rules', [])
+
+            for rule in rules:
+                host = rule.get('host', '')
+                if fnmatch.fnmatch(host, host_pattern):
+                    matching.append(ping)
+                    break
 
-                for rule in rules:
-                    host = rule.get('host', '')
-                    if fnmatch.fnmatch(host, host_pattern):
-                        matching.append(ping)
-                        break
-
-            return matching
-        except ApiException as e:
-            if e.status == 404:
-                return []
-            print(f"ERROR: Failed to list PartialIngresses: {e}", file=sys.stderr)
-            raise
+        return matching
 
     def extract_paths_from_ingress(self, ingress):
         """Extract paths and backends from an Ingress"""
@@ -148,58 +651,16 @@ class PartialIngressService:
 
         return paths
 
-    def is_path_overridden(self, path, overridden_paths):
-        """Check if a path is overridden by PartialIngress"""
-        # Simple string comparison for now
-        # TODO: Handle more complex path matching (Prefix vs Exact)
-        return path in overridden_paths
+    def is_path_overridden(self, path, path_type, overridden_paths):
+        """Check if a path is fully shadowed by PartialIngress paths (see PathTrie)"""
+        return overridden_paths.shadows(path, path_type or 'ImplementationSpecific')
 
     def build_path_override_map(self, hostname, ingress_class_name):
         """
-        Build a set of all paths provided by ALL PartialIngresses for a specific hostname.
-        Returns a set of path strings.
+        Build the paths provided by ALL PartialIngresses for a specific hostname.
+        Returns a PathTrie, shared until a PartialIngress for the hostname changes.
         """
-        try:
-            all_partial_ingresses = self.custom_api.list_cluster_custom_object(
-                group='networking.zengarden.space',
-                version='v1',
-                plural='partialingresses'
-            ).get('items', [])
-
-            overridden_paths = set()
-
-            for pi in all_partial_ingresses:
-                # Skip if being deleted
-                if pi.get('metadata', {}).get('deletionTimestamp'):
-                    continue
-
-                pi_spec = pi.get('spec', {})
-                pi_class = pi_spec.get('ingressClassName')
-
-                # Only consider PartialIngresses with matching hostname and ingressClassName
-                if pi_class != ingress_class_name:
-                    continue
-
-                pi_rules = pi_spec.get('rules', [])
-                for rule in pi_rules:
-                    pi_hostname = rule.get('host', '')
-                    # Exact hostname match
-                    if pi_hostname == hostname:
-                        # Extract all paths from this PartialIngress
-                        http = rule.get('http', {})
-                        paths_list = http.get('paths', [])
-                        for path_obj in paths_list:
-                            path = path_obj.get('path', '/')
-                            overridden_paths.add(path)
-                        break
-
-            return overridden_paths
-
-        except ApiException as e:
-            if e.status == 404:
-                return set()
-            print(f"ERROR: Failed to build path override map: {e}", file=sys.stderr)
-            raise
+        return self.path_index.trie(hostname, ingress_class_name)
 
     def process_partial_ingress(self, binding_context):
         """Process a PartialIngress event from binding context"""
@@ -222,10 +683,12 @@ class PartialIngressService:
                 print("WARNING: No objects in binding context", file=sys.stderr)
                 return
 
+            deleted = binding.get('watchEvent') == 'Deleted'
+
             # Process each PartialIngress
             for obj_wrapper in objects:
                 obj = obj_wrapper.get('object', {})
-                self._process_single_partial_ingress(obj)
+                self._process_single_partial_ingress(obj, deleted=deleted)
 
         except Exception as e:
             print(f"ERROR in process_partial_ingress: {e}", file=sys.stderr)
@@ -233,7 +696,7 @@ class PartialIngressService:
             traceback.print_exc()
             raise
 
-    def _process_single_partial_ingress(self, obj):
+    def _process_single_partial_ingress(self, obj, deleted=False):
         """Process a single PartialIngress object"""
         metadata = obj.get('metadata', {})
         spec = obj.get('spec', {})
@@ -245,11 +708,17 @@ class PartialIngressService:
 
         print(f"Processing PartialIngress: {namespace}/{name}", flush=True)
 
+        # Make the cache (and the path index built from it) at least as fresh as this event
+        if deleted:
+            self.partial_ingresses.remove(namespace, name)
+        else:
+            self.partial_ingresses.upsert(obj)
+
         # Handle deletion - check if we need to cleanup orphaned replicated Ingresses
         # and trigger reconciliation of other PartialIngresses with same hostname
-        if deletion_timestamp:
+        if deletion_timestamp or deleted:
             print(f"  PartialIngress is being deleted, checking for orphaned replicated Ingresses", flush=True)
-            self._cleanup_orphaned_replicated_ingresses()
+            self._cleanup_orphaned_replicated_ingresses(exclude_uid=uid)
 
             # Trigger reconciliation of other PartialIngresses that share the same hostname
             # because path override map has changed
@@ -272,31 +741,34 @@ class PartialIngressService:
         print(f"  Hostname: {hostname}", flush=True)
         print(f"  IngressClass: {ingress_class_name}", flush=True)
 
-        # 0. Delete old replicated Ingresses for this hostname FIRST (prevents conflicts)
-        self._delete_replicated_ingresses_for_hostname(hostname, ingress_class_name)
-
         # 1. Generate Ingress from PartialIngress in the same namespace (owned by PartialIngress)
         self._generate_ingress_from_partial(obj)
 
         # 2. Find matching CompositeIngressHosts (process ALL, no deduplication)
-        all_composite_hosts = self.get_all_composite_ingress_hosts()
+        # Sorted so the desired state does not depend on cache ordering
+        matched_composite_hosts = sorted(
+            self.host_matcher.match(hostname, ingress_class_name),
+            key=ResourceCache.key
+        )
 
-        replicated_ingresses = []
+        # Build path override map for this hostname from ALL PartialIngresses
+        all_overridden_paths = self.build_path_override_map(hostname, ingress_class_name)
+        print(f"  Paths provided by ALL PartialIngresses for {hostname}: {sorted(all_overridden_paths.paths())}", flush=True)
+
+        # Replicated Ingresses are shared by every PartialIngress on this hostname, so
+        # attribute them to a stable source instead of whichever one was reconciled last
+        source_partial_ingress = self._primary_partial_ingress(hostname, ingress_class_name, obj)
 
-        for composite_host in all_composite_hosts:
+        # Desired replicated Ingresses: (namespace, name) -> (V1Ingress, source Ingress)
+        desired = {}
+
+        for composite_host in matched_composite_hosts:
             cih_spec = composite_host.get('spec', {})
             cih_metadata = composite_host.get('metadata', {})
             base_host = cih_spec.get('baseHost')
             host_pattern = cih_spec.get('hostPattern')
             cih_ingress_class = cih_spec.get('ingressClassName')
 
-            # Check if this PartialIngress matches the pattern
-            if not fnmatch.fnmatch(hostname, host_pattern):
-                continue
-
-            if cih_ingress_class != ingress_class_name:
-                continue
-
             print(f"  Matched CompositeIngressHost: baseHost={base_host}, pattern={host_pattern}", flush=True)
 
             # Find base Ingresses in the same namespace as CompositeIngressHost
@@ -304,10 +776,6 @@ class PartialIngressService:
             base_ingresses = self.find_base_ingresses(base_host, cih_ingress_class, cih_namespace)
             print(f"  Found {len(base_ingresses)} base Ingresses in {cih_namespace}", flush=True)
 
-            # Build path override map for this hostname from ALL PartialIngresses
-            all_overridden_paths = self.build_path_override_map(hostname, ingress_class_name)
-            print(f"  Paths provided by ALL PartialIngresses for {hostname}: {all_overridden_paths}", flush=True)
-
             # Replicate non-overridden Ingresses (owned by CompositeIngressHost)
             for base_ing in base_ingresses:
                 base_paths = self.extract_paths_from_ingress(base_ing)
@@ -315,24 +783,25 @@ class PartialIngressService:
                 # Check if any paths are NOT overridden by ANY PartialIngress for this hostname
                 non_overridden_paths = [
                     p for p in base_paths
-                    if not self.is_path_overridden(p['path'], all_overridden_paths)
+                    if not self.is_path_overridden(p['path'], p['pathType'], all_overridden_paths)
                 ]
 
                 if non_overridden_paths:
-                    replicated_ing = self._replicate_ingress(
+                    ingress = self._build_replicated_ingress(
                         base_ing,
                         hostname,
                         ingress_class_name,
                         non_overridden_paths,
-                        obj,
+                        source_partial_ingress,
                         composite_host
                     )
-                    if replicated_ing:
-                        replicated_ingresses.append({
-                            'name': replicated_ing.metadata.name,
-                            'namespace': replicated_ing.metadata.namespace,
-                            'sourceIngress': f"{base_ing.metadata.namespace}/{base_ing.metadata.name}"
-                        })
+                    desired[(ingress.metadata.namespace, ingress.metadata.name)] = (
+                        ingress,
+                        f"{base_ing.metadata.namespace}/{base_ing.metadata.name}"
+                    )
+
+        # 3. Create, patch or delete only the replicated Ingresses that differ
+        replicated_ingresses = self._sync_replicated_ingresses(hostname, ingress_class_name, desired)
 
         # Update PartialIngress status
         self._update_partial_ingress_status(namespace, name, replicated_ingresses)
@@ -377,26 +846,45 @@ class PartialIngressService:
         try:
             self.networking_v1.read_namespaced_ingress(name=name, namespace=namespace)
             # Update if exists
-            self.networking_v1.replace_namespaced_ingress(
+            result = self.networking_v1.replace_namespaced_ingress(
                 name=name,
                 namespace=namespace,
                 body=ingress
             )
+            self.ingresses.upsert(result)
             print(f"  Updated Ingress: {namespace}/{name}", flush=True)
         except ApiException as e:
             if e.status == 404:
                 # Create if doesn't exist
-                self.networking_v1.create_namespaced_ingress(
+                result = self.networking_v1.create_namespaced_ingress(
                     namespace=namespace,
                     body=ingress
                 )
+                self.ingresses.upsert(result)
                 print(f"  Created Ingress: {namespace}/{name}", flush=True)
             else:
                 raise
 
-    def _replicate_ingress(self, base_ingress, new_hostname, ingress_class_name, paths, partial_ingress_obj, composite_host_obj):
+    def _primary_partial_ingress(self, hostname, ingress_class_name, fallback_obj):
+        """Return the first (by namespace/name) active PartialIngress for a hostname"""
+        names = sorted(
+            (namespace, name)
+            for _, namespace, name in self.path_index.names(hostname, ingress_class_name)
+        )
+        if names:
+            namespace, name = names[0]
+            return {'metadata': {'namespace': namespace, 'name': name}}
+        return fallback_obj
+
+    def compute_content_hash(self, ingress):
+        """Hash the rendered replicated Ingress so unchanged objects can be skipped"""
+        body = self.networking_v1.api_client.sanitize_for_serialization(ingress)
+        body.get('metadata', {}).get('annotations', {}).pop(CONTENT_HASH_ANNOTATION, None)
+        return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _build_replicated_ingress(self, base_ingress, new_hostname, ingress_class_name, paths, partial_ingress_obj, composite_host_obj):
         """
-        Replicate an Ingress to CompositeIngressHost namespace with new hostname.
+        Build the replicated Ingress for the CompositeIngressHost namespace with new hostname.
         The replicated Ingress points to LOCAL services in the CIH namespace.
         """
         # Compute hash for naming
@@ -469,9 +957,8 @@ class PartialIngressService:
                 block_owner_deletion=True
             )
         ]
-        print(f"  Setting CompositeIngressHost {cih_namespace}/{cih_name} as owner", flush=True)
 
-        # Create replicated Ingress in CIH namespace (base namespace)
+        # Replicated Ingress in CIH namespace (base namespace)
         ingress = client.V1Ingress(
             api_version='networking.k8s.io/v1',
             kind='Ingress',
@@ -493,27 +980,75 @@ class PartialIngressService:
             )
         )
 
-        try:
-            self.networking_v1.read_namespaced_ingress(name=new_name, namespace=cih_namespace)
-            # Update if exists
-            result = self.networking_v1.replace_namespaced_ingress(
-                name=new_name,
-                namespace=cih_namespace,
-                body=ingress
-            )
-            print(f"  Updated replicated Ingress: {cih_namespace}/{new_name}", flush=True)
-            return result
-        except ApiException as e:
-            if e.status == 404:
-                # Create if doesn't exist
-                result = self.networking_v1.create_namespaced_ingress(
-                    namespace=cih_namespace,
-                    body=ingress
-                )
-                print(f"  Created replicated Ingress: {cih_namespace}/{new_name}", flush=True)
-                return result
+        ingress.metadata.annotations[CONTENT_HASH_ANNOTATION] = self.compute_content_hash(ingress)
+        return ingress
+
+    def _observed_replicated_ingresses(self, hostname, ingress_class_name):
+        """Replicated Ingresses currently in the cluster for a hostname, keyed by (namespace, name)"""
+        observed = {}
+        for ing in self.ingresses.list():
+            labels = ing.metadata.labels or {}
+            if labels.get('partial-ingress.zengarden.space/replicated') != 'true':
+                continue
+            if labels.get('partial-ingress.zengarden.space/hostname', '') != hostname:
+                continue
+            if (ing.spec.ingress_class_name or '') != (ingress_class_name or ''):
+                continue
+            observed[(ing.metadata.namespace, ing.metadata.name)] = ing
+        return observed
+
+    def _sync_replicated_ingresses(self, hostname, ingress_class_name, desired):
+        """
+        Converge replicated Ingresses for a hostname to the desired set.
+        Objects whose content hash annotation matches are left untouched, changed or
+        missing ones are server-side applied and extra ones are deleted.
+        Returns the status entries for the desired replicated Ingresses.
+        """
+        observed = self._observed_replicated_ingresses(hostname, ingress_class_name)
+        replicated_ingresses = []
+
+        for (ns, name), (ingress, source_ingress) in desired.items():
+            existing = observed.get((ns, name))
+            wanted_hash = ingress.metadata.annotations[CONTENT_HASH_ANNOTATION]
+            existing_hash = ((existing.metadata.annotations or {}).get(CONTENT_HASH_ANNOTATION)
+                             if existing is not None else None)
+
+            if existing_hash == wanted_hash:
+                print(f"  Replicated Ingress unchanged: {ns}/{name}", flush=True)
             else:
-                raise
+                self._apply_replicated_ingress(ingress)
+                print(f"  {'Updated' if existing is not None else 'Created'} replicated Ingress: {ns}/{name}", flush=True)
+
+            replicated_ingresses.append({
+                'name': name,
+                'namespace': ns,
+                'sourceIngress': source_ingress
+            })
+
+        for (ns, name) in observed.keys() - desired.keys():
+            print(f"  Deleting stale replicated Ingress: {ns}/{name}", flush=True)
+            try:
+                self.networking_v1.delete_namespaced_ingress(name=name, namespace=ns)
+            except ApiException as e:
+                if e.status != 404:
+                    print(f"WARNING: Failed to delete Ingress {ns}/{name}: {e}", file=sys.stderr)
+                    continue
+            self.ingresses.remove(ns, name)
+
+        return replicated_ingresses
+
+    def _apply_replicated_ingress(self, ingress):
+        """Server-side apply a replicated Ingress (no preceding GET needed)"""
+        body = self.networking_v1.api_client.sanitize_for_serialization(ingress)
+        result = self.networking_v1_apply.patch_namespaced_ingress(
+            name=ingress.metadata.name,
+            namespace=ingress.metadata.namespace,
+            body=body,
+            field_manager=FIELD_MANAGER,
+            force=True
+        )
+        self.ingresses.upsert(result)
+        return result
 
     def _dict_to_ingress_spec(self, spec_dict):
         """Convert dictionary to V1IngressSpec"""
@@ -551,162 +1086,79 @@ class PartialIngressService:
 
         try:
             # Find all OTHER PartialIngresses with the same hostname (excluding the one being deleted)
-            all_partial_ingresses = self.custom_api.list_cluster_custom_object(
-                group='networking.zengarden.space',
-                version='v1',
-                plural='partialingresses'
-            ).get('items', [])
-
             deleted_uid = metadata.get('uid')
             reconcile_count = 0
 
-            for pi in all_partial_ingresses:
-                pi_metadata = pi.get('metadata', {})
-                pi_spec = pi.get('spec', {})
-                pi_uid = pi_metadata.get('uid')
-
+            for pi_uid, pi_namespace, pi_name in self.path_index.names(hostname, ingress_class_name):
                 # Skip the PartialIngress being deleted
                 if pi_uid == deleted_uid:
                     continue
 
-                # Skip if being deleted
-                if pi_metadata.get('deletionTimestamp'):
+                pi = self.partial_ingresses.get(pi_namespace, pi_name)
+                if pi is None:
                     continue
 
-                # Check if this PartialIngress has the same hostname and ingressClassName
-                pi_class = pi_spec.get('ingressClassName')
-                if pi_class != ingress_class_name:
-                    continue
-
-                pi_rules = pi_spec.get('rules', [])
-                for rule in pi_rules:
-                    pi_hostname = rule.get('host', '')
-                    if pi_hostname == hostname:
-                        # Found a matching PartialIngress - reprocess it
-                        pi_namespace = pi_metadata.get('namespace')
-                        pi_name = pi_metadata.get('name')
-                        print(f"  Reconciling PartialIngress: {pi_namespace}/{pi_name}", flush=True)
-                        self._process_single_partial_ingress(pi)
-                        reconcile_count += 1
-                        break
+                # Found a matching PartialIngress - reprocess it
+                print(f"  Reconciling PartialIngress: {pi_namespace}/{pi_name}", flush=True)
+                self._process_single_partial_ingress(pi)
+                reconcile_count += 1
 
             if reconcile_count > 0:
                 print(f"  Reconciled {reconcile_count} related PartialIngress(es)", flush=True)
             else:
                 print(f"  No related PartialIngresses found to reconcile", flush=True)
+                # Nothing serves this hostname anymore - drop its replicated Ingresses
+                self._sync_replicated_ingresses(hostname, ingress_class_name, {})
 
         except Exception as e:
             print(f"ERROR: Failed to reconcile related PartialIngresses: {e}", file=sys.stderr)
             import traceback
             traceback.print_exc()
 
-    def _cleanup_orphaned_replicated_ingresses(self):
+    def _cleanup_orphaned_replicated_ingresses(self, exclude_uid=None):
         """
         Cleanup replicated Ingresses when the last PartialIngress for a hostname pattern is deleted.
         Replicated Ingresses are owned by CompositeIngressHost, so we need manual cleanup.
+        exclude_uid skips the PartialIngress being deleted in case the cache has not dropped it yet.
         """
         print(f"  Checking for orphaned replicated Ingresses", flush=True)
 
         try:
-            # Get all CompositeIngressHosts
-            all_composite_hosts = self.get_all_composite_ingress_hosts()
-
-            # Get all active PartialIngresses
-            all_partial_ingresses = self.custom_api.list_cluster_custom_object(
-                group='networking.zengarden.space',
-                version='v1',
-                plural='partialingresses'
-            ).get('items', [])
+            # Count active hostnames (excluding PartialIngresses being deleted) per matching CIH
+            active_hosts_by_cih = {}
+            for hostname, ingress_class in self.path_index.hosts(exclude_uid=exclude_uid):
+                for cih in self.host_matcher.match(hostname, ingress_class):
+                    key = ResourceCache.key(cih)
+                    active_hosts_by_cih[key] = active_hosts_by_cih.get(key, 0) + 1
 
             # For each CompositeIngressHost, check if there are matching PartialIngresses
-            for cih in all_composite_hosts:
+            for cih in self.get_all_composite_ingress_hosts():
                 cih_metadata = cih.get('metadata', {})
-                cih_spec = cih.get('spec', {})
                 cih_namespace = cih_metadata.get('namespace')
                 cih_name = cih_metadata.get('name')
 
-                host_pattern = cih_spec.get('hostPattern')
-                ingress_class = cih_spec.get('ingressClassName')
-
-                # Find matching PartialIngresses (excluding ones being deleted)
-                matching_pis = []
-                for pi in all_partial_ingresses:
-                    # Skip if being deleted
-                    if pi.get('metadata', {}).get('deletionTimestamp'):
-                        continue
-
-                    pi_spec = pi.get('spec', {})
-                    pi_class = pi_spec.get('ingressClassName')
-
-                    if pi_class != ingress_class:
-                        continue
-
-                    # Check if hostname matches pattern
-                    pi_rules = pi_spec.get('rules', [])
-                    for rule in pi_rules:
-                        hostname = rule.get('host', '')
-                        if hostname and fnmatch.fnmatch(hostname, host_pattern):
-                            matching_pis.append(pi)
-                            break
+                active_hosts = active_hosts_by_cih.get(ResourceCache.key(cih), 0)
 
                 # If no matching PartialIngresses, delete all replicated Ingresses for this CIH
-                if len(matching_pis) == 0:
+                if active_hosts == 0:
                     print(f"  No active PartialIngresses for CIH {cih_namespace}/{cih_name}, cleaning up replicated Ingresses", flush=True)
                     self._delete_replicated_ingresses_for_cih(cih_namespace, cih_name)
                 else:
-                    print(f"  CIH {cih_namespace}/{cih_name} still has {len(matching_pis)} matching PartialIngress(es)", flush=True)
+                    print(f"  CIH {cih_namespace}/{cih_name} still has {active_hosts} matching PartialIngress hostname(s)", flush=True)
 
         except Exception as e:
             print(f"ERROR: Failed to cleanup orphaned replicated Ingresses: {e}", file=sys.stderr)
             import traceback
             traceback.print_exc()
 
-    def _delete_replicated_ingresses_for_hostname(self, hostname, ingress_class_name):
-        """Delete all replicated Ingresses for a specific hostname across all namespaces"""
-        try:
-            # Find all replicated Ingresses with this hostname label
-            all_ingresses = self.networking_v1.list_ingress_for_all_namespaces(
-                label_selector='partial-ingress.zengarden.space/replicated=true'
-            )
-
-            deleted_count = 0
-            for ing in all_ingresses.items:
-                # Check if this Ingress is for the target hostname
-                ing_hostname = ing.metadata.labels.get('partial-ingress.zengarden.space/hostname', '')
-
-                # Additional check: verify ingressClassName matches
-                if ing_hostname == hostname and ing.spec.ingress_class_name == ingress_class_name:
-                    print(f"  Deleting old replicated Ingress: {ing.metadata.namespace}/{ing.metadata.name}", flush=True)
-                    try:
-                        self.networking_v1.delete_namespaced_ingress(
-                            name=ing.metadata.name,
-                            namespace=ing.metadata.namespace
-                        )
-                        deleted_count += 1
-                    except ApiException as e:
-                        if e.status != 404:
-                            print(f"WARNING: Failed to delete Ingress {ing.metadata.name}: {e}", file=sys.stderr)
-
-            if deleted_count > 0:
-                print(f"  Deleted {deleted_count} old replicated Ingress(es) for hostname {hostname}", flush=True)
-
-        except ApiException as e:
-            if e.status != 404:
-                print(f"WARNING: Failed to delete old replicated Ingresses for hostname {hostname}: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"ERROR: Failed to delete old replicated Ingresses: {e}", file=sys.stderr)
-
     def _delete_replicated_ingresses_for_cih(self, cih_namespace, cih_name):
         """Delete all replicated Ingresses in a CompositeIngressHost namespace"""
         try:
-            # Find all replicated Ingresses in the CIH namespace
-            all_ingresses = self.networking_v1.list_namespaced_ingress(
-                namespace=cih_namespace,
-                label_selector='partial-ingress.zengarden.space/replicated=true'
-            )
-
             deleted_count = 0
-            for ing in all_ingresses.items:
+            for ing in self.ingresses.list(namespace=cih_namespace):
+                if (ing.metadata.labels or {}).get('partial-ingress.zengarden.space/replicated') != 'true':
+                    continue
+
                 # Verify it's owned by this CIH
                 owner_refs = ing.metadata.owner_references or []
                 is_owned_by_cih = False
@@ -722,6 +1174,7 @@ class PartialIngressService:
                             name=ing.metadata.name,
                             namespace=cih_namespace
                         )
+                        self.ingresses.remove(cih_namespace, ing.metadata.name)
                         deleted_count += 1
                     except ApiException as e:
                         if e.status != 404:
@@ -839,20 +1292,243 @@ class PartialIngressService:
             print(f"WARNING: Failed to update status: {e}", file=sys.stderr)
 
 
-def watch_requests(service, shared_dir='/shared'):
-    """Watch for request files and process them"""
+class KeyedSerializer:
+    """
+    Orders work that shares keys while letting unrelated work run in parallel.
+    Each unit of work reserves its keys in submission order; it may start once every
+    earlier reservation on those keys has finished. Shared reservations on a key run
+    alongside each other, exclusive ones wait for everything queued before them.
+    Because all keys are reserved at once, in a single global order, work can never
+    wait on itself in a cycle.
+    """
+
+    def __init__(self):
+        self._queues = {}
+        self._tickets = {}
+        self._next_ticket = 0
+        self._cond = threading.Condition()
+
+    def reserve(self, keys):
+        """Queue a ticket on keys (a dict of key -> exclusive) and return it"""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._tickets[ticket] = dict(keys)
+            for key, exclusive in keys.items():
+                self._queues.setdefault(key, deque()).append((ticket, exclusive))
+            return ticket
+
+    def _runnable(self, ticket):
+        for key, exclusive in self._tickets[ticket].items():
+            for queued, queued_exclusive in self._queues[key]:
+                if queued == ticket:
+                    break
+                if exclusive or queued_exclusive:
+                    return False
+        return True
+
+    def acquire(self, ticket):
+        """Block until every earlier conflicting ticket has been released"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._runnable(ticket))
+
+    def release(self, ticket):
+        """Drop the ticket from its key queues and wake waiters"""
+        with self._cond:
+            for key in self._tickets.pop(ticket):
+                queue = self._queues[key]
+                queue.remove(next(entry for entry in queue if entry[0] == ticket))
+                if not queue:
+                    del self._queues[key]
+            self._cond.notify_all()
+
+
+def parse_binding_context(binding_context):
+    """Split a binding context into (kind, object, deleted) work items"""
+    context_data = json.loads(binding_context)
+    if not context_data or len(context_data) == 0:
+        raise Exception("Empty binding context")
+
+    items = []
+    for binding in context_data:
+        objects = []
+        if 'object' in binding:
+            objects = [binding['object']]
+        elif 'objects' in binding:
+            objects = [wrapper.get('object', {}) for wrapper in binding['objects']]
+
+        deleted = binding.get('watchEvent') == 'Deleted'
+        for obj in objects:
+            if obj:
+                items.append((obj.get('kind', ''), obj, deleted))
+
+    return items
+
+
+def serialization_keys(service, kind, obj, deleted):
+    """
+    Keys a work item shares with other objects: the hostname and the
+    CompositeIngressHosts a PartialIngress reconcile writes through.
+    """
+    keys = {}
+    if kind != 'PartialIngress':
+        return keys
+
+    spec = obj.get('spec', {})
+    rules = spec.get('rules', [])
+    hostname = rules[0].get('host', '') if rules else ''
+    ingress_class_name = spec.get('ingressClassName', '')
+
+    # Replicated Ingresses are shared by every PartialIngress on a hostname
+    if hostname:
+        keys[f"host/{ingress_class_name}/{hostname}"] = True
+
+    # Deletions sweep every CompositeIngressHost for orphaned replicated Ingresses,
+    # so they must not interleave with reconciles writing into any of them
+    removing = deleted or bool(obj.get('metadata', {}).get('deletionTimestamp'))
+    if removing:
+        composite_hosts = service.get_all_composite_ingress_hosts()
+    elif hostname:
+        composite_hosts = service.host_matcher.match(hostname, ingress_class_name)
+    else:
+        composite_hosts = []
+
+    for cih in composite_hosts:
+        keys[f"CompositeIngressHost/{ResourceCache.key(cih)}/replicas"] = removing
+
+    return keys
+
+
+class RequestProcessor:
+    """
+    Feeds binding contexts through a WorkQueue keyed by object, so bursts of events
+    for the same object collapse into one reconcile of its latest state. Workers
+    process distinct objects concurrently; objects sharing a hostname or
+    CompositeIngressHost are additionally ordered through a KeyedSerializer.
+    """
+
+    def __init__(self, service, workers=REQUEST_WORKERS, max_retries=MAX_RETRIES):
+        self.service = service
+        self.max_retries = max_retries
+        self.queue = WorkQueue()
+        self.serializer = KeyedSerializer()
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"request-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+        # Latest (kind, object, deleted) per queued key
+        self._items = {}
+        self._items_lock = threading.Lock()
+
+        # Keys are reserved on the serializer in the order workers take them from the
+        # queue, so the oldest reservation always belongs to a running worker
+        self._reserve_lock = threading.Lock()
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, binding_context):
+        """Queue a binding context; the returned future resolves to the hook response"""
+        try:
+            items = parse_binding_context(binding_context)
+        except Exception as e:
+            print(f"ERROR processing request: {e}", file=sys.stderr, flush=True)
+            return gather_response([], error=e)
+
+        waiters = []
+        for kind, obj, deleted in items:
+            if kind not in ('PartialIngress', 'CompositeIngressHost'):
+                print(f"WARNING: Unknown kind: {kind}", file=sys.stderr)
+                continue
+
+            key = f"{kind}/{ResourceCache.key(obj)}"
+            with self._items_lock:
+                self._items[key] = (kind, obj, deleted)
+            waiters.append(self.queue.add(key))
+
+        return gather_response(waiters)
+
+    def _worker(self):
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+
+            with self._items_lock:
+                item = self._items.get(key)
+
+            error = None
+            try:
+                if item is not None:
+                    self._process(*item)
+                self.queue.forget(key)
+                with self._items_lock:
+                    if self._items.get(key) is item:
+                        del self._items[key]
+            except Exception as e:
+                error = e
+                if self.queue.num_requeues(key) < self.max_retries:
+                    print(f"WARNING: Requeueing {key} after failure: {e}", file=sys.stderr, flush=True)
+                    self.queue.add_rate_limited(key)
+                else:
+                    print(f"ERROR: Dropping {key} after {self.max_retries} retries: {e}", file=sys.stderr, flush=True)
+                    self.queue.forget(key)
+                    with self._items_lock:
+                        if self._items.get(key) is item:
+                            del self._items[key]
+            finally:
+                self.queue.done(key, error)
+
+    def _process(self, kind, obj, deleted):
+        with self._reserve_lock:
+            ticket = self.serializer.reserve(serialization_keys(self.service, kind, obj, deleted))
+
+        self.serializer.acquire(ticket)
+        try:
+            with RECONCILE_DURATION.labels(kind).time():
+                if kind == 'PartialIngress':
+                    self.service._process_single_partial_ingress(obj, deleted=deleted)
+                else:
+                    self.service._process_single_composite_ingress_host(obj)
+        finally:
+            self.serializer.release(ticket)
+
+    def shutdown(self):
+        """Stop the workers after their current item"""
+        self.queue.shutdown()
+        for worker in self.workers:
+            worker.join()
+
+
+def watch_requests(service, shared_dir='/shared', port=HANDLER_PORT):
+    """Serve hook requests over the loopback socket, with request files as a fallback"""
     global shutdown_requested
 
+    processor = RequestProcessor(service)
+    processor.start()
+    start_metrics_server(shared_dir, processor.queue, METRICS_PORT)
+    server = RequestServer(processor.submit, port)
+    threading.Thread(target=server.serve_forever, name='request-server', daemon=True).start()
+    print(f'PartialIngress Operator service listening on 127.0.0.1:{port} with {REQUEST_WORKERS} workers', flush=True)
+
+    while not os.path.exists(shared_dir) and not shutdown_requested:
+        print(f"Shared directory {shared_dir} does not exist, waiting...", file=sys.stderr, flush=True)
+        time.sleep(1)
+
     print(f'PartialIngress Operator service watching {shared_dir}', flush=True)
 
+    watcher = DirectoryWatcher(shared_dir, poll_interval=0.5)
     processed = set()
+    changed = True
 
     while not shutdown_requested:
         try:
-            if not os.path.exists(shared_dir):
-                print(f"Shared directory {shared_dir} does not exist, waiting...", file=sys.stderr, flush=True)
-                time.sleep(1)
+            if not changed:
+                changed = watcher.wait(timeout=1)
                 continue
+            changed = False
 
             files = os.listdir(shared_dir)
             request_files = [f for f in files if f.startswith('request-') and f.endswith('.json')]
@@ -871,52 +1547,17 @@ def watch_requests(service, shared_dir='/shared'):
 
                 try:
                     # Read request
+                    requested_at = os.path.getmtime(req_path)
                     with open(req_path, 'r') as f:
                         binding_context = f.read()
 
-                    print(f"[handler] Processing request from {req_file}", flush=True)
+                    print(f"[handler] Queued request from {req_file}", flush=True)
 
-                    # Determine which handler to call based on context
-                    # We'll use a simple approach: check the first object's kind
-                    try:
-                        context_data = json.loads(binding_context)
-                        if context_data and len(context_data) > 0:
-                            binding = context_data[0]
-
-                            # Safely extract the object
-                            obj = None
-                            if 'object' in binding:
-                                obj = binding['object']
-                            elif 'objects' in binding and len(binding['objects']) > 0:
-                                obj = binding['objects'][0].get('object', {})
-
-                            if not obj:
-                                print(f"WARNING: No object found in binding context", file=sys.stderr)
-                                response = "OK"
-                                continue
-
-                            kind = obj.get('kind', '')
-
-                            if kind == 'PartialIngress':
-                                service.process_partial_ingress(binding_context)
-                            elif kind == 'CompositeIngressHost':
-                                service.process_composite_ingress_host(binding_context)
-                            else:
-                                print(f"WARNING: Unknown kind: {kind}", file=sys.stderr)
-
-                        response = "OK"
-                        print(f"[handler] Successfully processed request", flush=True)
-                    except Exception as e:
-                        response = f"ERROR: {e}"
-                        print(f"ERROR processing request: {e}", file=sys.stderr, flush=True)
-                        import traceback
-                        traceback.print_exc()
-
-                    # Write response
-                    with open(resp_path, 'w') as f:
-                        f.write(response)
-
-                    print(f"[handler] Wrote response to {os.path.basename(resp_path)}", flush=True)
+                    # Response is written by the worker once the request has been processed
+                    future = processor.submit(binding_context)
+                    future.add_done_callback(
+                        lambda f, path=resp_path, at=requested_at: write_response(path, f, at)
+                    )
                     processed.add(req_file)
 
                 except Exception as e:
@@ -928,13 +1569,10 @@ def watch_requests(service, shared_dir='/shared'):
                         pass
 
             # Clean up old processed files
-            current_time = time.time()
             for filename in list(processed):
                 if not os.path.exists(os.path.join(shared_dir, filename)):
                     processed.discard(filename)
 
-            time.sleep(0.1)
-
         except KeyboardInterrupt:
             print("\n[shutdown] Keyboard interrupt received", flush=True)
             break
@@ -945,6 +1583,9 @@ def watch_requests(service, shared_dir='/shared'):
             else:
                 break
 
+    server.shutdown()
+    server.server_close()
+    processor.shutdown()
     print("[shutdown] Service stopped cleanly", flush=True)
 
 
@@ -960,6 +1601,7 @@ if __name__ == '__main__':
     shared_dir = '/shared'
 
     try:
+        service.start_caches()
         watch_requests(service, shared_dir)
     except Exception as e:
         print(f"FATAL ERROR: {e}", file=sys.stderr, flush=True)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Grafana synchronization benchmark
+Runs GrafanaAlertOperatorService._handle_synchronization against the fake Grafana
+(benchmarks/fake_grafana.py) with N synthetic CRs served by an in-process fake of the
+Kubernetes CustomObjects/CoreV1 APIs, and reports the Grafana requests issued (per
+route and status), the TCP/TLS connections they used and the wall time of a cold,
+a steady-state and a drift-repair synchronization.
+
+Usage:
+    python3 benchmarks/bench_sync.py --alert-rules 2000 --rule-groups 100 --latency-ms 10
+    python3 benchmarks/bench_sync.py --error-rate 0.05 --error-status 429 --retry-after 0.1
+    python3 benchmarks/bench_sync.py --certfile cert.pem --keyfile key.pem   # HTTPS
+
+Tuning options (--sync-workers, --instance-concurrency, --rate-limit, --rate-burst,
+--pool-maxsize, --max-attempts) are passed to the service through the same environment
+variables the chart sets; unset ones keep the service defaults.
+
+A certificate for --certfile can be created with:
+    openssl req -x509 -newkey rsa:2048 -nodes -days 1 -subj /CN=localhost \\
+        -addext subjectAltName=IP:127.0.0.1 -keyout key.pem -out cert.pem
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import logging
+import argparse
+import contextlib
+import importlib.util
+from collections import Counter
+from typing import Dict, Any, List
+
+from kubernetes import client
+
+from fake_grafana import FakeGrafana, add_arguments, state_from_args
+
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'files', 'grafana-alert-service.py')
+
+GROUP = 'monitoring.zengarden.space'
+NAMESPACE = 'monitoring'
+DATASOURCE_UID = 'prometheus'
+
+# Benchmark option -> service environment variable
+TUNING_ENV = {
+    'sync_workers': 'SYNC_WORKERS',
+    'instance_concurrency': 'GRAFANA_INSTANCE_CONCURRENCY',
+    'rate_limit': 'GRAFANA_RATE_LIMIT',
+    'rate_burst': 'GRAFANA_RATE_BURST',
+    'pool_maxsize': 'GRAFANA_POOL_MAXSIZE',
+    'max_attempts': 'GRAFANA_MAX_ATTEMPTS',
+}
+
+
+def load_service_module():
+    """Import grafana-alert-service.py (not importable by name because of the dashes)"""
+    # The service imports operator_runtime.py from its own directory, as it does from /scripts in the pod
+    sys.path.insert(0, os.path.dirname(SERVICE_PATH))
+    spec = importlib.util.spec_from_file_location('grafana_alert_service', SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeKubernetes:
+    """Custom resources and Grafana token Secrets, plus the calls made against them"""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        # plural -> {(namespace, name): object}
+        self.objects: Dict[str, Dict[tuple, Dict[str, Any]]] = {}
+        self.secrets: Dict[tuple, client.V1Secret] = {}
+
+    def add(self, plural: str, obj: Dict[str, Any]) -> None:
+        metadata = obj['metadata']
+        self.objects.setdefault(plural, {})[(metadata['namespace'], metadata['name'])] = obj
+
+    def add_secret(self, namespace: str, name: str, url: str, org_id: int) -> None:
+        encode = lambda value: base64.b64encode(value.encode()).decode()
+        self.secrets[(namespace, name)] = client.V1Secret(
+            metadata=client.V1ObjectMeta(namespace=namespace, name=name, resource_version='1'),
+            data={'token': encode('benchmark-token'), 'url': encode(url), 'orgId': encode(str(org_id))}
+        )
+
+
+class FakeCoreV1Api:
+    def __init__(self, cluster: FakeKubernetes):
+        self.cluster = cluster
+
+    def read_namespaced_secret(self, name: str, namespace: str, **kwargs) -> client.V1Secret:
+        self.cluster.calls['get secrets'] += 1
+        secret = self.cluster.secrets.get((namespace, name))
+        if secret is None:
+            raise client.rest.ApiException(status=404, reason='Not Found')
+        return secret
+
+
+class FakeCustomObjectsApi:
+    def __init__(self, cluster: FakeKubernetes):
+        self.cluster = cluster
+
+    def list_cluster_custom_object(self, group: str, version: str, plural: str, **kwargs) -> Dict[str, Any]:
+        self.cluster.calls[f'list {plural}'] += 1
+        # Copies, like objects decoded from an API response
+        return {'items': json.loads(json.dumps(list(self.cluster.objects.get(plural, {}).values())))}
+
+    def patch_namespaced_custom_object_status(self, group: str, version: str, namespace: str, plural: str,
+                                              name: str, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self.cluster.calls[f'patch {plural}/status'] += 1
+        obj = self.cluster.objects.get(plural, {}).get((namespace, name))
+        if obj is None:
+            raise client.rest.ApiException(status=404, reason='Not Found')
+        obj['status'] = {**(obj.get('status') or {}), **body.get('status', {})}
+        return obj
+
+
+@contextlib.contextmanager
+def fake_kubernetes(module, cluster: FakeKubernetes):
+    """Point the service module's Kubernetes API constructors and config loaders at the fake"""
+    originals = (module.config, module.client.CoreV1Api, module.client.CustomObjectsApi)
+    module.config = type('FakeConfig', (), {'load_incluster_config': staticmethod(lambda: None)})
+    module.client.CoreV1Api = lambda *args, **kwargs: FakeCoreV1Api(cluster)
+    module.client.CustomObjectsApi = lambda *args, **kwargs: FakeCustomObjectsApi(cluster)
+    try:
+        yield
+    finally:
+        module.config, module.client.CoreV1Api, module.client.CustomObjectsApi = originals
+
+
+def grafana_ref(instance: int) -> Dict[str, Any]:
+    return {'secretRef': {'name': f'grafana-token-{instance}', 'namespace': NAMESPACE}}
+
+
+def resource(kind: str, name: str, instance: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'apiVersion': f'{GROUP}/v1',
+        'kind': kind,
+        'metadata': {'namespace': NAMESPACE, 'name': name, 'generation': 1},
+        'spec': dict(spec, grafanaRef=grafana_ref(instance))
+    }
+
+
+def seed(cluster: FakeKubernetes, server: FakeGrafana, args) -> None:
+    """
+    One token Secret (and Grafana org) per --instances, and the CRs spread over them:
+    --alert-rules rules in --rule-groups groups over --folders folders, --mute-timings,
+    --templates and --policies (one root policy and child routes per instance).
+    """
+    folders = [f'folder-{f}' for f in range(args.folders)]
+    for instance in range(args.instances):
+        cluster.add_secret(NAMESPACE, f'grafana-token-{instance}', server.url, instance + 1)
+        server.seed(instance + 1, folders, [DATASOURCE_UID])
+
+    for i in range(args.alert_rules):
+        group = i % args.rule_groups
+        cluster.add('grafanaalertrules', resource('GrafanaAlertRule', f'rule-{i}', group % args.instances, {
+            'folderUID': folders[group % args.folders],
+            'ruleGroup': f'group-{group}',
+            'title': f'Rule {i}',
+            'condition': 'C',
+            'for': '5m',
+            'labels': {'severity': 'warning' if i % 3 else 'critical', 'team': f'team-{i % 7}'},
+            'annotations': {'summary': f'Synthetic alert {i}'},
+            'data': [
+                {
+                    'refId': 'A',
+                    'relativeTimeRange': {'from': 600, 'to': 0},
+                    'datasourceUid': DATASOURCE_UID,
+                    'model': {'expr': f'rate(http_requests_total{{job="svc-{i}"}}[5m]) > 1', 'refId': 'A'}
+                },
+                {
+                    'refId': 'C',
+                    'relativeTimeRange': {'from': 600, 'to': 0},
+                    'datasourceUid': '__expr__',
+                    'model': {'type': 'threshold', 'expression': 'A', 'refId': 'C'}
+                }
+            ]
+        }))
+
+    for i in range(args.mute_timings):
+        cluster.add('grafanamutetimings', resource('GrafanaMuteTiming', f'mute-{i}', i % args.instances, {
+            'name': f'mute-{i}',
+            'timeIntervals': [{'times': [{'start_time': '02:00', 'end_time': '04:00'}], 'weekdays': ['sunday']}]
+        }))
+
+    for i in range(args.templates):
+        cluster.add('grafananotificationtemplates', resource('GrafanaNotificationTemplate', f'template-{i}',
+                                                             i % args.instances, {
+            'name': f'template-{i}',
+            'template': f'{{{{ define "template-{i}" }}}}[{{{{ .Status }}}}] {{{{ .GroupLabels.alertname }}}}{{{{ end }}}}'
+        }))
+
+    for i in range(args.policies):
+        instance = i % args.instances
+        spec = {'receiver': f'receiver-{i}', 'groupBy': ['alertname'], 'repeatInterval': '4h'}
+        if i >= args.instances:
+            spec['matchers'] = [{'label': 'team', 'match': '=', 'value': f'team-{i}'}]
+        cluster.add('grafananotificationpolicies', resource('GrafanaNotificationPolicy', f'policy-{i}', instance, spec))
+
+
+def drift(server: FakeGrafana, args) -> None:
+    """Change Grafana behind the operator's back: edit --drift rules and remove one mute timing"""
+    with server.state.lock:
+        for org in server.state.orgs.values():
+            for rule in list(org.alert_rules.values())[:args.drift]:
+                rule['labels'] = dict(rule.get('labels') or {}, severity='info')
+            for name in list(org.mute_timings)[:1]:
+                del org.mute_timings[name]
+
+
+def flush_status(module, service) -> None:
+    """Write out pending status patches, so the next pass lists CRs with their new status"""
+    service.status_writer.close()
+    service.status_writer = module.StatusWriter(service.k8s_custom)
+
+
+def run_scenario(name: str, module, service, cluster: FakeKubernetes, server: FakeGrafana) -> Dict[str, Any]:
+    """Run one synchronization and collect what it cost"""
+    server.state.reset_stats()
+    cluster.calls.clear()
+
+    started = time.perf_counter()
+    service._handle_synchronization({'type': 'Synchronization'})
+    elapsed = time.perf_counter() - started
+    flush_status(module, service)
+
+    grafana = server.state.stats()
+    return {
+        'scenario': name,
+        'wall_seconds': round(elapsed, 3),
+        'grafana_requests': grafana['requests'],
+        'connections': grafana['connections'],
+        'tls_handshakes': grafana['connections'] if server.tls else 0,
+        'requests_per_connection': grafana['requests_per_connection'],
+        'grafana_by_route': grafana['by_route'],
+        'grafana_by_status': grafana['by_status'],
+        'kubernetes_calls': dict(sorted(cluster.calls.items()))
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    for option, env in TUNING_ENV.items():
+        if getattr(args, option) is not None:
+            os.environ[env] = str(getattr(args, option))
+    if args.certfile:
+        # GrafanaClient verifies certificates; trust the benchmark's self-signed one
+        os.environ['REQUESTS_CA_BUNDLE'] = args.certfile
+
+    module = load_service_module()
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    server = FakeGrafana(state_from_args(args), certfile=args.certfile, keyfile=args.keyfile)
+    server.start()
+    cluster = FakeKubernetes()
+    seed(cluster, server, args)
+
+    try:
+        with fake_kubernetes(module, cluster):
+            service = module.GrafanaAlertOperatorService()
+
+        results = [run_scenario('cold', module, service, cluster, server)]
+        results.append(run_scenario('steady', module, service, cluster, server))
+        drift(server, args)
+        results.append(run_scenario('drift', module, service, cluster, server))
+
+        service.status_writer.close()
+        service.grafana_clients.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    settings = {env: getattr(module, env) for env in TUNING_ENV.values()}
+    return {'settings': settings, 'tls': server.tls, 'results': results}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    settings = ', '.join(f'{k}={v}' for k, v in report['settings'].items())
+    print(f"settings: {settings}, tls={report['tls']}\n")
+    print(f"{'scenario':<8} {'wall s':>8} {'requests':>9} {'connections':>12} {'req/conn':>9} {'tls handshakes':>15}")
+    for r in report['results']:
+        print(f"{r['scenario']:<8} {r['wall_seconds']:>8} {r['grafana_requests']:>9} {r['connections']:>12} "
+              f"{r['requests_per_connection']:>9} {r['tls_handshakes']:>15}")
+    for r in report['results']:
+        print(f"\n{r['scenario']}:")
+        for route, count in r['grafana_by_route'].items():
+            print(f"  {route:<70} {count:>6}")
+        print(f"  statuses: {r['grafana_by_status']}")
+        print(f"  kubernetes: {r['kubernetes_calls']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alert-rules', type=int, default=500, help='GrafanaAlertRule CRs')
+    parser.add_argument('--rule-groups', type=int, default=50, help='rule groups the alert rules are spread over')
+    parser.add_argument('--folders', type=int, default=5, help='Grafana folders the rule groups are spread over')
+    parser.add_argument('--mute-timings', type=int, default=20, help='GrafanaMuteTiming CRs')
+    parser.add_argument('--templates', type=int, default=20, help='GrafanaNotificationTemplate CRs')
+    parser.add_argument('--policies', type=int, default=10, help='GrafanaNotificationPolicy CRs')
+    parser.add_argument('--instances', type=int, default=1, help='Grafana instances (token Secrets / orgs)')
+    parser.add_argument('--drift', type=int, default=10, help='rules changed in Grafana before the drift pass')
+    parser.add_argument('--sync-workers', type=int, help='SYNC_WORKERS')
+    parser.add_argument('--instance-concurrency', type=int, help='GRAFANA_INSTANCE_CONCURRENCY')
+    parser.add_argument('--rate-limit', type=float, help='GRAFANA_RATE_LIMIT (requests/s, 0 disables)')
+    parser.add_argument('--rate-burst', type=int, help='GRAFANA_RATE_BURST')
+    parser.add_argument('--pool-maxsize', type=int, help='GRAFANA_POOL_MAXSIZE')
+    parser.add_argument('--max-attempts', type=int, help='GRAFANA_MAX_ATTEMPTS')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='keep the service log output')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    args.instances = max(1, args.instances)
+    args.rule_groups = max(1, min(args.rule_groups, max(args.alert_rules, 1)))
+    args.folders = max(1, args.folders)
+    if bool(args.certfile) != bool(args.keyfile):
+        parser.error('--certfile and --keyfile must be given together')
+
+    report = run(args)
+
+    if args.json:
+        print(json.dumps(dict(report, parameters=vars(args)), indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Fake Grafana
+Lightweight stand-in for the Grafana HTTP endpoints GrafanaClient uses: provisioning
+alert-rules, rule-groups, policies, mute-timings and templates, plus folder search,
+folder creation and datasources. State is kept in memory per X-Grafana-Org-Id.
+
+Every request can be delayed (latency) and a fraction of them rejected with a 429 or
+5xx before being processed (error injection), so retries, rate limiting and
+concurrency settings can be exercised reproducibly. The server counts requests per
+route and status and the TCP connections it accepted, which shows whether clients
+reuse their pooled (and, with --certfile, TLS) connections.
+
+Usage:
+    python3 benchmarks/fake_grafana.py --port 3000 --latency-ms 20 --error-rate 0.05
+"""
+
+import re
+import ssl
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote
+from typing import Optional, Dict, Any, List
+
+
+class GrafanaOrg:
+    """Alerting state of one Grafana organization"""
+
+    def __init__(self):
+        self.alert_rules: Dict[str, Dict[str, Any]] = {}
+        # (folderUID, ruleGroup) -> evaluation interval in seconds
+        self.rule_groups: Dict[tuple, int] = {}
+        self.policies: Dict[str, Any] = {'receiver': 'grafana-default-email', 'group_by': ['grafana_folder', 'alertname']}
+        self.mute_timings: Dict[str, Dict[str, Any]] = {}
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        self.folders: Dict[str, Dict[str, Any]] = {}
+        self.datasources: Dict[str, Dict[str, Any]] = {}
+
+    def group_rules(self, folder_uid: str, group: str) -> List[Dict[str, Any]]:
+        return [r for r in self.alert_rules.values()
+                if r.get('folderUID') == folder_uid and r.get('ruleGroup') == group]
+
+
+class FakeGrafanaState:
+    """Organizations, behaviour settings and request statistics shared by the handler threads"""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 retry_after: Optional[float] = None, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.orgs: Dict[int, GrafanaOrg] = {}
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._next_id = 0
+
+    def org(self, org_id: int) -> GrafanaOrg:
+        if org_id not in self.orgs:
+            self.orgs[org_id] = GrafanaOrg()
+        return self.orgs[org_id]
+
+    def next_uid(self) -> str:
+        self._next_id += 1
+        return f"fake{self._next_id:08d}"
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.statuses.clear()
+            self.connections = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            total = sum(self.requests.values())
+            return {
+                'requests': total,
+                'connections': self.connections,
+                'requests_per_connection': round(total / self.connections, 1) if self.connections else 0.0,
+                'by_route': {f"{method} {route}": n for (method, route), n in sorted(self.requests.items())},
+                'by_status': {str(status): n for status, n in sorted(self.statuses.items())}
+            }
+
+
+class Route:
+    def __init__(self, method: str, pattern: str, handler: str):
+        self.method = method
+        self.label = pattern
+        self.regex = re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', pattern) + '$')
+        self.handler = handler
+
+
+ROUTES = [
+    Route('GET', '/api/v1/provisioning/alert-rules', 'list_alert_rules'),
+    Route('POST', '/api/v1/provisioning/alert-rules', 'create_alert_rule'),
+    Route('GET', '/api/v1/provisioning/alert-rules/{uid}', 'get_alert_rule'),
+    Route('PUT', '/api/v1/provisioning/alert-rules/{uid}', 'update_alert_rule'),
+    Route('DELETE', '/api/v1/provisioning/alert-rules/{uid}', 'delete_alert_rule'),
+    Route('GET', '/api/v1/provisioning/folder/{folder}/rule-groups/{group}', 'get_rule_group'),
+    Route('PUT', '/api/v1/provisioning/folder/{folder}/rule-groups/{group}', 'update_rule_group'),
+    Route('GET', '/api/v1/provisioning/policies', 'get_policies'),
+    Route('PUT', '/api/v1/provisioning/policies', 'update_policies'),
+    Route('GET', '/api/v1/provisioning/mute-timings', 'list_mute_timings'),
+    Route('POST', '/api/v1/provisioning/mute-timings', 'create_mute_timing'),
+    Route('GET', '/api/v1/provisioning/mute-timings/{name}', 'get_mute_timing'),
+    Route('PUT', '/api/v1/provisioning/mute-timings/{name}', 'update_mute_timing'),
+    Route('DELETE', '/api/v1/provisioning/mute-timings/{name}', 'delete_mute_timing'),
+    Route('GET', '/api/v1/provisioning/templates', 'list_templates'),
+    Route('GET', '/api/v1/provisioning/templates/{name}', 'get_template'),
+    Route('PUT', '/api/v1/provisioning/templates/{name}', 'put_template'),
+    Route('DELETE', '/api/v1/provisioning/templates/{name}', 'delete_template'),
+    Route('GET', '/api/search', 'search_folders'),
+    Route('POST', '/api/folders', 'create_folder'),
+    Route('GET', '/api/datasources', 'list_datasources'),
+]
+
+
+class FakeGrafanaHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to the route handlers below; each returns (status, body)"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid delayed-ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body if body is not None else {}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str) -> None:
+        state: FakeGrafanaState = self.server.state
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        path = urlsplit(self.path).path
+        route, params = None, {}
+        for candidate in ROUTES:
+            match = candidate.regex.match(path) if candidate.method == method else None
+            if match:
+                route, params = candidate, {k: unquote(v) for k, v in match.groupdict().items()}
+                break
+
+        if state.latency:
+            time.sleep(state.latency)
+
+        with state.lock:
+            state.requests[(method, route.label if route else path)] += 1
+            rejected = state.error_rate and state.random.random() < state.error_rate
+
+        if route is None:
+            status, body, headers = 404, {'message': 'Not found'}, None
+        elif rejected:
+            status, body = state.error_status, {'message': 'injected error'}
+            headers = {'Retry-After': str(state.retry_after)} if state.retry_after is not None else None
+        else:
+            org = state.org(int(self.headers.get('X-Grafana-Org-Id') or 1))
+            payload = json.loads(raw) if raw else None
+            with state.lock:
+                status, body = getattr(self, route.handler)(state, org, payload, **params)
+            headers = None
+
+        with state.lock:
+            state.statuses[status] += 1
+        self._send(status, body, headers)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    # Alert rules
+    @staticmethod
+    def _store_rule(state: FakeGrafanaState, org: GrafanaOrg, payload: Dict[str, Any],
+                    uid: Optional[str] = None) -> Dict[str, Any]:
+        rule = dict(payload, uid=uid or payload.get('uid') or state.next_uid(), provenance='',
+                    updated=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+        org.alert_rules[rule['uid']] = rule
+        org.rule_groups.setdefault((rule.get('folderUID'), rule.get('ruleGroup')), 60)
+        return rule
+
+    def list_alert_rules(self, state, org, payload):
+        return 200, list(org.alert_rules.values())
+
+    def create_alert_rule(self, state, org, payload):
+        if payload.get('folderUID') not in org.folders:
+            return 400, {'message': 'folder does not exist'}
+        return 201, self._store_rule(state, org, payload)
+
+    def get_alert_rule(self, state, org, payload, uid):
+        rule = org.alert_rules.get(uid)
+        return (200, rule) if rule else (404, {'message': 'rule not found'})
+
+    def update_alert_rule(self, state, org, payload, uid):
+        if uid not in org.alert_rules:
+            return 404, {'message': 'rule not found'}
+        return 200, self._store_rule(state, org, payload, uid)
+
+    def delete_alert_rule(self, state, org, payload, uid):
+        org.alert_rules.pop(uid, None)
+        return 204, None
+
+    # Rule groups
+    def get_rule_group(self, state, org, payload, folder, group):
+        rules = org.group_rules(folder, group)
+        if not rules:
+            return 404, {'message': 'rule group not found'}
+        return 200, {'title': group, 'folderUid': folder,
+                     'interval': org.rule_groups.get((folder, group), 60), 'rules': rules}
+
+    def update_rule_group(self, state, org, payload, folder, group):
+        if folder not in org.folders:
+            return 400, {'message': 'folder does not exist'}
+        kept = set()
+        rules = []
+        for rule in payload.get('rules') or []:
+            stored = self._store_rule(state, org, dict(rule, folderUID=folder, ruleGroup=group))
+            kept.add(stored['uid'])
+            rules.append(stored)
+        for rule in org.group_rules(folder, group):
+            if rule['uid'] not in kept:
+                del org.alert_rules[rule['uid']]
+        org.rule_groups[(folder, group)] = payload.get('interval', 60)
+        return 200, {'title': group, 'folderUid': folder, 'interval': org.rule_groups[(folder, group)], 'rules': rules}
+
+    # Notification policies
+    def get_policies(self, state, org, payload):
+        return 200, org.policies
+
+    def update_policies(self, state, org, payload):
+        org.policies = payload
+        return 202, {'message': 'policies updated'}
+
+    # Mute timings
+    @staticmethod
+    def _store_mute_timing(org: GrafanaOrg, payload: Dict[str, Any]) -> Dict[str, Any]:
+        previous = org.mute_timings.get(payload['name'], {})
+        timing = dict(payload, version=str(int(previous.get('version', '0')) + 1), provenance='')
+        org.mute_timings[timing['name']] = timing
+        return timing
+
+    def list_mute_timings(self, state, org, payload):
+        return 200, list(org.mute_timings.values())
+
+    def create_mute_timing(self, state, org, payload):
+        if payload['name'] in org.mute_timings:
+            return 409, {'message': 'mute timing already exists'}
+        return 201, self._store_mute_timing(org, payload)
+
+    def get_mute_timing(self, state, org, payload, name):
+        timing = org.mute_timings.get(name)
+        return (200, timing) if timing else (404, {'message': 'mute timing not found'})
+
+    def update_mute_timing(self, state, org, payload, name):
+        if name not in org.mute_timings:
+            return 404, {'message': 'mute timing not found'}
+        return 200, self._store_mute_timing(org, dict(payload, name=name))
+
+    def delete_mute_timing(self, state, org, payload, name):
+        org.mute_timings.pop(name, None)
+        return 204, None
+
+    # Templates
+    def list_templates(self, state, org, payload):
+        return 200, list(org.templates.values())
+
+    def get_template(self, state, org, payload, name):
+        template = org.templates.get(name)
+        return (200, template) if template else (404, {'message': 'template not found'})
+
+    def put_template(self, state, org, payload, name):
+        previous = org.templates.get(name, {})
+        template = dict(payload, name=name, version=str(int(previous.get('version', '0')) + 1), provenance='')
+        org.templates[name] = template
+        return 202, template
+
+    def delete_template(self, state, org, payload, name):
+        org.templates.pop(name, None)
+        return 204, None
+
+    # Folders and datasources
+    def search_folders(self, state, org, payload):
+        return 200, [dict(folder, type='dash-folder') for folder in org.folders.values()]
+
+    def create_folder(self, state, org, payload):
+        if payload['uid'] in org.folders:
+            return 409, {'message': 'a folder with the same uid already exists'}
+        org.folders[payload['uid']] = {'uid': payload['uid'], 'title': payload.get('title', payload['uid'])}
+        return 200, org.folders[payload['uid']]
+
+    def list_datasources(self, state, org, payload):
+        return 200, list(org.datasources.values())
+
+
+class FakeGrafana(ThreadingHTTPServer):
+    """Threaded fake Grafana on loopback; pass certfile/keyfile to serve HTTPS"""
+
+    daemon_threads = True
+
+    def __init__(self, state: FakeGrafanaState, port: int = 0,
+                 certfile: Optional[str] = None, keyfile: Optional[str] = None):
+        super().__init__(('127.0.0.1', port), FakeGrafanaHandler)
+        self.state = state
+        self.tls = certfile is not None
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def url(self) -> str:
+        return f"{'https' if self.tls else 'http'}://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> None:
+        threading.Thread(target=self.serve_forever, name='fake-grafana', daemon=True).start()
+
+    def seed(self, org_id: int, folders: List[str], datasources: List[str]) -> None:
+        """Create folders and datasources alert rules can reference"""
+        with self.state.lock:
+            org = self.state.org(org_id)
+            for uid in folders:
+                org.folders[uid] = {'uid': uid, 'title': uid}
+            for uid in datasources:
+                org.datasources[uid] = {'uid': uid, 'name': uid, 'type': 'prometheus'}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fake Grafana behaviour options, shared with the benchmark"""
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='delay added to every Grafana request')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of Grafana requests rejected before processing')
+    parser.add_argument('--error-status', type=int, default=503, help='status of rejected requests (e.g. 429, 503)')
+    parser.add_argument('--retry-after', type=float, default=None, help='Retry-After seconds sent with rejections')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for error injection')
+    parser.add_argument('--certfile', help='serve HTTPS with this certificate (PEM)')
+    parser.add_argument('--keyfile', help='private key for --certfile')
+
+
+def state_from_args(args) -> FakeGrafanaState:
+    return FakeGrafanaState(latency=args.latency_ms / 1000.0, error_rate=args.error_rate,
+                            error_status=args.error_status, retry_after=args.retry_after, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--folders', default='general', help='comma-separated folder UIDs to create in org 1')
+    parser.add_argument('--datasources', default='prometheus', help='comma-separated datasource UIDs in org 1')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeGrafana(state_from_args(args), args.port, args.certfile, args.keyfile)
+    server.seed(1, [f for f in args.folders.split(',') if f], [d for d in args.datasources.split(',') if d])
+    print(f"Fake Grafana listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.state.stats(), indent=2))
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
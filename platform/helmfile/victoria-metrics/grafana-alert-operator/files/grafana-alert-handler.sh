@@ -1,6 +1,6 @@
 #!/bin/bash
 
-set -eo pipefail
+set -euo pipefail
 
 # Define hook configuration
 if [[ "${1:-}" == "--config" ]]; then
@@ -27,35 +27,69 @@ EOF
   exit 0
 fi
 
-# Main execution
-TIMESTAMP=$(date +%s)
-REQUEST_FILE="/shared/request-${TIMESTAMP}.json"
-RESPONSE_FILE="/shared/response-${TIMESTAMP}.txt"
+# Ensure binding context file exists and is non-empty
+if [[ ! -s "$BINDING_CONTEXT_PATH" ]]; then
+  echo "ERROR: binding context file missing or empty: $BINDING_CONTEXT_PATH" >&2
+  exit 1
+fi
 
-# Write binding context to shared volume
-echo "$BINDING_CONTEXT" > "$REQUEST_FILE"
+# Socket IPC - send the binding context to the handler service over the pod's
+# loopback interface and read the response synchronously
+HANDLER_PORT="${HANDLER_PORT:-9180}"
+if { exec 3<>"/dev/tcp/127.0.0.1/${HANDLER_PORT}"; } 2>/dev/null; then
+  echo "Sending request to handler service on port ${HANDLER_PORT}..."
+  { wc -c < "$BINDING_CONTEXT_PATH" | tr -d ' '; cat "$BINDING_CONTEXT_PATH"; } >&3
 
-# Wait for handler service to process (max 60 seconds)
-TIMEOUT=60
-ELAPSED=0
+  response=""
+  IFS= read -r -t 30 response <&3 || true
+  exec 3<&-
 
-while [[ ! -f "$RESPONSE_FILE" ]] && [[ $ELAPSED -lt $TIMEOUT ]]; do
-  sleep 1
-  ELAPSED=$((ELAPSED + 1))
-done
+  if [[ -z "$response" ]]; then
+    echo "ERROR: Timeout waiting for handler service" >&2
+    exit 1
+  fi
 
-if [[ -f "$RESPONSE_FILE" ]]; then
-  RESPONSE=$(cat "$RESPONSE_FILE")
-  echo "Handler response: $RESPONSE"
-  rm -f "$RESPONSE_FILE"
+  echo "Handler response: $response"
 
-  # Check for errors
-  if echo "$RESPONSE" | grep -q "^ERROR:"; then
-    echo "Handler reported error: $RESPONSE" >&2
+  # Successful responses describe what was reconciled, failures start with ERROR:
+  if [[ "$response" == ERROR:* ]]; then
+    echo "ERROR: Handler failed: $response" >&2
     exit 1
   fi
-else
-  echo "Handler timeout after ${TIMEOUT} seconds" >&2
-  rm -f "$REQUEST_FILE"
-  exit 1
+  exit 0
 fi
+
+# File-based IPC fallback - write request, wait for response
+SHARED_DIR="/shared"
+REQUEST_ID=$(date +%s%N)
+REQUEST_FILE="${SHARED_DIR}/request-${REQUEST_ID}.json"
+RESPONSE_FILE="${SHARED_DIR}/response-${REQUEST_ID}.txt"
+
+# Write the binding context as the request
+echo "Writing request to ${REQUEST_FILE}..."
+cat "$BINDING_CONTEXT_PATH" > "$REQUEST_FILE"
+
+# Wait for response file (with timeout)
+echo "Waiting for handler service response..."
+for i in {1..60}; do
+  if [[ -f "$RESPONSE_FILE" ]]; then
+    response=$(cat "$RESPONSE_FILE")
+
+    # Clean up files
+    rm -f "$REQUEST_FILE" "$RESPONSE_FILE"
+
+    echo "Handler response: $response"
+
+    if [[ "$response" == ERROR:* ]]; then
+      echo "ERROR: Handler failed: $response" >&2
+      exit 1
+    fi
+    exit 0
+  fi
+  sleep 0.5
+done
+
+# Timeout - clean up request file
+rm -f "$REQUEST_FILE"
+echo "ERROR: Timeout waiting for handler service" >&2
+exit 1
@@ -8,14 +8,27 @@ import os
 import sys
 import time
 import json
+import random
 import base64
+import hashlib
 import signal
 import logging
+import threading
+import contextlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from typing import Optional, Dict, Any, List, Set
 
 import requests
+from requests.adapters import HTTPAdapter
 from kubernetes import client, config
+from prometheus_client import Counter, Histogram
+from operator_runtime import (
+    RECONCILE_BUCKETS, WorkQueue, write_response, RequestServer, DirectoryWatcher,
+    instrument_api_client, start_metrics_server
+)
 
 # Configure logging
 logging.basicConfig(
@@ -25,15 +38,445 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Loopback port the hook delivers binding contexts to
+HANDLER_PORT = int(os.environ.get('HANDLER_PORT', '9180'))
+
+# Times a failed resource is retried with exponential backoff before it is dropped
+MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '10'))
+
+# Queue workers reconciling different resources concurrently
+REQUEST_WORKERS = int(os.environ.get('REQUEST_WORKERS', '4'))
+
+# Work queue key for a full resync of every resource kind
+SYNC_KEY = 'sync'
+
+# Seconds a cached Grafana client is trusted before its Secret's resourceVersion is rechecked
+SECRET_RECHECK_SECONDS = float(os.environ.get('SECRET_RECHECK_SECONDS', '30'))
+
+# Keep-alive connections kept per Grafana instance
+GRAFANA_POOL_MAXSIZE = int(os.environ.get('GRAFANA_POOL_MAXSIZE', '10'))
+
+# Sustained requests per second and burst size allowed per Grafana host (0 disables the limit)
+GRAFANA_RATE_LIMIT = float(os.environ.get('GRAFANA_RATE_LIMIT', '20'))
+GRAFANA_RATE_BURST = int(os.environ.get('GRAFANA_RATE_BURST', '40'))
+
+# Connect and read timeouts (seconds) for Grafana requests
+GRAFANA_CONNECT_TIMEOUT = float(os.environ.get('GRAFANA_CONNECT_TIMEOUT', '5'))
+GRAFANA_READ_TIMEOUT = float(os.environ.get('GRAFANA_READ_TIMEOUT', '30'))
+
+# Attempts per Grafana request for transient failures, and the backoff cap (seconds) between them
+GRAFANA_MAX_ATTEMPTS = int(os.environ.get('GRAFANA_MAX_ATTEMPTS', '5'))
+GRAFANA_BACKOFF_BASE = 0.5
+GRAFANA_BACKOFF_MAX = float(os.environ.get('GRAFANA_BACKOFF_MAX', '30'))
+
+# Responses worth retrying: throttling, and a Grafana (or its proxy) that is restarting
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Seconds folder and datasource lists are cached per Grafana, and the minimum gap between
+# early refreshes triggered by an unknown UID
+REFERENCE_CACHE_TTL = float(os.environ.get('REFERENCE_CACHE_TTL', '300'))
+REFERENCE_MISS_REFRESH = float(os.environ.get('REFERENCE_MISS_REFRESH', '10'))
+
+# Create the folder of an alert rule when it does not exist yet, instead of failing the rule
+AUTO_CREATE_FOLDERS = os.environ.get('AUTO_CREATE_FOLDERS', 'false').lower() == 'true'
+
+# Datasource UIDs of server-side expressions, which are not real datasources
+EXPRESSION_DATASOURCE_UIDS = {'__expr__', '-100'}
+
+# Evaluation interval (seconds) for rule groups the operator creates; existing groups keep theirs
+DEFAULT_RULE_GROUP_INTERVAL = int(os.environ.get('DEFAULT_RULE_GROUP_INTERVAL', '60'))
+
+# Annotation marking alert rules written by this operator, holding the owning CR's namespace/name
+OWNER_ANNOTATION = 'grafana-alert-operator.zengarden.space/owner'
+
+# Delete alert rules carrying OWNER_ANNOTATION that no GrafanaAlertRule claims anymore (opt-in)
+PRUNE_ORPHANED_RULES = os.environ.get('PRUNE_ORPHANED_RULES', 'false').lower() == 'true'
+
+# Background threads patching CR status, and how often a failed patch is retried
+STATUS_WORKERS = int(os.environ.get('STATUS_WORKERS', '4'))
+STATUS_MAX_RETRIES = int(os.environ.get('STATUS_MAX_RETRIES', '5'))
+
+# Status fields that change on every write and do not make a write worth sending
+VOLATILE_STATUS_FIELDS = {'lastSynced'}
+
+# Threads used to fan out a synchronization, and how many of them may talk to one Grafana at once
+SYNC_WORKERS = int(os.environ.get('SYNC_WORKERS', '8'))
+GRAFANA_INSTANCE_CONCURRENCY = int(os.environ.get('GRAFANA_INSTANCE_CONCURRENCY', '4'))
+
+
+# Port serving Prometheus metrics on /metrics
+METRICS_PORT = int(os.environ.get('METRICS_PORT', '9181'))
+
+RECONCILE_DURATION = Histogram(
+    'operator_reconcile_duration_seconds', 'Time spent processing one work queue key', ['kind'],
+    buckets=RECONCILE_BUCKETS)
+GRAFANA_REQUESTS = Counter(
+    'operator_grafana_requests_total', 'Grafana API requests, counting each retry attempt', ['method', 'code'])
+GRAFANA_REQUEST_DURATION = Histogram(
+    'operator_grafana_request_duration_seconds', 'Grafana API request latency per attempt', ['method'])
+
+
+def _duration_seconds(value: Any) -> Optional[int]:
+    """Parse Grafana/Prometheus durations such as '90s', '5m' or '1h30m' into seconds"""
+    units = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str) or not value:
+        return None
+
+    total = 0.0
+    number = ''
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == '.':
+            number += ch
+            i += 1
+            continue
+        unit = 'ms' if value[i:i + 2] == 'ms' else ch
+        if unit not in units or not number:
+            return None
+        total += float(number) * units[unit]
+        number = ''
+        i += len(unit)
+
+    return None if number else int(total)
+
+
+def _contains(desired: Any, actual: Any) -> bool:
+    """
+    True if actual carries everything in desired. Dicts may have extra keys on the
+    Grafana side (server-side defaults), lists must match element by element.
+    """
+    if isinstance(desired, dict):
+        return isinstance(actual, dict) and all(
+            k in actual and _contains(v, actual[k]) for k, v in desired.items()
+        )
+    if isinstance(desired, list):
+        return (isinstance(actual, list) and len(desired) == len(actual)
+                and all(_contains(d, a) for d, a in zip(desired, actual)))
+    return desired == actual
+
+
+def _prune_empty(value: Any) -> Any:
+    """Drop None and empty collections, which Grafana omits from the objects it returns"""
+    if isinstance(value, dict):
+        pruned = {k: _prune_empty(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, [], {})}
+    if isinstance(value, list):
+        return [_prune_empty(v) for v in value]
+    return value
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """Stable hash of a rendered Grafana payload, recorded in status to detect spec changes"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def alert_rule_matches(desired: Dict[str, Any], actual: Dict[str, Any]) -> bool:
+    """Compare an alert rule payload with the rule Grafana returns"""
+    for field in ('folderUID', 'ruleGroup', 'title', 'condition', 'noDataState', 'execErrState'):
+        if desired.get(field) != actual.get(field):
+            return False
+
+    # Label and annotation maps are owned by the CR - extra keys in Grafana are drift
+    for field in ('labels', 'annotations'):
+        if (desired.get(field) or {}) != (actual.get(field) or {}):
+            return False
+
+    if _duration_seconds(desired.get('for')) != _duration_seconds(actual.get('for')):
+        return False
+
+    return _contains(desired.get('data', []), actual.get('data', []))
+
+
+class SharedExclusiveLock:
+    """
+    Lets resource reconciles run side by side (shared) while a full synchronization
+    runs alone (exclusive), so a sync never writes back state an event just changed.
+    Waiting exclusive holders block new shared ones, so a sync is not starved.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    @contextlib.contextmanager
+    def shared(self):
+        with self._cond:
+            while self._exclusive or self._exclusive_waiting:
+                self._cond.wait()
+            self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._shared -= 1
+                self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._exclusive_waiting += 1
+            while self._exclusive or self._shared:
+                self._cond.wait()
+            self._exclusive_waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
+
+class GrafanaSnapshot:
+    """
+    Alerting objects of one Grafana instance, listed lazily once per synchronization
+    so each CR can be compared against Grafana without a GET of its own.
+    Shared by the synchronization worker threads.
+    """
+
+    def __init__(self, grafana: 'GrafanaClient'):
+        self.grafana = grafana
+        self._alert_rules: Optional[List[Dict[str, Any]]] = None
+        self._mute_timings: Optional[Dict[str, Dict[str, Any]]] = None
+        self._templates: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def alert_rules(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._alert_rules is None:
+                self._alert_rules = self.grafana.list_alert_rules() or []
+        return self._alert_rules
+
+    def rules_in_group(self, folder_uid: str, rule_group: str) -> List[Dict[str, Any]]:
+        return [r for r in self.alert_rules()
+                if r.get('folderUID') == folder_uid and r.get('ruleGroup') == rule_group]
+
+    def mute_timing(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._mute_timings is None:
+                self._mute_timings = {m.get('name'): m for m in self.grafana.list_mute_timings() or []}
+        return self._mute_timings.get(name)
+
+    def template(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._templates is None:
+                self._templates = {t.get('name'): t for t in self.grafana.list_templates() or []}
+        return self._templates.get(name)
+
+
+class InvalidResourceError(ValueError):
+    """A resource references something Grafana does not have; retrying is pointless until its spec changes"""
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every client talking to one Grafana host.
+    acquire() blocks until a token is available; pause() holds all callers back,
+    e.g. while Grafana asks us to slow down with a 429.
+    """
+
+    _hosts: Dict[str, 'TokenBucket'] = {}
+    _hosts_lock = threading.Lock()
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_host(cls, url: str) -> 'TokenBucket':
+        """Return the bucket of the host a URL points at, creating it on first use"""
+        host = urlsplit(url).netloc
+        with cls._hosts_lock:
+            if host not in cls._hosts:
+                cls._hosts[host] = cls(GRAFANA_RATE_LIMIT, GRAFANA_RATE_BURST)
+            return cls._hosts[host]
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    if self.rate <= 0:
+                        return
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+                else:
+                    delay = self._paused_until - now
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class GrafanaSession(requests.Session):
+    """
+    requests.Session that rate limits per host, applies default timeouts and retries
+    transient failures with capped exponential backoff and full jitter, honouring
+    Retry-After. POSTs are only retried when Grafana cannot have processed them.
+    """
+
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}
+
+    def __init__(self, bucket: TokenBucket, max_attempts: int = GRAFANA_MAX_ATTEMPTS,
+                 timeout: tuple = (GRAFANA_CONNECT_TIMEOUT, GRAFANA_READ_TIMEOUT)):
+        super().__init__()
+        self.bucket = bucket
+        self.max_attempts = max(max_attempts, 1)
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+
+        attempt = 1
+        while True:
+            self.bucket.acquire()
+            start = time.monotonic()
+            try:
+                resp = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._observe(method, 'error', start)
+                # A connect timeout never reached Grafana, anything else might have
+                retryable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retryable or attempt >= self.max_attempts:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s "
+                               f"(attempt {attempt}/{self.max_attempts})")
+            else:
+                self._observe(method, str(resp.status_code), start)
+                # 429 and 503 are rejected before processing, other gateway errors might not be
+                retryable = idempotent or resp.status_code in (429, 503)
+                if resp.status_code not in RETRY_STATUSES or not retryable or attempt >= self.max_attempts:
+                    return resp
+
+                delay = self._retry_after(resp)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                if resp.status_code == 429:
+                    # Throttled: hold back every request to this host, not just this one
+                    self.bucket.pause(delay)
+                resp.close()
+                logger.warning(f"{method} {url} returned {resp.status_code}, retrying in {delay:.1f}s "
+                               f"(attempt {attempt}/{self.max_attempts})")
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _observe(method: str, code: str, start: float) -> None:
+        GRAFANA_REQUESTS.labels(method.upper(), code).inc()
+        GRAFANA_REQUEST_DURATION.labels(method.upper()).observe(time.monotonic() - start)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return random.uniform(0, min(GRAFANA_BACKOFF_MAX, GRAFANA_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _retry_after(resp: requests.Response) -> Optional[float]:
+        """Parse Retry-After (seconds or HTTP date), capped at GRAFANA_BACKOFF_MAX"""
+        value = resp.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), GRAFANA_BACKOFF_MAX)
+
+
+class GrafanaReferenceCache:
+    """
+    Folder and datasource UIDs of one Grafana, cached for REFERENCE_CACHE_TTL so alert
+    rule references are checked locally instead of failing with a 400 after a round-trip.
+    An unknown UID refreshes the list early, at most once per REFERENCE_MISS_REFRESH.
+    """
+
+    def __init__(self, grafana: 'GrafanaClient', ttl: float = REFERENCE_CACHE_TTL,
+                 miss_refresh: float = REFERENCE_MISS_REFRESH):
+        self.grafana = grafana
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self._loaders = {
+            'folder': lambda: {f['uid'] for f in grafana.list_folders()},
+            'datasource': lambda: {d['uid'] for d in grafana.list_datasources()}
+        }
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _contains(self, kind: str, uid: str) -> bool:
+        with self._lock:
+            uids, loaded = self._entries.get(kind, (None, 0.0))
+            age = time.monotonic() - loaded
+            if uids is None or age >= self.ttl or (uid not in uids and age >= self.miss_refresh):
+                uids = self._loaders[kind]()
+                self._entries[kind] = (uids, time.monotonic())
+            return uid in uids
+
+    def has_folder(self, uid: str) -> bool:
+        return self._contains('folder', uid)
+
+    def has_datasource(self, uid: str) -> bool:
+        return self._contains('datasource', uid)
+
+    def add_folder(self, uid: str) -> None:
+        with self._lock:
+            if 'folder' in self._entries:
+                self._entries['folder'][0].add(uid)
+
+    def validate_alert_rule(self, payload: Dict[str, Any], create_folders: bool = False) -> None:
+        """Raise InvalidResourceError if the rule's folder or datasources do not exist"""
+        folder_uid = payload['folderUID']
+        if not self.has_folder(folder_uid):
+            if not create_folders:
+                raise InvalidResourceError(f"Folder '{folder_uid}' does not exist in Grafana")
+            self.grafana.create_folder(folder_uid, folder_uid)
+            self.add_folder(folder_uid)
+            logger.info(f"Created folder {folder_uid}")
+
+        for query in payload.get('data', []):
+            datasource_uid = query.get('datasourceUid')
+            if not datasource_uid or datasource_uid in EXPRESSION_DATASOURCE_UIDS:
+                continue
+            if not self.has_datasource(datasource_uid):
+                raise InvalidResourceError(
+                    f"Datasource '{datasource_uid}' of query {query.get('refId')} does not exist in Grafana"
+                )
+
 
 class GrafanaClient:
     """Client for Grafana Alerting HTTP API"""
 
-    def __init__(self, url: str, token: str, org_id: int = 1, disable_provenance: bool = True):
+    def __init__(self, url: str, token: str, org_id: int = 1, disable_provenance: bool = True,
+                 pool_maxsize: int = GRAFANA_POOL_MAXSIZE):
         self.url = url.rstrip('/')
         self.token = token
         self.org_id = org_id
-        self.session = requests.Session()
+        self.session = GrafanaSession(TokenBucket.for_host(self.url))
+
+        # A client talks to a single Grafana, so one host pool with room for concurrent requests
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
         self.session.headers.update({
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
@@ -42,6 +485,8 @@ class GrafanaClient:
         if disable_provenance:
             self.session.headers['X-Disable-Provenance'] = 'true'
 
+        self.references = GrafanaReferenceCache(self)
+
     @classmethod
     def from_secret(cls, k8s_client: client.CoreV1Api, secret_ref: Dict[str, str],
                     default_namespace: str = 'default') -> 'GrafanaClient':
@@ -55,8 +500,16 @@ class GrafanaClient:
         except Exception as e:
             raise ValueError(f"Failed to read secret {namespace}/{name}: {e}")
 
+        return cls.from_secret_data(secret, token_key)
+
+    @classmethod
+    def from_secret_data(cls, secret: client.V1Secret, token_key: str = 'token') -> 'GrafanaClient':
+        """Create GrafanaClient from an already read Kubernetes Secret"""
+        namespace = secret.metadata.namespace
+        name = secret.metadata.name
+
         # Decode secret data
-        if token_key not in secret.data:
+        if token_key not in (secret.data or {}):
             raise ValueError(f"Secret {namespace}/{name} missing key '{token_key}'")
 
         token = base64.b64decode(secret.data[token_key]).decode('utf-8')
@@ -68,6 +521,10 @@ class GrafanaClient:
 
         return cls(url=url, token=token, org_id=org_id)
 
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
+
     # Alert Rules API
     def list_alert_rules(self) -> List[Dict[str, Any]]:
         """List all alert rules"""
@@ -101,6 +558,45 @@ class GrafanaClient:
         if resp.status_code != 404:  # Ignore if already deleted
             resp.raise_for_status()
 
+    # Folders and Datasources API
+    def list_folders(self) -> List[Dict[str, Any]]:
+        """List all folders, including nested ones"""
+        resp = self.session.get(f'{self.url}/api/search', params={'type': 'dash-folder', 'limit': 5000})
+        resp.raise_for_status()
+        return resp.json()
+
+    def create_folder(self, uid: str, title: str) -> None:
+        """Create a folder; one that already exists (e.g. created concurrently) is fine"""
+        resp = self.session.post(f'{self.url}/api/folders', json={'uid': uid, 'title': title})
+        if resp.status_code not in (409, 412):
+            resp.raise_for_status()
+
+    def list_datasources(self) -> List[Dict[str, Any]]:
+        """List all datasources"""
+        resp = self.session.get(f'{self.url}/api/datasources')
+        resp.raise_for_status()
+        return resp.json()
+
+    # Rule Groups API
+    def get_rule_group(self, folder_uid: str, group: str) -> Optional[Dict[str, Any]]:
+        """Get an entire alert rule group"""
+        resp = self.session.get(
+            f'{self.url}/api/v1/provisioning/folder/{folder_uid}/rule-groups/{requests.utils.quote(group, safe="")}'
+        )
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return resp.json()
+
+    def update_rule_group(self, folder_uid: str, group: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or replace an entire alert rule group"""
+        resp = self.session.put(
+            f'{self.url}/api/v1/provisioning/folder/{folder_uid}/rule-groups/{requests.utils.quote(group, safe="")}',
+            json=payload
+        )
+        resp.raise_for_status()
+        return resp.json()
+
     # Notification Policies API
     def get_notification_policy(self) -> Dict[str, Any]:
         """Get notification policy tree"""
@@ -181,6 +677,185 @@ class GrafanaClient:
             resp.raise_for_status()
 
 
+class GrafanaClientRegistry:
+    """
+    Shares one GrafanaClient (and its connection pool) per Secret reference.
+    A cached client is reused without touching the API for SECRET_RECHECK_SECONDS;
+    after that the Secret is re-read and the client is only rebuilt when its
+    resourceVersion changed, e.g. after a token rotation.
+    """
+
+    def __init__(self, k8s_client: client.CoreV1Api, recheck_seconds: float = SECRET_RECHECK_SECONDS):
+        self.k8s_client = k8s_client
+        self.recheck_seconds = recheck_seconds
+        self._clients: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, secret_ref: Dict[str, str], default_namespace: str = 'default') -> GrafanaClient:
+        """Return the client for a secretRef, re-reading the Secret only when the cached entry is stale"""
+        namespace = secret_ref.get('namespace', default_namespace)
+        name = secret_ref.get('name')
+        token_key = secret_ref.get('key', 'token')
+        key = (namespace, name, token_key)
+
+        with self._lock:
+            entry = self._clients.get(key)
+            now = time.monotonic()
+
+            if entry and now - entry['checked'] < self.recheck_seconds:
+                return entry['client']
+
+            try:
+                secret = self.k8s_client.read_namespaced_secret(name, namespace)
+            except client.rest.ApiException as e:
+                if entry and e.status != 404:
+                    # Keep serving the known-good client through transient API errors
+                    logger.warning(f"Failed to recheck secret {namespace}/{name}, reusing cached client: {e}")
+                    entry['checked'] = now
+                    return entry['client']
+                self._drop(key)
+                raise ValueError(f"Failed to read secret {namespace}/{name}: {e}")
+            except Exception as e:
+                raise ValueError(f"Failed to read secret {namespace}/{name}: {e}")
+
+            resource_version = secret.metadata.resource_version
+            if entry and entry['resourceVersion'] == resource_version:
+                entry['checked'] = now
+                return entry['client']
+
+            grafana = GrafanaClient.from_secret_data(secret, token_key)
+            if entry:
+                logger.info(f"Secret {namespace}/{name} changed, rebuilding Grafana client")
+                entry['client'].close()
+
+            self._clients[key] = {
+                'client': grafana,
+                'resourceVersion': resource_version,
+                'checked': now
+            }
+            return grafana
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._clients.pop(key, None)
+        if entry:
+            entry['client'].close()
+
+    def close(self) -> None:
+        """Close every cached client"""
+        with self._lock:
+            for key in list(self._clients):
+                self._drop(key)
+
+
+class StatusWriter:
+    """
+    Patches CR status in the background. Updates for the same object are merged
+    while a patch is pending, updates matching the last known status (apart from
+    VOLATILE_STATUS_FIELDS) are dropped, and STATUS_WORKERS threads flush the
+    pending objects through a WorkQueue, retrying failed patches with backoff.
+    """
+
+    PLURALS = {
+        'GrafanaAlertRule': 'grafanaalertrules',
+        'GrafanaNotificationPolicy': 'grafananotificationpolicies',
+        'GrafanaMuteTiming': 'grafanamutetimings',
+        'GrafanaNotificationTemplate': 'grafananotificationtemplates'
+    }
+
+    def __init__(self, k8s_custom: client.CustomObjectsApi, workers: int = STATUS_WORKERS):
+        self.k8s_custom = k8s_custom
+        self.queue = WorkQueue()
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._known: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._run, name=f'status-writer-{i}', daemon=True)
+            for i in range(max(workers, 1))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, resource: Dict[str, Any], status: Dict[str, Any]) -> None:
+        """Queue a status update for a resource; returns without waiting for the API"""
+        metadata = resource['metadata']
+        key = (resource['kind'], metadata['namespace'], metadata['name'])
+
+        with self._lock:
+            if key not in self._pending:
+                known = {**(resource.get('status') or {}), **self._known.get(key, {})}
+                if all(known.get(k) == v for k, v in status.items() if k not in VOLATILE_STATUS_FIELDS):
+                    return
+            self._pending[key] = {**self._pending.get(key, {}), **status}
+
+        self.queue.add('/'.join(key))
+
+    def forget(self, resource: Dict[str, Any]) -> None:
+        """Drop what is known about a deleted resource"""
+        metadata = resource['metadata']
+        key = (resource.get('kind'), metadata.get('namespace'), metadata.get('name'))
+        with self._lock:
+            self._known.pop(key, None)
+
+    def close(self) -> None:
+        """Flush pending updates and stop the workers"""
+        self.queue.shutdown()
+        for worker in self._workers:
+            worker.join()
+
+    def _run(self) -> None:
+        while True:
+            queue_key = self.queue.get()
+            if queue_key is None:
+                return
+
+            key = tuple(queue_key.split('/', 2))
+            with self._lock:
+                status = self._pending.pop(key, None)
+
+            error = None
+            try:
+                if status is not None:
+                    self._patch(key, status)
+                self.queue.forget(queue_key)
+            except Exception as e:
+                error = e
+                with self._lock:
+                    # Newer updates queued meanwhile win over the failed ones
+                    self._pending[key] = {**status, **self._pending.get(key, {})}
+                if self.queue.num_requeues(queue_key) < STATUS_MAX_RETRIES:
+                    logger.warning(f"Failed to update status of {queue_key}, retrying: {e}")
+                    self.queue.add_rate_limited(queue_key)
+                else:
+                    logger.error(f"Failed to update status of {queue_key}: {e}")
+                    self.queue.forget(queue_key)
+                    with self._lock:
+                        self._pending.pop(key, None)
+            finally:
+                self.queue.done(queue_key, error)
+
+    def _patch(self, key: tuple, status: Dict[str, Any]) -> None:
+        kind, namespace, name = key
+        try:
+            self.k8s_custom.patch_namespaced_custom_object_status(
+                group='monitoring.zengarden.space',
+                version='v1',
+                namespace=namespace,
+                plural=self.PLURALS[kind],
+                name=name,
+                body={'status': status}
+            )
+        except client.rest.ApiException as e:
+            if e.status != 404:
+                raise
+            # Deleted before its status was written
+            with self._lock:
+                self._known.pop(key, None)
+            return
+
+        with self._lock:
+            self._known[key] = {**self._known.get(key, {}), **status}
+
+
 class GrafanaAlertOperatorService:
     """Main service for reconciling Grafana alert resources"""
 
@@ -188,14 +863,32 @@ class GrafanaAlertOperatorService:
         self.running = True
         self.shared_dir = '/shared'
 
+        # Bindings are coalesced per resource: bursts of events reconcile the latest one once
+        self.queue = WorkQueue()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+
+        # Different resources reconcile in parallel; a full synchronization runs alone
+        self._sync_gate = SharedExclusiveLock()
+
         # Initialize Kubernetes client
         try:
             config.load_incluster_config()
         except:
             config.load_kube_config()
 
-        self.k8s_core = client.CoreV1Api()
-        self.k8s_custom = client.CustomObjectsApi()
+        self.k8s_core = client.CoreV1Api(instrument_api_client(client.ApiClient()))
+        self.k8s_custom = client.CustomObjectsApi(instrument_api_client(client.ApiClient()))
+
+        # Grafana clients are shared across reconciles of resources using the same Secret
+        self.grafana_clients = GrafanaClientRegistry(self.k8s_core)
+
+        # Status patches are coalesced and written in the background
+        self.status_writer = StatusWriter(self.k8s_custom)
+
+        # Caps concurrent synchronization requests per Grafana instance
+        self._instance_slots: Dict[tuple, threading.Semaphore] = {}
+        self._sync_lock = threading.Lock()
 
         # Setup signal handlers
         signal.signal(signal.SIGTERM, self._handle_shutdown)
@@ -212,8 +905,30 @@ class GrafanaAlertOperatorService:
         """Main service loop"""
         logger.info("Starting service loop...")
 
+        workers = [
+            threading.Thread(target=self._run_worker, name=f'request-worker-{i}', daemon=True)
+            for i in range(max(REQUEST_WORKERS, 1))
+        ]
+        for worker in workers:
+            worker.start()
+
+        server = RequestServer(self.submit_request, HANDLER_PORT)
+        threading.Thread(target=server.serve_forever, name='request-server', daemon=True).start()
+        logger.info(f"Listening for hook requests on 127.0.0.1:{HANDLER_PORT}")
+
+        start_metrics_server(self.shared_dir, self.queue, METRICS_PORT)
+
+        watcher = DirectoryWatcher(self.shared_dir)
+        changed = True
+
         while self.running:
             try:
+                # Wait until request files are written (socket requests are served by the server thread)
+                if not changed:
+                    changed = watcher.wait(timeout=1)
+                    continue
+                changed = False
+
                 # Check for request files
                 request_files = [f for f in os.listdir(self.shared_dir)
                                if f.startswith('request-') and f.endswith('.json')]
@@ -224,19 +939,14 @@ class GrafanaAlertOperatorService:
 
                     try:
                         # Read request
+                        requested_at = os.path.getmtime(request_path)
                         with open(request_path, 'r') as f:
-                            request = json.load(f)
-
-                        logger.info(f"Processing request: {request.get('binding', {}).get('type', 'unknown')}")
+                            payload = f.read()
 
-                        # Process request
-                        result = self._process_request(request)
-
-                        # Write response
-                        with open(response_path, 'w') as f:
-                            f.write(result)
-
-                        logger.info(f"Request processed successfully")
+                        # Response is written once the queued work has run
+                        self.submit_request(payload).add_done_callback(
+                            lambda future, path=response_path, at=requested_at: write_response(path, future, at)
+                        )
 
                     except Exception as e:
                         logger.error(f"Error processing request: {e}", exc_info=True)
@@ -249,16 +959,132 @@ class GrafanaAlertOperatorService:
                         except:
                             pass
 
-                # Sleep before next iteration
-                time.sleep(1)
                 sys.stdout.flush()
 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}", exc_info=True)
                 time.sleep(5)
 
+        server.shutdown()
+        server.server_close()
+        self.queue.shutdown()
+        for worker in workers:
+            worker.join()
+        self.status_writer.close()
+        self.grafana_clients.close()
         logger.info("Service stopped")
 
+    @staticmethod
+    def _bindings(context: Any) -> List[Dict[str, Any]]:
+        """
+        Translate a shell-operator binding context (a list of Synchronization and Event
+        entries) into the {'type': ..., 'watchEvent': {'object': ...}} bindings the
+        workers process. Already translated {'binding': {...}} requests pass through.
+        """
+        if isinstance(context, dict):
+            context = [context]
+
+        bindings = []
+        for entry in context:
+            if isinstance(entry.get('binding'), dict):
+                bindings.append(entry['binding'])
+            elif entry.get('type') == 'Event':
+                bindings.append({'type': entry.get('watchEvent'), 'watchEvent': {'object': entry.get('object', {})}})
+            else:
+                bindings.append({'type': entry.get('type')})
+        return bindings
+
+    def submit_request(self, payload: str) -> Future:
+        """Queue a serialized binding context; the returned future resolves to the hook response"""
+        response = Future()
+        waiters = []
+        ignored = []
+
+        try:
+            for binding in self._bindings(json.loads(payload)):
+                event_type = binding.get('type')
+                logger.info(f"Queueing request: {event_type or 'unknown'}")
+
+                if event_type == 'Synchronization':
+                    key = SYNC_KEY
+                elif event_type in ['Added', 'Modified', 'Deleted']:
+                    resource = binding.get('watchEvent', {}).get('object', {})
+                    metadata = resource.get('metadata', {})
+                    if resource.get('kind') == 'GrafanaNotificationPolicy':
+                        # All policies of one Grafana form a single tree: coalesce them per instance
+                        instance = self._instance_key(resource['spec']['grafanaRef']['secretRef'], metadata.get('namespace'))
+                        key = 'GrafanaNotificationPolicy/' + '/'.join(instance)
+                    else:
+                        key = f"{resource.get('kind')}/{metadata.get('namespace')}/{metadata.get('name')}"
+                else:
+                    ignored.append(f"Unknown event type: {event_type}")
+                    continue
+
+                with self._pending_lock:
+                    self._pending[key] = binding
+                waiters.append(self.queue.add(key))
+
+        except Exception as e:
+            logger.error(f"Error processing request: {e}", exc_info=True)
+            response.set_result(f"ERROR: {str(e)}")
+            return response
+
+        if not waiters:
+            response.set_result('; '.join(ignored) or "Empty binding context")
+            return response
+
+        remaining = [len(waiters)]
+        lock = threading.Lock()
+
+        def resolve(_: Future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            errors = [w.exception() for w in waiters if w.exception() is not None]
+            if errors:
+                response.set_result(f"ERROR: {str(errors[0])}")
+            else:
+                response.set_result('; '.join(dict.fromkeys(str(w.result()) for w in waiters)))
+
+        for waiter in waiters:
+            waiter.add_done_callback(resolve)
+        return response
+
+    def _run_worker(self) -> None:
+        """Process queued resources until the queue is shut down"""
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+
+            with self._pending_lock:
+                binding = self._pending.get(key)
+
+            error = None
+            result = None
+            try:
+                if binding is not None:
+                    gate = self._sync_gate.exclusive() if key == SYNC_KEY else self._sync_gate.shared()
+                    with gate, RECONCILE_DURATION.labels(key.split('/', 1)[0]).time():
+                        result = self._process_request({'binding': binding})
+                self.queue.forget(key)
+                with self._pending_lock:
+                    if self._pending.get(key) is binding:
+                        del self._pending[key]
+                logger.info(f"Request processed successfully")
+            except Exception as e:
+                error = e
+                logger.error(f"Error processing {key}: {e}", exc_info=True)
+                if self.queue.num_requeues(key) < MAX_RETRIES:
+                    logger.warning(f"Requeueing {key} after failure")
+                    self.queue.add_rate_limited(key)
+                else:
+                    logger.error(f"Dropping {key} after {MAX_RETRIES} retries")
+                    self.queue.forget(key)
+            finally:
+                self.queue.done(key, error, result)
+
     def _process_request(self, request: Dict[str, Any]) -> str:
         """Process a reconciliation request"""
         binding = request.get('binding', {})
@@ -276,13 +1102,65 @@ class GrafanaAlertOperatorService:
     def _handle_synchronization(self, binding: Dict[str, Any]) -> str:
         """Handle initial synchronization"""
         logger.info("Handling synchronization")
-        # Process all resources
-        self._reconcile_all_alert_rules()
-        self._reconcile_all_notification_policies()
-        self._reconcile_all_mute_timings()
-        self._reconcile_all_templates()
+        # One snapshot per Grafana instance, shared by every resource kind
+        snapshots: Dict[tuple, GrafanaSnapshot] = {}
+
+        # Rule groups, mute timings and templates are independent and fan out over the pool
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix='sync') as pool:
+            mute_timings = self._reconcile_all_mute_timings(pool, snapshots)
+            templates = self._reconcile_all_templates(pool, snapshots)
+            rule_groups = self._reconcile_all_alert_rules(pool, snapshots)
+
+            # The policy tree is one global document that may reference mute timings,
+            # so it is applied by a single task once those exist
+            wait(mute_timings)
+            policies = pool.submit(self._reconcile_all_notification_policies)
+
+            self._prune_after_sync(rule_groups, snapshots)
+            wait(templates + [policies])
+
         return "Synchronization complete"
 
+    def _snapshot_for(self, resource: Dict[str, Any], snapshots: Dict[tuple, GrafanaSnapshot]) -> GrafanaSnapshot:
+        """Get the snapshot of the Grafana instance a resource points at"""
+        secret_ref = resource['spec']['grafanaRef']['secretRef']
+        namespace = resource['metadata']['namespace']
+        key = self._instance_key(secret_ref, namespace)
+        with self._sync_lock:
+            if key not in snapshots:
+                snapshots[key] = GrafanaSnapshot(self.grafana_clients.get(secret_ref, namespace))
+            return snapshots[key]
+
+    def _instance_slot(self, resource: Dict[str, Any]) -> threading.Semaphore:
+        """Semaphore limiting concurrent requests to the Grafana instance a resource points at"""
+        key = self._instance_key(resource['spec']['grafanaRef']['secretRef'], resource['metadata']['namespace'])
+        with self._sync_lock:
+            if key not in self._instance_slots:
+                self._instance_slots[key] = threading.Semaphore(GRAFANA_INSTANCE_CONCURRENCY)
+            return self._instance_slots[key]
+
+    @staticmethod
+    def _instance_key(secret_ref: Dict[str, str], namespace: str) -> tuple:
+        return (secret_ref.get('namespace', namespace), secret_ref.get('name'), secret_ref.get('key', 'token'))
+
+    @staticmethod
+    def _is_synced(resource: Dict[str, Any], **fields: Any) -> bool:
+        """True if the CR status already records a successful sync with these values"""
+        status = resource.get('status') or {}
+        return status.get('syncStatus') == 'Synced' and all(status.get(k) == v for k, v in fields.items())
+
+    @staticmethod
+    def _synced_fields(resource: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Status fields identifying the spec revision a Grafana payload was rendered from"""
+        return {
+            'contentHash': content_hash(payload),
+            'observedGeneration': resource['metadata'].get('generation')
+        }
+
+    def _is_current(self, resource: Dict[str, Any], payload: Dict[str, Any], **fields: Any) -> bool:
+        """True if this exact payload was already synced for the resource's current generation"""
+        return self._is_synced(resource, **self._synced_fields(resource, payload), **fields)
+
     def _handle_change(self, binding: Dict[str, Any]) -> str:
         """Handle resource creation or modification"""
         watch_event = binding.get('watchEvent', {})
@@ -297,7 +1175,7 @@ class GrafanaAlertOperatorService:
             if kind == 'GrafanaAlertRule':
                 self._reconcile_alert_rule(resource)
             elif kind == 'GrafanaNotificationPolicy':
-                self._reconcile_notification_policy(resource)
+                self._reconcile_policy_tree(resource)
             elif kind == 'GrafanaMuteTiming':
                 self._reconcile_mute_timing(resource)
             elif kind == 'GrafanaNotificationTemplate':
@@ -307,6 +1185,12 @@ class GrafanaAlertOperatorService:
 
             return f"Successfully reconciled {kind} {namespace}/{name}"
 
+        except InvalidResourceError as e:
+            # Not retried: it stays Failed until the spec (or Grafana) is fixed
+            logger.warning(f"Invalid {kind} {namespace}/{name}: {e}")
+            self._update_status_failed_once(resource, str(e))
+            return f"Invalid {kind} {namespace}/{name}: {e}"
+
         except Exception as e:
             logger.error(f"Failed to reconcile {kind} {namespace}/{name}: {e}", exc_info=True)
             self._update_status_failed(resource, str(e))
@@ -321,10 +1205,13 @@ class GrafanaAlertOperatorService:
         namespace = resource.get('metadata', {}).get('namespace')
 
         logger.info(f"Handling deletion of {kind} {namespace}/{name}")
+        self.status_writer.forget(resource)
 
         try:
             if kind == 'GrafanaAlertRule':
                 self._delete_alert_rule(resource)
+            elif kind == 'GrafanaNotificationPolicy':
+                self._reconcile_policy_tree(resource)
             elif kind == 'GrafanaMuteTiming':
                 self._delete_mute_timing(resource)
             elif kind == 'GrafanaNotificationTemplate':
@@ -342,26 +1229,22 @@ class GrafanaAlertOperatorService:
         status = resource.get('status', {})
         metadata = resource['metadata']
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
+        # Build alert rule payload
+        payload = self._alert_rule_payload(resource)
+
+        # Unchanged since the last sync (e.g. the Modified event of our own status patch)
+        if status.get('uid') and self._is_current(resource, payload):
+            logger.info(f"Alert rule {metadata['namespace']}/{metadata['name']} unchanged, skipping")
+            return
+
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
             spec['grafanaRef']['secretRef'],
             metadata['namespace']
         )
 
-        # Build alert rule payload
-        payload = {
-            'folderUID': spec['folderUID'],
-            'ruleGroup': spec['ruleGroup'],
-            'title': spec['title'],
-            'condition': spec['condition'],
-            'noDataState': spec.get('noDataState', 'NoData'),
-            'execErrState': spec.get('execErrState', 'Alerting'),
-            'for': spec.get('for', '0s'),
-            'annotations': spec.get('annotations', {}),
-            'labels': spec.get('labels', {}),
-            'data': spec['data']
-        }
+        # Reject dangling folder/datasource references before sending anything
+        grafana.references.validate_alert_rule(payload, AUTO_CREATE_FOLDERS)
 
         # Check if alert rule exists
         existing_uid = status.get('uid')
@@ -380,81 +1263,270 @@ class GrafanaAlertOperatorService:
             logger.info(f"Created alert rule {result['uid']}")
 
         # Update status
+        self._update_alert_rule_synced(resource, result)
+
+    def _alert_rule_payload(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Grafana provisioning payload for a GrafanaAlertRule"""
+        spec = resource['spec']
+        metadata = resource['metadata']
+
+        # Ownership marker so rules whose CR is gone can be found in Grafana
+        annotations = dict(spec.get('annotations', {}))
+        annotations[OWNER_ANNOTATION] = f"{metadata['namespace']}/{metadata['name']}"
+
+        return {
+            'folderUID': spec['folderUID'],
+            'ruleGroup': spec['ruleGroup'],
+            'title': spec['title'],
+            'condition': spec['condition'],
+            'noDataState': spec.get('noDataState', 'NoData'),
+            'execErrState': spec.get('execErrState', 'Alerting'),
+            'for': spec.get('for', '0s'),
+            'annotations': annotations,
+            'labels': spec.get('labels', {}),
+            'data': spec['data']
+        }
+
+    def _update_alert_rule_synced(self, resource: Dict[str, Any], rule: Dict[str, Any]) -> None:
+        """Record the Grafana rule backing a GrafanaAlertRule in its status"""
         self._update_status(resource, {
-            'uid': result['uid'],
-            'provenance': result.get('provenance', ''),
+            'uid': rule['uid'],
+            'provenance': rule.get('provenance', ''),
             'lastSynced': datetime.now(timezone.utc).isoformat(),
             'syncStatus': 'Synced',
-            'message': ''
+            'message': '',
+            **self._synced_fields(resource, self._alert_rule_payload(resource))
         })
 
-    def _reconcile_notification_policy(self, resource: Dict[str, Any]) -> None:
-        """Reconcile a GrafanaNotificationPolicy resource"""
-        spec = resource['spec']
-        metadata = resource['metadata']
-
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
-            spec['grafanaRef']['secretRef'],
-            metadata['namespace']
+    def _match_group_rules(self, resources: List[Dict[str, Any]], existing_rules: List[Dict[str, Any]]):
+        """
+        Build payloads for the CRs of a rule group, reusing the UID of the existing rule
+        each CR claims (by status UID or title). Returns (payloads, claimed existing rules).
+        """
+        rules_by_uid = {r.get('uid'): r for r in existing_rules}
+        rules_by_title = {r.get('title'): r for r in existing_rules}
+
+        payloads = []
+        claimed = {}
+        for resource in resources:
+            payload = self._alert_rule_payload(resource)
+            current = (rules_by_uid.get(resource.get('status', {}).get('uid'))
+                       or rules_by_title.get(payload['title']))
+            if current:
+                payload['uid'] = current['uid']
+                claimed[current['uid']] = current
+            payloads.append(payload)
+
+        return payloads, claimed
+
+    def _sync_rule_group(self, folder_uid: str, rule_group: str, resources: List[Dict[str, Any]],
+                         snapshot: Optional[GrafanaSnapshot] = None) -> List[str]:
+        """
+        Push every GrafanaAlertRule of one rule group in a single PUT.
+        Rules in the group that no CR claims (by status UID or title) are preserved,
+        and so is the group's evaluation interval. With a snapshot, groups whose
+        rules already match are left alone. Returns the UIDs of the managed rules.
+        """
+        first = resources[0]
+        grafana = snapshot.grafana if snapshot else self.grafana_clients.get(
+            first['spec']['grafanaRef']['secretRef'],
+            first['metadata']['namespace']
         )
 
-        # Get current policy tree
-        current_policy = grafana.get_notification_policy()
+        # Invalid CRs are marked Failed and left out; their existing rules still count as claimed
+        valid = []
+        invalid_uids = []
+        for resource in resources:
+            try:
+                grafana.references.validate_alert_rule(self._alert_rule_payload(resource), AUTO_CREATE_FOLDERS)
+                valid.append(resource)
+            except InvalidResourceError as e:
+                logger.warning(f"Invalid alert rule {resource['metadata']['namespace']}/"
+                               f"{resource['metadata']['name']}: {e}")
+                self._update_status_failed_once(resource, str(e))
+                if resource.get('status', {}).get('uid'):
+                    invalid_uids.append(resource['status']['uid'])
+
+        if not valid:
+            return invalid_uids
+        resources = valid
+
+        if snapshot is not None:
+            payloads, claimed = self._match_group_rules(resources, snapshot.rules_in_group(folder_uid, rule_group))
+            if all('uid' in p and alert_rule_matches(p, claimed[p['uid']]) for p in payloads):
+                for resource, payload in zip(resources, payloads):
+                    if not self._is_current(resource, self._alert_rule_payload(resource), uid=payload['uid']):
+                        self._update_alert_rule_synced(resource, claimed[payload['uid']])
+                logger.info(f"Rule group {folder_uid}/{rule_group} already up to date")
+                return [p['uid'] for p in payloads] + invalid_uids
+
+        existing = grafana.get_rule_group(folder_uid, rule_group) or {}
+        existing_rules = existing.get('rules') or []
+        managed_rules, claimed = self._match_group_rules(resources, existing_rules)
+        foreign_rules = [r for r in existing_rules if r.get('uid') not in claimed]
+
+        result = grafana.update_rule_group(folder_uid, rule_group, {
+            'title': rule_group,
+            'folderUid': folder_uid,
+            'interval': existing.get('interval', DEFAULT_RULE_GROUP_INTERVAL),
+            'rules': foreign_rules + managed_rules
+        })
 
-        # Build policy payload
-        payload = {
-            'receiver': spec['receiver'],
-            'group_by': spec.get('groupBy', ['grafana_folder', 'alertname']),
-            'group_wait': spec.get('groupWait', '30s'),
-            'group_interval': spec.get('groupInterval', '5m'),
-            'repeat_interval': spec.get('repeatInterval', '4h')
+        # Map Grafana-assigned UIDs back to the CRs (titles are unique within a folder)
+        result_rules = result.get('rules') or (grafana.get_rule_group(folder_uid, rule_group) or {}).get('rules', [])
+        result_by_title = {r.get('title'): r for r in result_rules}
+
+        uids = []
+        for resource in resources:
+            rule = result_by_title.get(resource['spec']['title'])
+            if rule is None:
+                self._update_status_failed(resource, f"Rule missing from group {rule_group} after sync")
+                continue
+            uids.append(rule['uid'])
+            self._update_alert_rule_synced(resource, rule)
+
+        logger.info(f"Synced rule group {folder_uid}/{rule_group}: "
+                    f"{len(managed_rules)} managed, {len(foreign_rules)} preserved")
+        return uids + invalid_uids
+
+    def _prune_orphaned_alert_rules(self, snapshot: GrafanaSnapshot, claimed_uids: Set[str]) -> None:
+        """Delete rules carrying our ownership annotation that no GrafanaAlertRule claims"""
+        for rule in snapshot.alert_rules():
+            owner = (rule.get('annotations') or {}).get(OWNER_ANNOTATION)
+            if not owner or rule.get('uid') in claimed_uids:
+                continue
+            snapshot.grafana.delete_alert_rule(rule['uid'])
+            logger.info(f"Pruned orphaned alert rule {rule['uid']} (owner {owner} no longer exists)")
+
+    def _reconcile_policy_tree(self, resource: Dict[str, Any]) -> None:
+        """Rebuild the policy tree of the Grafana instance a GrafanaNotificationPolicy points at"""
+        instance = self._instance_key(resource['spec']['grafanaRef']['secretRef'], resource['metadata']['namespace'])
+        policies = [
+            policy for policy in self._list_resources('grafananotificationpolicies')
+            if self._instance_key(policy['spec']['grafanaRef']['secretRef'], policy['metadata']['namespace']) == instance
+        ]
+
+        if not policies:
+            logger.info(f"No notification policies left for Grafana {instance[0]}/{instance[1]}, "
+                        f"leaving its policy tree unchanged")
+            return
+
+        self._sync_policy_tree(policies)
+
+    def _policy_route(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Render a GrafanaNotificationPolicy spec, or one of its nested routes, as a Grafana route"""
+        fields = {
+            'groupBy': 'group_by',
+            'groupWait': 'group_wait',
+            'groupInterval': 'group_interval',
+            'repeatInterval': 'repeat_interval',
+            'muteTimeIntervals': 'mute_time_intervals'
         }
 
-        if 'matchers' in spec:
-            payload['object_matchers'] = [
-                [m['label'], m['match'], m['value']]
-                for m in spec['matchers']
-            ]
+        # Nested routes preserve unknown fields, which may already use Grafana's names
+        route = {k: v for k, v in spec.items() if k not in fields and k not in ('grafanaRef', 'matchers', 'routes')}
+        for field, grafana_field in fields.items():
+            if field in spec:
+                route[grafana_field] = spec[field]
 
-        if 'muteTimeIntervals' in spec:
-            payload['mute_time_intervals'] = spec['muteTimeIntervals']
+        if 'matchers' in spec:
+            route['object_matchers'] = [[m['label'], m['match'], m['value']] for m in spec['matchers']]
 
         if 'routes' in spec:
-            payload['routes'] = spec['routes']
+            route['routes'] = [self._policy_route(child) for child in spec['routes']]
+
+        return route
+
+    def _build_policy_tree(self, policies: List[Dict[str, Any]], live: Dict[str, Any]):
+        """
+        Merge the GrafanaNotificationPolicies of one Grafana into a single tree.
+        Ordered by namespace/name, the first policy without matchers defines the root
+        (otherwise the live root is kept) and policies with matchers become its
+        child routes. Returns (tree, root policy or None, policies conflicting with it).
+        """
+        ordered = sorted(policies, key=lambda p: (p['metadata']['namespace'], p['metadata']['name']))
+        roots = [p for p in ordered if not p['spec'].get('matchers')]
+        children = [p for p in ordered if p['spec'].get('matchers')]
+
+        if roots:
+            tree = self._policy_route(roots[0]['spec'])
+        else:
+            tree = {k: v for k, v in live.items() if k not in ('routes', 'provenance')}
 
-        # Update policy
-        grafana.update_notification_policy(payload)
-        logger.info(f"Updated notification policy")
+        tree['routes'] = tree.get('routes', []) + [self._policy_route(p['spec']) for p in children]
+        return tree, (roots[0] if roots else None), roots[1:]
 
-        # Update status
-        self._update_status(resource, {
-            'lastSynced': datetime.now(timezone.utc).isoformat(),
-            'syncStatus': 'Synced',
-            'message': ''
-        })
+    def _sync_policy_tree(self, policies: List[Dict[str, Any]]) -> None:
+        """Apply the merged policy tree of one Grafana instance, with at most one PUT"""
+        first = policies[0]
+        grafana = self.grafana_clients.get(
+            first['spec']['grafanaRef']['secretRef'],
+            first['metadata']['namespace']
+        )
+
+        live = grafana.get_notification_policy() or {}
+        tree, root, conflicts = self._build_policy_tree(policies, live)
 
-    def _reconcile_mute_timing(self, resource: Dict[str, Any]) -> None:
+        if _contains(_prune_empty(tree), live):
+            logger.info(f"Notification policy tree already up to date ({len(policies)} policies)")
+        else:
+            grafana.update_notification_policy(tree)
+            logger.info(f"Updated notification policy tree from {len(policies)} policies")
+
+        for policy in policies:
+            if any(policy is conflict for conflict in conflicts):
+                message = (f"Root policy is defined by {root['metadata']['namespace']}/{root['metadata']['name']}; "
+                           f"add matchers to route this policy under it")
+                self._update_status_failed_once(policy, message)
+                continue
+
+            route = self._policy_route(policy['spec'])
+            if not self._is_current(policy, route):
+                self._update_status(policy, {
+                    'lastSynced': datetime.now(timezone.utc).isoformat(),
+                    'syncStatus': 'Synced',
+                    'message': '',
+                    **self._synced_fields(policy, route)
+                })
+
+    def _reconcile_mute_timing(self, resource: Dict[str, Any], snapshot: Optional[GrafanaSnapshot] = None) -> None:
         """Reconcile a GrafanaMuteTiming resource"""
         spec = resource['spec']
         metadata = resource['metadata']
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
-            spec['grafanaRef']['secretRef'],
-            metadata['namespace']
-        )
-
         # Build payload
         payload = {
             'name': spec['name'],
             'time_intervals': spec['timeIntervals']
         }
 
+        # Unchanged since the last sync; the periodic synchronization still checks for drift
+        if snapshot is None and self._is_current(resource, payload):
+            logger.info(f"Mute timing {spec['name']} unchanged, skipping")
+            return
+
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
+            spec['grafanaRef']['secretRef'],
+            metadata['namespace']
+        )
+
         # Check if exists
-        existing = grafana.get_mute_timing(spec['name'])
+        if snapshot is not None:
+            existing = snapshot.mute_timing(spec['name'])
+            if existing and _contains(payload, existing):
+                if not self._is_current(resource, payload):
+                    self._update_status(resource, {
+                        'version': existing.get('version', 0),
+                        'lastSynced': datetime.now(timezone.utc).isoformat(),
+                        'syncStatus': 'Synced',
+                        'message': '',
+                        **self._synced_fields(resource, payload)
+                    })
+                logger.info(f"Mute timing {spec['name']} already up to date")
+                return
+        else:
+            existing = grafana.get_mute_timing(spec['name'])
 
         # Create or update
         if existing:
@@ -469,29 +1541,48 @@ class GrafanaAlertOperatorService:
             'version': result.get('version', 0),
             'lastSynced': datetime.now(timezone.utc).isoformat(),
             'syncStatus': 'Synced',
-            'message': ''
+            'message': '',
+            **self._synced_fields(resource, payload)
         })
 
-    def _reconcile_template(self, resource: Dict[str, Any]) -> None:
+    def _reconcile_template(self, resource: Dict[str, Any], snapshot: Optional[GrafanaSnapshot] = None) -> None:
         """Reconcile a GrafanaNotificationTemplate resource"""
         spec = resource['spec']
         metadata = resource['metadata']
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
-            spec['grafanaRef']['secretRef'],
-            metadata['namespace']
-        )
-
         # Build payload
         payload = {
             'name': spec['name'],
             'template': spec['template']
         }
 
+        # Unchanged since the last sync; the periodic synchronization still checks for drift
+        if snapshot is None and self._is_current(resource, payload):
+            logger.info(f"Template {spec['name']} unchanged, skipping")
+            return
+
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
+            spec['grafanaRef']['secretRef'],
+            metadata['namespace']
+        )
+
         # Check if exists
-        existing = grafana.get_template(spec['name'])
+        if snapshot is not None:
+            existing = snapshot.template(spec['name'])
+            if existing and existing.get('template') == payload['template']:
+                if not self._is_current(resource, payload):
+                    self._update_status(resource, {
+                        'version': existing.get('version', 0),
+                        'lastSynced': datetime.now(timezone.utc).isoformat(),
+                        'syncStatus': 'Synced',
+                        'message': '',
+                        **self._synced_fields(resource, payload)
+                    })
+                logger.info(f"Template {spec['name']} already up to date")
+                return
+        else:
+            existing = grafana.get_template(spec['name'])
 
         # Create or update
         if existing:
@@ -506,7 +1597,8 @@ class GrafanaAlertOperatorService:
             'version': result.get('version', 0),
             'lastSynced': datetime.now(timezone.utc).isoformat(),
             'syncStatus': 'Synced',
-            'message': ''
+            'message': '',
+            **self._synced_fields(resource, payload)
         })
 
     def _delete_alert_rule(self, resource: Dict[str, Any]) -> None:
@@ -520,9 +1612,8 @@ class GrafanaAlertOperatorService:
             logger.info("No UID in status, nothing to delete")
             return
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
             spec['grafanaRef']['secretRef'],
             metadata['namespace']
         )
@@ -535,9 +1626,8 @@ class GrafanaAlertOperatorService:
         spec = resource['spec']
         metadata = resource['metadata']
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
             spec['grafanaRef']['secretRef'],
             metadata['namespace']
         )
@@ -550,9 +1640,8 @@ class GrafanaAlertOperatorService:
         spec = resource['spec']
         metadata = resource['metadata']
 
-        # Create Grafana client
-        grafana = GrafanaClient.from_secret(
-            self.k8s_core,
+        # Get (cached) Grafana client
+        grafana = self.grafana_clients.get(
             spec['grafanaRef']['secretRef'],
             metadata['namespace']
         )
@@ -560,96 +1649,138 @@ class GrafanaAlertOperatorService:
         grafana.delete_template(spec['name'])
         logger.info(f"Deleted template {spec['name']}")
 
-    def _reconcile_all_alert_rules(self) -> None:
-        """Reconcile all GrafanaAlertRule resources"""
+    def _list_resources(self, plural: str) -> List[Dict[str, Any]]:
+        """List all custom resources of one kind across namespaces"""
+        resources = self.k8s_custom.list_cluster_custom_object(
+            group='monitoring.zengarden.space',
+            version='v1',
+            plural=plural
+        )
+        return resources.get('items', [])
+
+    def _reconcile_all_alert_rules(self, pool: ThreadPoolExecutor,
+                                   snapshots: Dict[tuple, GrafanaSnapshot]) -> Dict[tuple, List[Future]]:
+        """
+        Submit one task per rule group of all GrafanaAlertRule resources.
+        Returns the tasks per Grafana instance; each resolves to the rule UIDs
+        of its group, or None if the group had to fall back to per-rule reconcile.
+        """
         try:
-            resources = self.k8s_custom.list_cluster_custom_object(
-                group='monitoring.zengarden.space',
-                version='v1',
-                plural='grafanaalertrules'
+            resources = self._list_resources('grafanaalertrules')
+        except Exception as e:
+            logger.error(f"Failed to list alert rules: {e}")
+            return {}
+
+        # Group by Grafana instance (secret reference), folder and rule group
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for resource in resources:
+            spec = resource['spec']
+            secret_ref = spec['grafanaRef']['secretRef']
+            key = (
+                secret_ref.get('namespace', resource['metadata']['namespace']),
+                secret_ref.get('name'),
+                secret_ref.get('key', 'token'),
+                spec['folderUID'],
+                spec['ruleGroup']
             )
+            groups.setdefault(key, []).append(resource)
+
+        tasks: Dict[tuple, List[Future]] = {}
+        for (secret_ns, secret_name, secret_key, folder_uid, rule_group), members in groups.items():
+            task = pool.submit(self._sync_rule_group_task, folder_uid, rule_group, members, snapshots)
+            tasks.setdefault((secret_ns, secret_name, secret_key), []).append(task)
+        return tasks
+
+    def _sync_rule_group_task(self, folder_uid: str, rule_group: str, members: List[Dict[str, Any]],
+                              snapshots: Dict[tuple, GrafanaSnapshot]) -> Optional[List[str]]:
+        """Synchronization task for one rule group, falling back to per-rule reconcile on failure"""
+        with self._instance_slot(members[0]):
+            try:
+                return self._sync_rule_group(folder_uid, rule_group, members,
+                                             self._snapshot_for(members[0], snapshots))
+            except Exception as e:
+                logger.error(f"Failed to sync rule group {folder_uid}/{rule_group}, "
+                             f"falling back to per-rule reconcile: {e}")
 
-            for resource in resources.get('items', []):
+            for resource in members:
                 try:
                     self._reconcile_alert_rule(resource)
+                except InvalidResourceError as e:
+                    self._update_status_failed_once(resource, str(e))
                 except Exception as e:
                     logger.error(f"Failed to reconcile alert rule: {e}")
-        except Exception as e:
-            logger.error(f"Failed to list alert rules: {e}")
+            return None
+
+    def _prune_after_sync(self, rule_groups: Dict[tuple, List[Future]],
+                          snapshots: Dict[tuple, GrafanaSnapshot]) -> None:
+        """Once every rule group of an instance is synced, prune its orphaned rules (if enabled)"""
+        if not PRUNE_ORPHANED_RULES:
+            return
+
+        for instance, tasks in rule_groups.items():
+            results = [task.result() for task in tasks]
+            if any(uids is None for uids in results) or instance not in snapshots:
+                logger.warning(f"Skipping pruning for Grafana {instance[0]}/{instance[1]} after sync errors")
+                continue
+            try:
+                self._prune_orphaned_alert_rules(snapshots[instance], {uid for uids in results for uid in uids})
+            except Exception as e:
+                logger.error(f"Failed to prune orphaned alert rules: {e}")
 
     def _reconcile_all_notification_policies(self) -> None:
-        """Reconcile all GrafanaNotificationPolicy resources"""
+        """Reconcile all GrafanaNotificationPolicy resources, one merged tree per Grafana instance"""
         try:
-            resources = self.k8s_custom.list_cluster_custom_object(
-                group='monitoring.zengarden.space',
-                version='v1',
-                plural='grafananotificationpolicies'
-            )
-
-            for resource in resources.get('items', []):
-                try:
-                    self._reconcile_notification_policy(resource)
-                except Exception as e:
-                    logger.error(f"Failed to reconcile notification policy: {e}")
+            resources = self._list_resources('grafananotificationpolicies')
         except Exception as e:
             logger.error(f"Failed to list notification policies: {e}")
+            return
 
-    def _reconcile_all_mute_timings(self) -> None:
-        """Reconcile all GrafanaMuteTiming resources"""
-        try:
-            resources = self.k8s_custom.list_cluster_custom_object(
-                group='monitoring.zengarden.space',
-                version='v1',
-                plural='grafanamutetimings'
-            )
+        instances: Dict[tuple, List[Dict[str, Any]]] = {}
+        for resource in resources:
+            key = self._instance_key(resource['spec']['grafanaRef']['secretRef'], resource['metadata']['namespace'])
+            instances.setdefault(key, []).append(resource)
 
-            for resource in resources.get('items', []):
-                try:
-                    self._reconcile_mute_timing(resource)
-                except Exception as e:
-                    logger.error(f"Failed to reconcile mute timing: {e}")
+        for policies in instances.values():
+            try:
+                with self._instance_slot(policies[0]):
+                    self._sync_policy_tree(policies)
+            except Exception as e:
+                logger.error(f"Failed to reconcile notification policy tree: {e}")
+
+    def _reconcile_all_mute_timings(self, pool: ThreadPoolExecutor,
+                                    snapshots: Dict[tuple, GrafanaSnapshot]) -> List[Future]:
+        """Submit a reconcile task for every GrafanaMuteTiming resource"""
+        return self._submit_reconciles(pool, snapshots, 'grafanamutetimings', 'mute timing',
+                                       self._reconcile_mute_timing)
+
+    def _reconcile_all_templates(self, pool: ThreadPoolExecutor,
+                                 snapshots: Dict[tuple, GrafanaSnapshot]) -> List[Future]:
+        """Submit a reconcile task for every GrafanaNotificationTemplate resource"""
+        return self._submit_reconciles(pool, snapshots, 'grafananotificationtemplates', 'template',
+                                       self._reconcile_template)
+
+    def _submit_reconciles(self, pool: ThreadPoolExecutor, snapshots: Dict[tuple, GrafanaSnapshot],
+                           plural: str, label: str, reconcile) -> List[Future]:
+        """Submit one snapshot-backed reconcile task per resource of a kind"""
+        try:
+            resources = self._list_resources(plural)
         except Exception as e:
-            logger.error(f"Failed to list mute timings: {e}")
+            logger.error(f"Failed to list {label}s: {e}")
+            return []
 
-    def _reconcile_all_templates(self) -> None:
-        """Reconcile all GrafanaNotificationTemplate resources"""
-        try:
-            resources = self.k8s_custom.list_cluster_custom_object(
-                group='monitoring.zengarden.space',
-                version='v1',
-                plural='grafananotificationtemplates'
-            )
+        def task(resource: Dict[str, Any]) -> None:
+            try:
+                with self._instance_slot(resource):
+                    reconcile(resource, self._snapshot_for(resource, snapshots))
+            except Exception as e:
+                logger.error(f"Failed to reconcile {label}: {e}")
 
-            for resource in resources.get('items', []):
-                try:
-                    self._reconcile_template(resource)
-                except Exception as e:
-                    logger.error(f"Failed to reconcile template: {e}")
-        except Exception as e:
-            logger.error(f"Failed to list templates: {e}")
+        return [pool.submit(task, resource) for resource in resources]
 
     def _update_status(self, resource: Dict[str, Any], status: Dict[str, Any]) -> None:
-        """Update resource status"""
+        """Queue a resource status update"""
         try:
-            metadata = resource['metadata']
-            kind = resource['kind']
-
-            # Map kind to plural
-            plural_map = {
-                'GrafanaAlertRule': 'grafanaalertrules',
-                'GrafanaNotificationPolicy': 'grafananotificationpolicies',
-                'GrafanaMuteTiming': 'grafanamutetimings',
-                'GrafanaNotificationTemplate': 'grafananotificationtemplates'
-            }
-
-            self.k8s_custom.patch_namespaced_custom_object_status(
-                group='monitoring.zengarden.space',
-                version='v1',
-                namespace=metadata['namespace'],
-                plural=plural_map[kind],
-                name=metadata['name'],
-                body={'status': status}
-            )
+            self.status_writer.submit(resource, status)
         except Exception as e:
             logger.error(f"Failed to update status: {e}")
 
@@ -661,6 +1792,12 @@ class GrafanaAlertOperatorService:
             'lastSynced': datetime.now(timezone.utc).isoformat()
         })
 
+    def _update_status_failed_once(self, resource: Dict[str, Any], message: str) -> None:
+        """Mark a resource Failed unless it already is for the same reason (the patch would trigger another event)"""
+        status = resource.get('status') or {}
+        if status.get('syncStatus') != 'Failed' or status.get('message') != message:
+            self._update_status_failed(resource, message)
+
 
 if __name__ == '__main__':
     service = GrafanaAlertOperatorService()
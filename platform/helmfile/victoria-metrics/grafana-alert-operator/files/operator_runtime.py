@@ -0,0 +1,359 @@
+"""
+Operator Runtime
+Hook IPC, work queue and Prometheus metrics shared by the shell-operator based
+operators. Each chart ships an identical copy next to its service script
+(Helm charts cannot read files outside their own directory), so change all
+copies together.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import select
+import threading
+import socketserver
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+
+# Buckets for work that can take from milliseconds (unchanged objects) to minutes (full resyncs)
+RECONCILE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+KUBERNETES_REQUESTS = Counter(
+    'operator_kubernetes_requests_total', 'Kubernetes API requests', ['verb', 'resource', 'code'])
+KUBERNETES_REQUEST_DURATION = Histogram(
+    'operator_kubernetes_request_duration_seconds', 'Kubernetes API request latency', ['verb', 'resource'])
+HOOK_LATENCY = Histogram(
+    'operator_hook_latency_seconds',
+    'Time from a hook request arriving (request file mtime for file requests) to its response being written',
+    ['transport'], buckets=RECONCILE_BUCKETS)
+PENDING_REQUEST_FILES = Gauge(
+    'operator_pending_request_files', 'Request files in the shared directory without a response yet')
+QUEUE_DEPTH = Gauge('operator_queue_depth', 'Keys waiting in the work queue')
+
+
+def kubernetes_verb(method: str, resource_path: str, query_params: Optional[List[Tuple]]) -> str:
+    """Map a Kubernetes API request to its RBAC-style verb"""
+    named = '{name}' in resource_path
+    if method == 'GET':
+        if ('watch', True) in (query_params or []):
+            return 'watch'
+        return 'get' if named else 'list'
+    if method == 'DELETE':
+        return 'delete' if named else 'deletecollection'
+    return {'POST': 'create', 'PUT': 'update', 'PATCH': 'patch'}.get(method, method.lower())
+
+
+def kubernetes_resource(resource_path: str, path_params: Optional[Dict[str, str]]) -> str:
+    """Resource (plural, with subresource) a Kubernetes API path template addresses"""
+    segments = [s for s in resource_path.split('/') if s]
+    subresource = ''
+    if segments and segments[-1] in ('status', 'scale'):
+        subresource = '/' + segments.pop()
+    for segment in reversed(segments):
+        if segment == '{plural}':
+            return (path_params or {}).get('plural', 'unknown') + subresource
+        if not segment.startswith('{'):
+            return segment + subresource
+    return 'unknown'
+
+
+def instrument_api_client(api_client: client.ApiClient) -> client.ApiClient:
+    """Count and time every request made through a Kubernetes ApiClient"""
+    call_api = api_client.call_api
+
+    def timed_call_api(resource_path, method, path_params=None, query_params=None, *args, **kwargs):
+        verb = kubernetes_verb(method, resource_path, query_params)
+        resource = kubernetes_resource(resource_path, path_params)
+        code = 'error'
+        start = time.monotonic()
+        try:
+            result = call_api(resource_path, method, path_params, query_params, *args, **kwargs)
+            code = '2xx'
+            return result
+        except ApiException as e:
+            code = str(e.status)
+            raise
+        finally:
+            KUBERNETES_REQUESTS.labels(verb, resource, code).inc()
+            KUBERNETES_REQUEST_DURATION.labels(verb, resource).observe(time.monotonic() - start)
+
+    api_client.call_api = timed_call_api
+    return api_client
+
+
+def count_pending_request_files(shared_dir: str) -> int:
+    """Request files the hook wrote that have no response yet"""
+    try:
+        names = set(os.listdir(shared_dir))
+    except OSError:
+        return 0
+    return sum(
+        1 for name in names
+        if name.startswith('request-') and name.endswith('.json')
+        and name.replace('request-', 'response-').replace('.json', '.txt') not in names
+    )
+
+
+def start_metrics_server(shared_dir: str, queue: 'WorkQueue', port: int):
+    """Serve Prometheus metrics, sampling the queue and shared directory on scrape"""
+    PENDING_REQUEST_FILES.set_function(lambda: count_pending_request_files(shared_dir))
+    QUEUE_DEPTH.set_function(lambda: len(queue))
+    start_http_server(port)
+    print(f'Serving metrics on :{port}/metrics', flush=True)
+
+
+class WorkQueue:
+    """
+    Deduplicating work queue modelled on client-go's workqueue.
+    A key is queued at most once (dirty set) and never handed to two workers at the
+    same time (processing set); keys added while being processed are requeued when
+    the worker calls done(). Callers can wait for the next run of a key, and failed
+    keys are requeued with exponential backoff.
+    """
+
+    def __init__(self, base_delay: float = 0.5, max_delay: float = 300):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._queue = deque()
+        self._dirty = set()
+        self._processing = set()
+        self._waiters = {}
+        self._running_waiters = {}
+        self._failures = {}
+        self._shutting_down = False
+        self._cond = threading.Condition()
+
+    def add(self, key: str) -> Future:
+        """Queue key and return a Future resolved when the run that covers this add finishes"""
+        waiter = Future()
+        with self._cond:
+            if self._shutting_down:
+                # Nothing will run the key anymore, so nothing would resolve the waiter
+                waiter.set_exception(RuntimeError('work queue is shutting down'))
+                return waiter
+            self._waiters.setdefault(key, []).append(waiter)
+            self._add(key)
+        return waiter
+
+    def _add(self, key: str):
+        if self._shutting_down or key in self._dirty:
+            return
+        self._dirty.add(key)
+        if key not in self._processing:
+            self._queue.append(key)
+            self._cond.notify()
+
+    def add_after(self, key: str, delay: float):
+        """Queue key once delay seconds have passed"""
+        timer = threading.Timer(delay, self._add_delayed, args=(key,))
+        timer.daemon = True
+        timer.start()
+
+    def _add_delayed(self, key: str):
+        with self._cond:
+            self._add(key)
+
+    def add_rate_limited(self, key: str):
+        """Requeue a failed key with per-key exponential backoff"""
+        with self._cond:
+            failures = self._failures.get(key, 0)
+            self._failures[key] = failures + 1
+        self.add_after(key, min(self.base_delay * (2 ** failures), self.max_delay))
+
+    def forget(self, key: str):
+        """Reset the backoff of a key after it succeeded"""
+        with self._cond:
+            self._failures.pop(key, None)
+
+    def num_requeues(self, key: str) -> int:
+        with self._cond:
+            return self._failures.get(key, 0)
+
+    def get(self) -> Optional[str]:
+        """Block for the next key; returns None once the queue is shut down"""
+        with self._cond:
+            while not self._queue and not self._shutting_down:
+                self._cond.wait()
+            if not self._queue:
+                return None
+
+            key = self._queue.popleft()
+            self._processing.add(key)
+            self._dirty.discard(key)
+            self._running_waiters[key] = self._waiters.pop(key, [])
+            return key
+
+    def done(self, key: str, error: Optional[Exception] = None, result: Any = None):
+        """Mark key finished, resolve its waiters and requeue it if it was added meanwhile"""
+        with self._cond:
+            self._processing.discard(key)
+            waiters = self._running_waiters.pop(key, [])
+            if key in self._dirty:
+                self._queue.append(key)
+                self._cond.notify()
+
+        for waiter in waiters:
+            if error is None:
+                waiter.set_result(result)
+            else:
+                waiter.set_exception(error)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._queue)
+
+    def shutdown(self):
+        """
+        Stop handing out keys: queued keys are dropped and their waiters fail, keys
+        being processed still resolve in done(), and idle workers return from get()
+        """
+        with self._cond:
+            self._shutting_down = True
+            self._queue.clear()
+            self._dirty.clear()
+            waiters = [w for pending in self._waiters.values() for w in pending]
+            self._waiters.clear()
+            self._cond.notify_all()
+
+        for waiter in waiters:
+            waiter.set_exception(RuntimeError('work queue shut down before the key ran'))
+
+
+def gather_response(waiters: List[Future], error: Optional[Exception] = None) -> Future:
+    """Return a Future resolving to "OK", or "ERROR: ..." if error is set or any waiter failed"""
+    response = Future()
+    errors = [error] if error is not None else []
+    remaining = [len(waiters)]
+    lock = threading.Lock()
+
+    def collect(waiter):
+        with lock:
+            if waiter.exception() is not None:
+                errors.append(waiter.exception())
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        response.set_result(f"ERROR: {errors[0]}" if errors else "OK")
+
+    if not waiters:
+        response.set_result(f"ERROR: {errors[0]}" if errors else "OK")
+    for waiter in waiters:
+        waiter.add_done_callback(collect)
+    return response
+
+
+def write_response(resp_path: str, future: Future, requested_at: Optional[float] = None):
+    """Write the outcome of a queued file request for the hook to pick up"""
+    try:
+        response = future.result()
+    except Exception as e:
+        response = f"ERROR: {e}"
+
+    try:
+        with open(resp_path, 'w') as f:
+            f.write(response)
+        if requested_at is not None:
+            HOOK_LATENCY.labels('file').observe(max(time.time() - requested_at, 0))
+        print(f"[handler] Wrote response to {os.path.basename(resp_path)}", flush=True)
+    except Exception as e:
+        print(f"ERROR writing {os.path.basename(resp_path)}: {e}", file=sys.stderr, flush=True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Loopback socket protocol used by the hook: a line with the byte length of the
+    binding context, the binding context itself, then a single response line back.
+    """
+
+    def handle(self):
+        start = time.monotonic()
+        line = self.rfile.readline().strip()
+        # Readiness probes connect and close without sending anything: nothing to answer
+        if not line:
+            return
+
+        # Only requests that reached the processor count towards hook latency
+        submitted = False
+        try:
+            length = int(line)
+            payload = self.rfile.read(length)
+            if len(payload) < length:
+                raise ValueError(f"connection closed after {len(payload)} of {length} bytes")
+            print(f"[handler] Processing request from socket", flush=True)
+            future = self.server.submit(payload.decode('utf-8'))
+            submitted = True
+            response = future.result()
+        except Exception as e:
+            print(f"ERROR handling socket request: {e}", file=sys.stderr, flush=True)
+            response = f"ERROR: {e}"
+
+        self.wfile.write((' '.join(response.splitlines()) + '\n').encode('utf-8'))
+        if submitted:
+            HOOK_LATENCY.labels('socket').observe(time.monotonic() - start)
+
+
+class RequestServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Threaded loopback server the hook connects to; submit maps a binding context to a Future response"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, submit: Callable[[str], Future], port: int):
+        self.submit = submit
+        super().__init__(('127.0.0.1', port), RequestHandler)
+
+
+class DirectoryWatcher:
+    """
+    Blocks until files are written into a directory using inotify,
+    falling back to periodic polling where inotify is unavailable.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path: str, poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.fd = None
+
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+            if libc.inotify_add_watch(fd, path.encode(), self.IN_CLOSE_WRITE | self.IN_MOVED_TO) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, f'inotify_add_watch failed for {path}')
+            self.fd = fd
+        except (OSError, AttributeError) as e:
+            print(f"WARNING: inotify unavailable ({e}), polling {path} every {poll_interval}s", file=sys.stderr, flush=True)
+
+    def wait(self, timeout: float) -> bool:
+        """Return True if the directory may contain new files, False on timeout"""
+        if self.fd is None:
+            time.sleep(self.poll_interval)
+            return True
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+
+        # Drain queued events - the caller rescans the directory anyway
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+RBAC Operator load test
+Runs RBACOperatorService.reconcile_all against a local stand-in apiserver seeded with
+synthetic Users, annotated ClusterRoles (including @argocd) and ArgoCD Applications,
+and reports API calls per verb/resource, wall time and the size of the generated
+argocd-rbac-cm policy.csv.
+
+Usage:
+    python3 benchmarks/bench_reconcile_all.py --users 2000 --applications 300
+    python3 benchmarks/bench_reconcile_all.py --latency-ms 2 --json
+
+The stand-in speaks the Kubernetes REST API over loopback HTTP, so requests go through
+the real client (serialization, connection pool and the request metrics) instead of
+method-level fakes. --latency-ms adds a fixed delay to every request to approximate a
+remote apiserver.
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import threading
+import contextlib
+import importlib.util
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Optional, Tuple
+from kubernetes import client
+
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'files', 'rbac-service.py')
+
+# Roles the ArgoCD policy assigns, highest first, followed by generic extra roles
+ARGOCD_ROLES = ['cluster-admin', 'system-admin', 'platform-operator', 'app-developer']
+
+
+def load_service_module() -> types.ModuleType:
+    """Import rbac-service.py (not importable by name because of the dash)"""
+    # The service imports operator_runtime.py from its own directory, as it does from /scripts in the pod
+    sys.path.insert(0, os.path.dirname(SERVICE_PATH))
+    spec = importlib.util.spec_from_file_location('rbac_service', SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def merge_patch(target: Dict, patch: Dict) -> Dict:
+    """RFC 7386 JSON merge patch"""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_patch(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def matches_selector(obj: Dict, selector: Optional[str]) -> bool:
+    """Equality-based label selector (k=v,k2=v2)"""
+    if not selector:
+        return True
+    labels = obj.get('metadata', {}).get('labels') or {}
+    for term in selector.split(','):
+        key, _, value = term.partition('=')
+        if labels.get(key.strip()) != value.strip():
+            return False
+    return True
+
+
+class ApiServerState:
+    """
+    Object store of the stand-in apiserver: resource plural -> {(namespace, name): object}.
+    Cluster-scoped objects use an empty namespace.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.objects: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        self.calls: Counter = Counter()
+        self.resource_version = 0
+        self.lock = threading.Lock()
+
+    def add(self, resource: str, obj: Dict):
+        metadata = obj.setdefault('metadata', {})
+        self.resource_version += 1
+        metadata['resourceVersion'] = str(self.resource_version)
+        self.objects.setdefault(resource, {})[(metadata.get('namespace') or '', metadata['name'])] = obj
+
+    def get(self, resource: str, namespace: str, name: str) -> Optional[Dict]:
+        return self.objects.get(resource, {}).get((namespace or '', name))
+
+    def count(self, resource: str) -> int:
+        return len(self.objects.get(resource, {}))
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Generic CRUD over ApiServerState for /api/v1/... and /apis/<group>/<version>/... paths"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid delayed-ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        rest = parts[2:] if parts[0] == 'api' else parts[3:]
+        namespace = None
+        if len(rest) > 2 and rest[0] == 'namespaces':
+            namespace, rest = rest[1], rest[2:]
+        resource = rest[0] if rest else ''
+        name = rest[1] if len(rest) > 1 else None
+        subresource = rest[2] if len(rest) > 2 else None
+        return resource, namespace, name, subresource, parse_qs(url.query)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send(self, code: int, body: Dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _not_found(self, resource: str, name: str):
+        self._send(404, {
+            'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure',
+            'reason': 'NotFound', 'code': 404,
+            'message': f'{resource} "{name}" not found'
+        })
+
+    def _handle(self, method: str):
+        state: ApiServerState = self.server.state
+        resource, namespace, name, subresource, query = self._parse()
+        # Always drain the body (DELETE carries DeleteOptions) to keep the connection usable
+        body = self._body()
+
+        verb = {'POST': 'create', 'PUT': 'update', 'PATCH': 'patch', 'DELETE': 'delete'}.get(method)
+        if verb is None:
+            verb = 'get' if name else 'list'
+        label = resource + (f'/{subresource}' if subresource else '')
+
+        if state.latency:
+            time.sleep(state.latency)
+
+        with state.lock:
+            state.calls[(verb, label)] += 1
+            store = state.objects.setdefault(resource, {})
+
+            if verb == 'list':
+                selector = query.get('labelSelector', [None])[0]
+                items = [
+                    obj for (ns, _), obj in store.items()
+                    if (namespace is None or ns == namespace) and matches_selector(obj, selector)
+                ]
+                self._send(200, {
+                    'kind': 'List', 'apiVersion': 'v1',
+                    'metadata': {'resourceVersion': str(state.resource_version)},
+                    'items': items
+                })
+                return
+
+            if verb == 'create':
+                body.setdefault('metadata', {}).setdefault('namespace', namespace)
+                key = (namespace or '', body['metadata']['name'])
+                if key in store:
+                    self._send(409, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure',
+                                     'reason': 'AlreadyExists', 'code': 409})
+                    return
+                state.add(resource, body)
+                self._send(201, body)
+                return
+
+            key = (namespace or '', name)
+            existing = store.get(key)
+            if existing is None:
+                self._not_found(resource, name)
+                return
+
+            if verb == 'get':
+                self._send(200, existing)
+            elif verb == 'update':
+                state.add(resource, body)
+                self._send(200, body)
+            elif verb == 'patch':
+                state.add(resource, merge_patch(existing, body))
+                self._send(200, existing)
+            else:
+                del store[key]
+                self._send(200, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Success'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    """Loopback HTTP stand-in for the apiserver"""
+
+    daemon_threads = True
+
+    def __init__(self, state: ApiServerState):
+        super().__init__(('127.0.0.1', 0), ApiRequestHandler)
+        self.state = state
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='fake-apiserver', daemon=True).start()
+
+
+def role_names(count: int) -> List[str]:
+    return ARGOCD_ROLES[:count] + [f"role-{i}" for i in range(count - len(ARGOCD_ROLES))]
+
+
+def seed(state: ApiServerState, args) -> List[str]:
+    """
+    Populate the stand-in apiserver:
+      - --roles annotated ClusterRoles, the first --argocd-roles of them including @argocd,
+        each with --static-namespaces static namespaces
+      - --applications ArgoCD Applications deploying to --app-namespaces namespaces
+      - --users Users with --roles-per-user roles each
+      - the argocd namespace (unless --no-argocd)
+    """
+    roles = role_names(args.roles)
+
+    for i, role in enumerate(roles):
+        namespaces = [f"static-{role}-{n}" for n in range(args.static_namespaces)]
+        if i < args.argocd_roles:
+            namespaces.insert(0, '@argocd')
+        state.add('clusterroles', {
+            'apiVersion': 'rbac.authorization.k8s.io/v1',
+            'kind': 'ClusterRole',
+            'metadata': {
+                'name': f"homelab:{role}",
+                'annotations': {
+                    'zengarden.space/role': role,
+                    'zengarden.space/namespaces': ','.join(namespaces)
+                }
+            },
+            'rules': []
+        })
+
+    # Unannotated ClusterRoles the operator has to skip
+    for i in range(args.other_cluster_roles):
+        state.add('clusterroles', {
+            'apiVersion': 'rbac.authorization.k8s.io/v1',
+            'kind': 'ClusterRole',
+            'metadata': {'name': f"system:other-{i}"},
+            'rules': []
+        })
+
+    for i in range(args.applications):
+        state.add('applications', {
+            'apiVersion': 'argoproj.io/v1alpha1',
+            'kind': 'Application',
+            'metadata': {'namespace': 'argocd', 'name': f"app-{i}"},
+            'spec': {'destination': {'namespace': f"apps-{i % args.app_namespaces}"}}
+        })
+
+    for i in range(args.users):
+        user_roles = [roles[(i + r * 7) % len(roles)] for r in range(args.roles_per_user)]
+        state.add('users', {
+            'apiVersion': 'zengarden.space/v1',
+            'kind': 'User',
+            'metadata': {'name': f"user-{i}", 'uid': f"user-uid-{i}"},
+            'spec': {
+                'email': f"user-{i}@example.com",
+                'roles': list(dict.fromkeys(user_roles)),
+                'enabled': i % 50 != 49
+            }
+        })
+
+    if not args.no_argocd:
+        state.add('namespaces', {'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': 'argocd'}})
+
+    return roles
+
+
+def build_service(module: types.ModuleType, server: FakeApiServer):
+    """Create the service with its Kubernetes clients pointed at the stand-in apiserver"""
+    configuration = client.Configuration()
+    configuration.host = server.url
+    client.Configuration.set_default(configuration)
+    # The service loads in-cluster config in its constructor; the default configuration is already set
+    module.config = types.SimpleNamespace(load_incluster_config=lambda: None)
+    return module.RBACOperatorService()
+
+
+def run_scenario(name: str, state: ApiServerState, func) -> Dict:
+    """Run func once, returning wall time and the API calls it issued"""
+    with state.lock:
+        state.calls.clear()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+
+    with state.lock:
+        calls = dict(state.calls)
+    return {
+        'scenario': name,
+        'wall_seconds': round(elapsed, 3),
+        'api_calls': sum(calls.values()),
+        'calls': {f"{verb} {resource}": count for (verb, resource), count in sorted(calls.items())},
+        'rolebindings': state.count('rolebindings')
+    }
+
+
+def policy_csv_stats(state: ApiServerState) -> Dict:
+    configmap = state.get('configmaps', 'argocd', 'argocd-rbac-cm')
+    policy = ((configmap or {}).get('data') or {}).get('policy.csv', '')
+    return {
+        'bytes': len(policy.encode()),
+        'lines': policy.count('\n'),
+        'assignments': sum(1 for line in policy.splitlines() if line.startswith('g, '))
+    }
+
+
+def run(args) -> Dict:
+    module = load_service_module()
+    state = ApiServerState(latency=args.latency_ms / 1000.0)
+    roles = seed(state, args)
+
+    server = FakeApiServer(state)
+    server.start()
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            quiet = contextlib.ExitStack()
+            if not args.verbose:
+                quiet.enter_context(contextlib.redirect_stdout(devnull))
+                quiet.enter_context(contextlib.redirect_stderr(devnull))
+
+            with quiet:
+                service = build_service(module, server)
+                results = [run_scenario('cold', state, service.reconcile_all)]
+                results.append(run_scenario('steady', state, service.reconcile_all))
+
+                # A user gains a role, one role changes and one user is removed between passes
+                user = state.get('users', '', 'user-0')
+                user['spec']['roles'] = list(dict.fromkeys(user['spec']['roles'] + [roles[-1]]))
+                clusterrole = state.get('clusterroles', '', f"homelab:{roles[-1]}")
+                clusterrole['metadata']['annotations']['zengarden.space/namespaces'] += ',churn-namespace'
+                if args.users > 1:
+                    del state.objects['users'][('', 'user-1')]
+                results.append(run_scenario('churn', state, service.reconcile_all))
+
+                stats = service.role_namespaces_stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'results': results,
+        'policy_csv': policy_csv_stats(state),
+        'role_namespaces_cache': stats
+    }
+
+
+def print_report(report: Dict):
+    print(f"{'scenario':<10} {'wall s':>9} {'api calls':>10} {'rolebindings':>13}")
+    for r in report['results']:
+        print(f"{r['scenario']:<10} {r['wall_seconds']:>9} {r['api_calls']:>10} {r['rolebindings']:>13}")
+    for r in report['results']:
+        print(f"\n{r['scenario']}:")
+        for call, count in r['calls'].items():
+            print(f"  {call:<40} {count:>8}")
+    policy = report['policy_csv']
+    print(f"\npolicy.csv: {policy['bytes']} bytes, {policy['lines']} lines, {policy['assignments']} role assignments")
+    cache = report['role_namespaces_cache']
+    print(f"role namespace cache: generation {cache['generation']}, {cache['hits']} hits, {cache['misses']} misses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='User objects')
+    parser.add_argument('--roles', type=int, default=6, help='annotated ClusterRoles (at least 1)')
+    parser.add_argument('--roles-per-user', type=int, default=2, help='roles assigned to each User')
+    parser.add_argument('--argocd-roles', type=int, default=2, help='roles whose namespaces include @argocd')
+    parser.add_argument('--static-namespaces', type=int, default=5, help='static namespaces per role')
+    parser.add_argument('--applications', type=int, default=200, help='ArgoCD Applications')
+    parser.add_argument('--app-namespaces', type=int, default=20, help='distinct Application destination namespaces')
+    parser.add_argument('--other-cluster-roles', type=int, default=100, help='unannotated ClusterRoles')
+    parser.add_argument('--no-argocd', action='store_true', help='omit the argocd namespace (skips policy.csv)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='delay added to every API request')
+    parser.add_argument('--max-steady-calls', type=int, default=None,
+                        help='fail when the steady-state pass issues more API calls than this')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='keep the service log output')
+    args = parser.parse_args()
+
+    args.roles = max(1, args.roles)
+    args.app_namespaces = max(1, args.app_namespaces)
+
+    report = run(args)
+
+    if args.json:
+        print(json.dumps(dict(report, parameters=vars(args)), indent=2))
+    else:
+        print_report(report)
+
+    steady = next(r for r in report['results'] if r['scenario'] == 'steady')
+    if args.max_steady_calls is not None and steady['api_calls'] > args.max_steady_calls:
+        print(f"FAIL: steady-state pass issued {steady['api_calls']} API calls (limit {args.max_steady_calls})",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,18 +21,45 @@ HOOKEOF
   exit 0
 fi
 
-# File-based IPC approach - write request, wait for response
-SHARED_DIR="/shared"
-REQUEST_ID=$(date +%s%N)
-REQUEST_FILE="${SHARED_DIR}/request-${REQUEST_ID}.json"
-RESPONSE_FILE="${SHARED_DIR}/response-${REQUEST_ID}.txt"
-
 # Ensure binding context file exists and is non-empty
 if [[ ! -s "$BINDING_CONTEXT_PATH" ]]; then
   echo "ERROR: binding context file missing or empty: $BINDING_CONTEXT_PATH" >&2
   exit 1
 fi
 
+# Socket IPC - send the binding context to the handler service over the pod's
+# loopback interface and read the response synchronously
+HANDLER_PORT="${HANDLER_PORT:-9180}"
+if { exec 3<>"/dev/tcp/127.0.0.1/${HANDLER_PORT}"; } 2>/dev/null; then
+  echo "Sending request to handler service on port ${HANDLER_PORT}..."
+  { wc -c < "$BINDING_CONTEXT_PATH" | tr -d ' '; cat "$BINDING_CONTEXT_PATH"; } >&3
+
+  response=""
+  IFS= read -r -t 30 response <&3 || true
+  exec 3<&-
+
+  if [[ -z "$response" ]]; then
+    echo "ERROR: Timeout waiting for handler service" >&2
+    exit 1
+  fi
+
+  echo "Handler response: $response"
+
+  if [[ "$response" == "OK" ]]; then
+    echo "✓ Successfully processed RBAC event"
+    exit 0
+  else
+    echo "ERROR: Handler failed: $response" >&2
+    exit 1
+  fi
+fi
+
+# File-based IPC fallback - write request, wait for response
+SHARED_DIR="/shared"
+REQUEST_ID=$(date +%s%N)
+REQUEST_FILE="${SHARED_DIR}/request-${REQUEST_ID}.json"
+RESPONSE_FILE="${SHARED_DIR}/response-${REQUEST_ID}.txt"
+
 # Write the binding context as the request
 echo "Writing request to ${REQUEST_FILE}..."
 cat "$BINDING_CONTEXT_PATH" > "$REQUEST_FILE"
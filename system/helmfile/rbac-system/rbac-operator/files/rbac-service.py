@@ -9,14 +9,54 @@ import sys
 import json
 import time
 import signal
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from kubernetes import client, config
-from typing import Dict, List, Set, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from typing import Dict, List, Set, Optional, Tuple
+from operator_runtime import (
+    RECONCILE_BUCKETS, WorkQueue, gather_response, write_response, RequestServer, DirectoryWatcher,
+    instrument_api_client, start_metrics_server
+)
 
 
 # Global flag for graceful shutdown
 shutdown_requested = False
 
+# Loopback port the hook delivers binding contexts to
+HANDLER_PORT = int(os.environ.get('HANDLER_PORT', '9180'))
+
+# Times a failed reconcile is retried with exponential backoff before it is dropped
+MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '10'))
+
+# Label selector matching every RoleBinding this operator owns
+MANAGED_BY_SELECTOR = 'app.kubernetes.io/managed-by=rbac-operator'
+
+# Work queue key for a full reconciliation of every User
+RECONCILE_ALL_KEY = 'reconcile-all'
+
+# Work queue key for regenerating the ArgoCD RBAC ConfigMap
+ARGOCD_RBAC_KEY = 'argocd-rbac'
+
+# Work queue key prefixes for event-scoped reconciliation
+USER_KEY_PREFIX = 'user/'
+ROLE_KEY_PREFIX = 'role/'
+NAMESPACE_KEY_PREFIX = 'namespace/'
+
+# Port serving Prometheus metrics on /metrics
+METRICS_PORT = int(os.environ.get('METRICS_PORT', '9181'))
+
+RECONCILE_DURATION = Histogram(
+    'operator_reconcile_duration_seconds', 'Time spent processing one work queue key', ['kind'],
+    buckets=RECONCILE_BUCKETS)
+ROLE_NAMESPACES_HITS = Counter(
+    'operator_role_namespaces_cache_hits_total', 'Role namespace lookups served from the current generation')
+ROLE_NAMESPACES_MISSES = Counter(
+    'operator_role_namespaces_cache_misses_total', 'Role namespace lookups that listed ClusterRoles')
+ROLE_NAMESPACES_GENERATION = Gauge(
+    'operator_role_namespaces_cache_generation', 'Invalidations of the role namespace cache since start')
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
@@ -25,34 +65,74 @@ def signal_handler(signum, frame):
     shutdown_requested = True
 
 
+def raise_user_failures(failures: List[Tuple[str, Exception]], total: int):
+    """Fail a multi-user reconciliation after the fact if any user in it failed"""
+    if failures:
+        user_name, error = failures[0]
+        raise Exception(f"{len(failures)} of {total} user(s) failed to reconcile, first {user_name}: {error}")
+
+
 class RBACOperatorService:
     """Main service for managing RBAC based on Users and ClusterRoles"""
 
     def __init__(self):
         # Load Kubernetes config from service account
         config.load_incluster_config()
-        self.v1 = client.CoreV1Api()
-        self.rbac_v1 = client.RbacAuthorizationV1Api()
-        self.custom_api = client.CustomObjectsApi()
+        self.v1 = client.CoreV1Api(instrument_api_client(client.ApiClient()))
+        self.rbac_v1 = client.RbacAuthorizationV1Api(instrument_api_client(client.ApiClient()))
+        self.custom_api = client.CustomObjectsApi(instrument_api_client(client.ApiClient()))
+
+        # ArgoCD Application (namespace/name) -> destination namespace, so an Application
+        # event can tell which namespaces it moved away from
+        self.application_namespaces: Dict[str, str] = {}
+        self._applications_lock = threading.Lock()
+
+        # ClusterRole name -> zengarden.space/role annotation, so an event for a ClusterRole
+        # whose annotation was removed can still tell which role it used to grant
+        self.cluster_role_roles: Dict[str, str] = {}
+        self._cluster_roles_lock = threading.Lock()
+        # Events recorded while a reload lists ClusterRoles, one journal per reload in
+        # flight, replayed onto the listed map so the swap does not drop them
+        self._cluster_role_journals: List[Dict[str, Optional[str]]] = []
+
+        # Role -> namespaces resolution shared by every user in a reconciliation generation.
+        # A new generation starts with each full reconcile and whenever a ClusterRole or
+        # Application event changes the inputs.
+        self._role_namespaces: Optional[Dict[str, List[str]]] = None
+        self._role_namespaces_generation = 0
+        self._role_namespaces_lock = threading.Lock()
+        self.role_namespaces_hits = 0
+        self.role_namespaces_misses = 0
 
         print("RBAC Operator Service initialized", flush=True)
 
-    def get_all_users(self) -> List[Dict]:
-        """Get all User CRDs"""
+    def list_users(self) -> List[Dict]:
+        """Get all User CRDs, raising on failure so callers never garbage-collect from an empty list"""
+        result = self.custom_api.list_cluster_custom_object(
+            group='zengarden.space',
+            version='v1',
+            plural='users'
+        )
+        return result.get('items', [])
+
+    def get_user(self, user_name: str) -> Optional[Dict]:
+        """Get a single User CRD, or None if it no longer exists"""
         try:
-            result = self.custom_api.list_cluster_custom_object(
+            return self.custom_api.get_cluster_custom_object(
                 group='zengarden.space',
                 version='v1',
-                plural='users'
+                plural='users',
+                name=user_name
             )
-            return result.get('items', [])
-        except Exception as e:
-            print(f"WARNING: Failed to list users: {e}", file=sys.stderr, flush=True)
-            return []
+        except client.rest.ApiException as e:
+            if e.status == 404:
+                return None
+            raise
 
     def get_argocd_application_namespaces(self) -> Set[str]:
         """Get all namespaces where ArgoCD applications are deployed"""
         namespaces = set()
+        application_namespaces = {}
         try:
             applications = self.custom_api.list_cluster_custom_object(
                 group='argoproj.io',
@@ -65,22 +145,123 @@ class RBACOperatorService:
                     dest_namespace = app.get('spec', {}).get('destination', {}).get('namespace')
                     if dest_namespace:
                         namespaces.add(dest_namespace)
+                        application_namespaces[self._application_key(app)] = dest_namespace
                 except Exception as e:
                     print(f"WARNING: Failed to parse application: {e}", file=sys.stderr, flush=True)
 
+            with self._applications_lock:
+                self.application_namespaces = application_namespaces
+
         except Exception as e:
-            print(f"WARNING: Failed to list ArgoCD applications: {e}", file=sys.stderr, flush=True)
+            # An incomplete namespace list would garbage-collect live RoleBindings
+            print(f"ERROR: Failed to list ArgoCD applications: {e}", file=sys.stderr, flush=True)
+            raise
 
         return namespaces
 
+    @staticmethod
+    def _application_key(app: Dict) -> str:
+        metadata = app.get('metadata', {})
+        return f"{metadata.get('namespace')}/{metadata.get('name')}"
+
+    def record_application(self, app: Dict, deleted: bool = False) -> Set[str]:
+        """
+        Track an ArgoCD Application event and return the namespaces whose bindings it
+        affects. Applications are modified constantly by sync status updates, so only a
+        new, moved or deleted destination namespace is reported.
+        """
+        key = self._application_key(app)
+        dest_namespace = app.get('spec', {}).get('destination', {}).get('namespace')
+        if deleted:
+            dest_namespace = None
+
+        with self._applications_lock:
+            previous = self.application_namespaces.get(key)
+            if dest_namespace:
+                self.application_namespaces[key] = dest_namespace
+            else:
+                self.application_namespaces.pop(key, None)
+
+        if previous == dest_namespace:
+            return set()
+        return {ns for ns in (previous, dest_namespace) if ns}
+
+    def record_cluster_role(self, cluster_role: Dict, deleted: bool = False) -> Set[str]:
+        """
+        Track a ClusterRole event and return the roles whose users it affects: the role
+        the ClusterRole grants now and the one it granted before, if they differ.
+        """
+        name = cluster_role.get('metadata', {}).get('name')
+        role = (cluster_role.get('metadata', {}).get('annotations') or {}).get('zengarden.space/role')
+        if deleted:
+            role = None
+
+        with self._cluster_roles_lock:
+            previous = self.cluster_role_roles.get(name)
+            if role:
+                self.cluster_role_roles[name] = role
+            else:
+                self.cluster_role_roles.pop(name, None)
+            for journal in self._cluster_role_journals:
+                journal[name] = role
+
+        return {r for r in (previous, role) if r}
+
     def get_cluster_roles_with_namespaces(self) -> Dict[str, List[str]]:
+        """
+        Get the role -> namespaces mapping for the current reconciliation generation,
+        resolving it from ClusterRoles (and ArgoCD Applications) only on a miss
+        """
+        with self._role_namespaces_lock:
+            if self._role_namespaces is not None:
+                self.role_namespaces_hits += 1
+                ROLE_NAMESPACES_HITS.inc()
+                return self._role_namespaces
+            self.role_namespaces_misses += 1
+            ROLE_NAMESPACES_MISSES.inc()
+            generation = self._role_namespaces_generation
+
+        role_namespaces = self._load_cluster_roles_with_namespaces()
+
+        with self._role_namespaces_lock:
+            # Only keep the result if nothing invalidated it while we were listing
+            if generation == self._role_namespaces_generation:
+                self._role_namespaces = role_namespaces
+
+        return role_namespaces
+
+    def invalidate_role_namespaces(self, reason: str):
+        """Start a new reconciliation generation so the next lookup re-resolves role namespaces"""
+        with self._role_namespaces_lock:
+            self._role_namespaces = None
+            self._role_namespaces_generation += 1
+            generation = self._role_namespaces_generation
+            ROLE_NAMESPACES_GENERATION.set(generation)
+
+        print(f"Role namespace cache invalidated ({reason}), generation {generation}", flush=True)
+
+    def role_namespaces_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the role namespace cache"""
+        with self._role_namespaces_lock:
+            return {
+                'generation': self._role_namespaces_generation,
+                'hits': self.role_namespaces_hits,
+                'misses': self.role_namespaces_misses
+            }
+
+    def _load_cluster_roles_with_namespaces(self) -> Dict[str, List[str]]:
         """
         Get ClusterRoles with zengarden.space/role annotation
         Returns dict mapping role name to list of namespaces
         """
         role_namespaces = {}
+        cluster_role_roles = {}
         argocd_namespaces = None  # Lazy load when needed
 
+        journal = {}
+        with self._cluster_roles_lock:
+            self._cluster_role_journals.append(journal)
+
         try:
             # List all ClusterRoles
             cluster_roles = self.rbac_v1.list_cluster_role()
@@ -93,6 +274,7 @@ class RBACOperatorService:
                 role_annotation = cr.metadata.annotations.get('zengarden.space/role')
                 if not role_annotation:
                     continue
+                cluster_role_roles[cr.metadata.name] = role_annotation
 
                 # Get namespaces from annotation
                 namespaces_str = cr.metadata.annotations.get('zengarden.space/namespaces', '')
@@ -119,13 +301,30 @@ class RBACOperatorService:
                     role_namespaces[role_annotation] = namespaces
                     print(f"Found ClusterRole for role '{role_annotation}': {len(namespaces)} namespaces", flush=True)
 
+            with self._cluster_roles_lock:
+                # Events that arrived after the list are newer than what it returned
+                for name, role in journal.items():
+                    if role:
+                        cluster_role_roles[name] = role
+                    else:
+                        cluster_role_roles.pop(name, None)
+                self.cluster_role_roles = cluster_role_roles
+
         except Exception as e:
+            # An incomplete role map would garbage-collect live RoleBindings
             print(f"ERROR: Failed to list ClusterRoles: {e}", file=sys.stderr, flush=True)
+            raise
+        finally:
+            with self._cluster_roles_lock:
+                self._cluster_role_journals = [j for j in self._cluster_role_journals if j is not journal]
 
         return role_namespaces
 
-    def reconcile_user(self, user: Dict):
-        """Reconcile RoleBindings for a single user"""
+    def reconcile_user(self, user: Dict, observed: Optional[Dict[Tuple[str, str], client.V1RoleBinding]] = None):
+        """
+        Reconcile RoleBindings for a single user against the bindings it currently has.
+        observed may be passed in when the caller already listed the managed bindings.
+        """
         try:
             metadata = user.get('metadata', {})
             spec = user.get('spec', {})
@@ -140,36 +339,18 @@ class RBACOperatorService:
             # Get role-to-namespaces mapping from ClusterRoles
             role_namespaces = self.get_cluster_roles_with_namespaces()
 
-            created_bindings = {}
-
-            # Process each role
-            for role in roles:
-                if role not in role_namespaces:
-                    print(f"WARNING: Role '{role}' not found in ClusterRoles with zengarden.space/role label", flush=True)
-                    continue
+            desired = self.desired_rolebindings(user, role_namespaces)
+            if observed is None:
+                observed = self.list_managed_rolebindings(label_selector=f"{MANAGED_BY_SELECTOR},zengarden.space/user={user_name}")
 
-                namespaces = role_namespaces[role]
-                cluster_role_name = f"homelab:{role}"
+            errors = self.sync_rolebindings(desired, observed)
 
-                print(f"  Managing RoleBindings for role '{role}' in {len(namespaces)} namespaces", flush=True)
+            created_bindings = {}
+            for ns, binding_name in sorted(desired):
+                created_bindings.setdefault(ns, []).append(binding_name)
 
-                for ns in namespaces:
-                    binding_name = f"homelab:{role}:{user_name}"
-                    try:
-                        self.ensure_rolebinding(
-                            namespace=ns,
-                            name=binding_name,
-                            cluster_role=cluster_role_name,
-                            subject_email=email,
-                            user_name=user_name,
-                            role=role,
-                            user_metadata=metadata,
-                            enabled=enabled
-                        )
-                        if enabled:
-                            created_bindings.setdefault(ns, []).append(binding_name)
-                    except Exception as e:
-                        print(f"ERROR managing RoleBinding {ns}/{binding_name}: {e}", file=sys.stderr, flush=True)
+            if errors:
+                raise Exception(f"{len(errors)} RoleBinding operation(s) failed: {errors[0]}")
 
             # Update User status
             self.update_user_status(user_name, created_bindings, success=True)
@@ -192,105 +373,139 @@ class RBACOperatorService:
             except:
                 pass
 
-    def ensure_rolebinding(self, namespace: str, name: str, cluster_role: str, subject_email: str, user_name: str, role: str, user_metadata: Dict, enabled: bool = True):
-        """Create or update a RoleBinding, managing subject presence based on enabled flag"""
-        try:
-            # Check if RoleBinding exists
-            try:
-                existing = self.rbac_v1.read_namespaced_role_binding(name=name, namespace=namespace)
-                print(f"  RoleBinding exists: {namespace}/{name}", flush=True)
-
-                # Check if subject exists
-                subjects = existing.subjects or []
-                subject_exists = any(
-                    s.kind == 'User' and s.name == subject_email
-                    for s in subjects
-                )
+            # Let the work queue retry the key with backoff and the hook report the failure
+            raise
 
-                needs_update = False
-
-                if enabled and not subject_exists:
-                    # Add subject if user is enabled
-                    subjects.append(client.RbacV1Subject(
-                        kind='User',
-                        name=subject_email,
-                        api_group='rbac.authorization.k8s.io'
-                    ))
-                    needs_update = True
-                    print(f"  Adding user to RoleBinding: {namespace}/{name}", flush=True)
-                elif not enabled and subject_exists:
-                    # Remove subject if user is disabled
-                    subjects = [s for s in subjects if not (s.kind == 'User' and s.name == subject_email)]
-                    needs_update = True
-                    print(f"  Removing user from RoleBinding: {namespace}/{name}", flush=True)
-
-                if needs_update:
-                    existing.subjects = subjects if subjects else None
-                    self.rbac_v1.replace_namespaced_role_binding(
-                        name=name,
-                        namespace=namespace,
-                        body=existing
-                    )
-                    print(f"  Updated RoleBinding: {namespace}/{name}", flush=True)
+    def desired_rolebindings(self, user: Dict, role_namespaces: Dict[str, List[str]]) -> Dict[Tuple[str, str], client.V1RoleBinding]:
+        """Build the RoleBindings a user should have, keyed by (namespace, name)"""
+        metadata = user.get('metadata', {})
+        spec = user.get('spec', {})
 
-                return
+        user_name = metadata.get('name')
+        email = spec.get('email')
 
-            except client.rest.ApiException as e:
-                if e.status != 404:
-                    raise
+        # Disabled users keep their User object but lose every binding
+        if not spec.get('enabled', True) or not email:
+            return {}
 
-            # RoleBinding doesn't exist - only create if user is enabled
-            if not enabled:
-                print(f"  User disabled, skipping creation of RoleBinding: {namespace}/{name}", flush=True)
-                return
+        desired = {}
+        for role in spec.get('roles', []):
+            if role not in role_namespaces:
+                print(f"WARNING: Role '{role}' not found in ClusterRoles with zengarden.space/role label", flush=True)
+                continue
 
-            # Create ownerReference to User CRD
-            owner_references = [
-                client.V1OwnerReference(
-                    api_version='zengarden.space/v1',
-                    kind='User',
-                    name=user_metadata.get('name'),
-                    uid=user_metadata.get('uid'),
-                    block_owner_deletion=True,
-                    controller=True
+            binding_name = f"homelab:{role}:{user_name}"
+            for ns in role_namespaces[role]:
+                desired[(ns, binding_name)] = client.V1RoleBinding(
+                    metadata=client.V1ObjectMeta(
+                        name=binding_name,
+                        namespace=ns,
+                        labels={
+                            'app.kubernetes.io/managed-by': 'rbac-operator',
+                            'zengarden.space/role': role,
+                            'zengarden.space/user': user_name
+                        },
+                        # Owned by the User CRD so bindings go away with it
+                        owner_references=[
+                            client.V1OwnerReference(
+                                api_version='zengarden.space/v1',
+                                kind='User',
+                                name=user_name,
+                                uid=metadata.get('uid'),
+                                block_owner_deletion=True,
+                                controller=True
+                            )
+                        ]
+                    ),
+                    role_ref=client.V1RoleRef(
+                        api_group='rbac.authorization.k8s.io',
+                        kind='ClusterRole',
+                        name=f"homelab:{role}"
+                    ),
+                    subjects=[
+                        client.RbacV1Subject(
+                            kind='User',
+                            name=email,
+                            api_group='rbac.authorization.k8s.io'
+                        )
+                    ]
                 )
-            ]
-
-            # Create new RoleBinding
-            role_binding = client.V1RoleBinding(
-                metadata=client.V1ObjectMeta(
-                    name=name,
-                    namespace=namespace,
-                    labels={
-                        'app.kubernetes.io/managed-by': 'rbac-operator',
-                        'zengarden.space/role': role,
-                        'zengarden.space/user': user_name
-                    },
-                    owner_references=owner_references
-                ),
-                role_ref=client.V1RoleRef(
-                    api_group='rbac.authorization.k8s.io',
-                    kind='ClusterRole',
-                    name=cluster_role
-                ),
-                subjects=[
-                    client.RbacV1Subject(
-                        kind='User',
-                        name=subject_email,
-                        api_group='rbac.authorization.k8s.io'
+
+        return desired
+
+    def list_managed_rolebindings(self, namespace: Optional[str] = None, label_selector: str = None) -> Dict[Tuple[str, str], client.V1RoleBinding]:
+        """List RoleBindings created by this operator in one LIST call, keyed by (namespace, name)"""
+        label_selector = label_selector or MANAGED_BY_SELECTOR
+        if namespace:
+            result = self.rbac_v1.list_namespaced_role_binding(namespace=namespace, label_selector=label_selector)
+        else:
+            result = self.rbac_v1.list_role_binding_for_all_namespaces(label_selector=label_selector)
+
+        return {(rb.metadata.namespace, rb.metadata.name): rb for rb in result.items}
+
+    @staticmethod
+    def _rolebinding_fields(rb: client.V1RoleBinding):
+        """The parts of a RoleBinding this operator manages, in comparable form"""
+        labels = rb.metadata.labels or {}
+        return (
+            {k: labels.get(k) for k in ('app.kubernetes.io/managed-by', 'zengarden.space/role', 'zengarden.space/user')},
+            sorted((o.kind, o.name, o.uid) for o in (rb.metadata.owner_references or [])),
+            sorted((s.kind, s.name, s.api_group) for s in (rb.subjects or []))
+        )
+
+    def sync_rolebindings(self, desired: Dict[Tuple[str, str], client.V1RoleBinding],
+                          observed: Dict[Tuple[str, str], client.V1RoleBinding]) -> List[str]:
+        """
+        Issue only the creates, patches and deletes that turn observed into desired.
+        Returns the errors encountered; every other binding is still processed.
+        """
+        errors = []
+        created = patched = deleted = unchanged = 0
+
+        for (ns, name), rb in desired.items():
+            existing = observed.get((ns, name))
+            try:
+                if existing is None:
+                    self.rbac_v1.create_namespaced_role_binding(namespace=ns, body=rb)
+                    print(f"  Created RoleBinding: {ns}/{name}", flush=True)
+                    created += 1
+                elif existing.role_ref.name != rb.role_ref.name:
+                    # roleRef is immutable - recreate the binding
+                    self.delete_rolebinding(ns, name)
+                    self.rbac_v1.create_namespaced_role_binding(namespace=ns, body=rb)
+                    print(f"  Recreated RoleBinding with new roleRef: {ns}/{name}", flush=True)
+                    patched += 1
+                elif self._rolebinding_fields(existing) != self._rolebinding_fields(rb):
+                    self.rbac_v1.patch_namespaced_role_binding(
+                        name=name,
+                        namespace=ns,
+                        body={
+                            'metadata': {
+                                'labels': rb.metadata.labels,
+                                'ownerReferences': self.rbac_v1.api_client.sanitize_for_serialization(rb.metadata.owner_references)
+                            },
+                            'subjects': self.rbac_v1.api_client.sanitize_for_serialization(rb.subjects)
+                        }
                     )
-                ]
-            )
+                    print(f"  Updated RoleBinding: {ns}/{name}", flush=True)
+                    patched += 1
+                else:
+                    unchanged += 1
+            except Exception as e:
+                print(f"ERROR managing RoleBinding {ns}/{name}: {e}", file=sys.stderr, flush=True)
+                errors.append(f"{ns}/{name}: {e}")
 
-            self.rbac_v1.create_namespaced_role_binding(
-                namespace=namespace,
-                body=role_binding
-            )
-            print(f"  Created RoleBinding: {namespace}/{name}", flush=True)
+        # Garbage-collect bindings for roles, namespaces or users that are gone
+        for (ns, name) in observed.keys() - desired.keys():
+            try:
+                self.delete_rolebinding(ns, name)
+                deleted += 1
+            except Exception as e:
+                print(f"ERROR deleting RoleBinding {ns}/{name}: {e}", file=sys.stderr, flush=True)
+                errors.append(f"{ns}/{name}: {e}")
 
-        except Exception as e:
-            print(f"ERROR managing RoleBinding {namespace}/{name}: {e}", file=sys.stderr, flush=True)
-            raise
+        print(f"  RoleBindings: {created} created, {patched} updated, {deleted} deleted, {unchanged} unchanged", flush=True)
+        return errors
 
     def update_user_status(self, user_name: str, role_bindings: Dict[str, List[str]], success: bool = True, error: str = None):
         """Update User status"""
@@ -335,25 +550,112 @@ class RBACOperatorService:
         except Exception as e:
             print(f"WARNING: Failed to update User status: {e}", file=sys.stderr, flush=True)
 
+    def reconcile_user_by_name(self, user_name: str):
+        """Reconcile a single user after a User event"""
+        user = self.get_user(user_name)
+        if user is None:
+            # RoleBindings are owned by the User and are garbage collected with it
+            print(f"User {user_name} no longer exists, nothing to reconcile", flush=True)
+            return
+
+        self.reconcile_user(user)
+
+    def reconcile_role(self, role: str):
+        """Reconcile only the users holding a role after its ClusterRole changed"""
+        users = [u for u in self.list_users() if role in u.get('spec', {}).get('roles', [])]
+        print(f"Reconciling {len(users)} user(s) holding role '{role}'", flush=True)
+
+        failures = []
+        for user in users:
+            if shutdown_requested:
+                print("[shutdown] Stopping reconciliation...", flush=True)
+                break
+
+            try:
+                self.reconcile_user(user)
+            except Exception as e:
+                failures.append((user.get('metadata', {}).get('name'), e))
+
+        raise_user_failures(failures, len(users))
+
+    def reconcile_namespace(self, namespace: str):
+        """
+        Add or remove RoleBindings in a single namespace after an ArgoCD Application
+        started or stopped deploying to it
+        """
+        role_namespaces = self.get_cluster_roles_with_namespaces()
+        users = self.list_users()
+
+        print(f"Reconciling RoleBindings in namespace: {namespace}", flush=True)
+
+        desired = {}
+        for user in users:
+            for key, rb in self.desired_rolebindings(user, role_namespaces).items():
+                if key[0] == namespace:
+                    desired[key] = rb
+
+        errors = self.sync_rolebindings(desired, self.list_managed_rolebindings(namespace=namespace))
+        if errors:
+            raise Exception(f"{len(errors)} RoleBinding operation(s) failed in {namespace}: {errors[0]}")
+
+    def delete_rolebinding(self, namespace: str, name: str):
+        """Delete a RoleBinding if it exists"""
+        try:
+            self.rbac_v1.delete_namespaced_role_binding(name=name, namespace=namespace)
+            print(f"  Deleted RoleBinding: {namespace}/{name}", flush=True)
+        except client.rest.ApiException as e:
+            if e.status != 404:
+                raise
+
     def reconcile_all(self):
         """Reconcile all users"""
         print("\n=== Starting full reconciliation ===", flush=True)
 
-        users = self.get_all_users()
+        # Pick up ClusterRole/Application changes we may have missed events for
+        self.invalidate_role_namespaces('full reconciliation')
+
+        users = self.list_users()
         print(f"Found {len(users)} users to reconcile", flush=True)
 
+        # Resolve roles before touching bindings so a failed lookup aborts instead of pruning
+        self.get_cluster_roles_with_namespaces()
+
+        # One LIST of every managed RoleBinding, split per user
+        observed_by_user = {}
+        for key, rb in self.list_managed_rolebindings().items():
+            user_label = (rb.metadata.labels or {}).get('zengarden.space/user')
+            observed_by_user.setdefault(user_label, {})[key] = rb
+        print(f"Found {sum(len(v) for v in observed_by_user.values())} managed RoleBindings", flush=True)
+
+        # A failing user must not hold up the others; the failures are raised at the end
+        failures = []
         for user in users:
             if shutdown_requested:
                 print("[shutdown] Stopping reconciliation...", flush=True)
-                break
+                return
+
+            user_name = user.get('metadata', {}).get('name')
+            try:
+                self.reconcile_user(user, observed=observed_by_user.pop(user_name, {}))
+            except Exception as e:
+                failures.append((user_name, e))
 
-            self.reconcile_user(user)
+        # Whatever is left belongs to Users that no longer exist
+        orphaned = {key: rb for bindings in observed_by_user.values() for key, rb in bindings.items()}
+        if orphaned:
+            print(f"Garbage-collecting {len(orphaned)} RoleBindings of deleted users", flush=True)
+            self.sync_rolebindings({}, orphaned)
 
         # Sync ArgoCD RBAC if argocd namespace exists
         self.sync_argocd_rbac(users)
 
+        stats = self.role_namespaces_stats()
+        print(f"Role namespace cache: generation {stats['generation']}, {stats['hits']} hits, {stats['misses']} misses", flush=True)
+
         print("=== Reconciliation complete ===\n", flush=True)
 
+        raise_user_failures(failures, len(users))
+
     def sync_argocd_rbac(self, users: List[Dict]):
         """Generate and update ArgoCD RBAC ConfigMap if argocd namespace exists"""
         try:
@@ -509,29 +811,162 @@ class RBACOperatorService:
             traceback.print_exc()
 
 
-def watch_requests(service: RBACOperatorService, shared_dir='/shared'):
-    """Watch for request files and process them"""
+class RequestProcessor:
+    """
+    Feeds hook requests and periodic resyncs through a WorkQueue, so a burst of
+    events collapses into a single reconciliation and failures retry with backoff.
+    Events are mapped to the narrowest work that covers them: a User event
+    reconciles that user, a ClusterRole event the users holding its role, and an
+    ArgoCD Application event the bindings in its destination namespace.
+    """
+
+    def __init__(self, service: RBACOperatorService, max_retries: int = MAX_RETRIES):
+        self.service = service
+        self.max_retries = max_retries
+        self.queue = WorkQueue()
+        self.worker = threading.Thread(target=self._worker, name='request-worker', daemon=True)
+
+    def start(self):
+        self.worker.start()
+
+    def submit(self, binding_context: str) -> Future:
+        """Queue the work for a binding context; the returned future resolves to the hook response"""
+        try:
+            keys = self.keys_for_binding_context(binding_context)
+        except Exception as e:
+            print(f"ERROR processing request: {e}", file=sys.stderr, flush=True)
+            return gather_response([], error=e)
+
+        return gather_response([self.queue.add(key) for key in keys])
+
+    def keys_for_binding_context(self, binding_context: str) -> List[str]:
+        """Map a binding context to the work queue keys it invalidates"""
+        context_data = json.loads(binding_context)
+        if isinstance(context_data, dict):
+            context_data = [context_data]
+
+        keys = []
+        for binding in context_data:
+            # Initial synchronization (and anything we cannot scope) reconciles everything
+            if binding.get('type') != 'Event' or 'object' not in binding:
+                return [RECONCILE_ALL_KEY]
+
+            obj = binding['object']
+            kind = obj.get('kind')
+            metadata = obj.get('metadata', {})
+            deleted = binding.get('watchEvent') == 'Deleted'
+
+            if kind == 'User':
+                keys.append(f"{USER_KEY_PREFIX}{metadata.get('name')}")
+                keys.append(ARGOCD_RBAC_KEY)
+            elif kind == 'ClusterRole':
+                roles = self.service.record_cluster_role(obj, deleted=deleted)
+                if not roles:
+                    # Modified only fires when the role annotation appears or disappears, so
+                    # an unannotated ClusterRole we never saw granting a role lost one we
+                    # cannot name; Added/Deleted of unrelated ClusterRoles change nothing
+                    if binding.get('watchEvent') == 'Modified':
+                        return [RECONCILE_ALL_KEY]
+                    continue
+                self.service.invalidate_role_namespaces(f"ClusterRole {metadata.get('name')}")
+                for role in sorted(roles):
+                    keys.append(f"{ROLE_KEY_PREFIX}{role}")
+            elif kind == 'Application':
+                namespaces = self.service.record_application(obj, deleted=deleted)
+                if namespaces:
+                    self.service.invalidate_role_namespaces(f"Application {metadata.get('name')}")
+                for namespace in sorted(namespaces):
+                    keys.append(f"{NAMESPACE_KEY_PREFIX}{namespace}")
+            else:
+                return [RECONCILE_ALL_KEY]
+
+        return list(dict.fromkeys(keys))
+
+    def enqueue(self, key: str):
+        """Queue a key without waiting for it"""
+        self.queue.add(key)
+
+    def _worker(self):
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+
+            error = None
+            try:
+                with RECONCILE_DURATION.labels(key.split('/', 1)[0]).time():
+                    self._process(key)
+                self.queue.forget(key)
+                print(f"[handler] Successfully processed {key}", flush=True)
+            except Exception as e:
+                error = e
+                import traceback
+                traceback.print_exc()
+                if self.queue.num_requeues(key) < self.max_retries:
+                    print(f"WARNING: Requeueing {key} after failure: {e}", file=sys.stderr, flush=True)
+                    self.queue.add_rate_limited(key)
+                else:
+                    print(f"ERROR: Dropping {key} after {self.max_retries} retries: {e}", file=sys.stderr, flush=True)
+                    self.queue.forget(key)
+            finally:
+                self.queue.done(key, error)
+
+    def _process(self, key: str):
+        if key == RECONCILE_ALL_KEY:
+            self.service.reconcile_all()
+        elif key == ARGOCD_RBAC_KEY:
+            self.service.sync_argocd_rbac(self.service.list_users())
+        elif key.startswith(USER_KEY_PREFIX):
+            self.service.reconcile_user_by_name(key[len(USER_KEY_PREFIX):])
+        elif key.startswith(ROLE_KEY_PREFIX):
+            self.service.reconcile_role(key[len(ROLE_KEY_PREFIX):])
+        elif key.startswith(NAMESPACE_KEY_PREFIX):
+            self.service.reconcile_namespace(key[len(NAMESPACE_KEY_PREFIX):])
+        else:
+            print(f"WARNING: Unknown work queue key: {key}", file=sys.stderr, flush=True)
+
+    def shutdown(self):
+        """Stop the worker after its current item"""
+        self.queue.shutdown()
+        self.worker.join()
+
+
+def watch_requests(service: RBACOperatorService, shared_dir='/shared', port=HANDLER_PORT):
+    """Serve hook requests over the loopback socket, with request files as a fallback"""
     global shutdown_requested
 
+    processor = RequestProcessor(service)
+    processor.start()
+    start_metrics_server(shared_dir, processor.queue, METRICS_PORT)
+    server = RequestServer(processor.submit, port)
+    threading.Thread(target=server.serve_forever, name='request-server', daemon=True).start()
+    print(f'RBAC Operator service listening on 127.0.0.1:{port}', flush=True)
+
+    while not os.path.exists(shared_dir) and not shutdown_requested:
+        print(f"Shared directory {shared_dir} does not exist, waiting...", file=sys.stderr, flush=True)
+        time.sleep(1)
+
     print(f'RBAC Operator service watching {shared_dir}', flush=True)
 
+    watcher = DirectoryWatcher(shared_dir)
     processed = set()
     last_reconcile = 0
     reconcile_interval = 300  # Reconcile every 5 minutes
+    changed = True
 
     while not shutdown_requested:
         try:
             # Periodic full reconciliation
             current_time = time.time()
             if current_time - last_reconcile > reconcile_interval:
-                service.reconcile_all()
+                processor.enqueue(RECONCILE_ALL_KEY)
                 last_reconcile = current_time
 
-            # Check for request files
-            if not os.path.exists(shared_dir):
-                print(f"Shared directory {shared_dir} does not exist, waiting...", file=sys.stderr, flush=True)
-                time.sleep(1)
+            # Wait for request files
+            if not changed:
+                changed = watcher.wait(timeout=1)
                 continue
+            changed = False
 
             files = os.listdir(shared_dir)
             request_files = [f for f in files if f.startswith('request-') and f.endswith('.json')]
@@ -550,31 +985,17 @@ def watch_requests(service: RBACOperatorService, shared_dir='/shared'):
 
                 try:
                     # Read request
+                    requested_at = os.path.getmtime(req_path)
                     with open(req_path, 'r') as f:
                         binding_context = f.read()
 
-                    print(f"[handler] Processing request from {req_file}", flush=True)
+                    print(f"[handler] Queued request from {req_file}", flush=True)
 
-                    # Process the event
-                    try:
-                        context_data = json.loads(binding_context)
-
-                        # Trigger full reconciliation on any event
-                        service.reconcile_all()
-
-                        response = "OK"
-                        print(f"[handler] Successfully processed event", flush=True)
-                    except Exception as e:
-                        response = f"ERROR: {e}"
-                        print(f"ERROR processing request: {e}", file=sys.stderr, flush=True)
-                        import traceback
-                        traceback.print_exc()
-
-                    # Write response
-                    with open(resp_path, 'w') as f:
-                        f.write(response)
-
-                    print(f"[handler] Wrote response to {os.path.basename(resp_path)}", flush=True)
+                    # Response is written by the worker once the request has been processed
+                    future = processor.submit(binding_context)
+                    future.add_done_callback(
+                        lambda f, path=resp_path, at=requested_at: write_response(path, f, at)
+                    )
                     processed.add(req_file)
 
                 except Exception as e:
@@ -587,15 +1008,11 @@ def watch_requests(service: RBACOperatorService, shared_dir='/shared'):
                         pass
 
             # Clean up old processed files
-            current_time = time.time()
             for filename in list(processed):
                 # Remove from processed set if file no longer exists
                 if not os.path.exists(os.path.join(shared_dir, filename)):
                     processed.discard(filename)
 
-            # Small delay to avoid busy loop
-            time.sleep(1)
-
         except KeyboardInterrupt:
             print("\n[shutdown] Keyboard interrupt received", flush=True)
             break
@@ -606,6 +1023,9 @@ def watch_requests(service: RBACOperatorService, shared_dir='/shared'):
             else:
                 break
 
+    server.shutdown()
+    server.server_close()
+    processor.shutdown()
     print("[shutdown] Service stopped cleanly", flush=True)
 
 